@@ -4,12 +4,17 @@ from pathlib import Path
 
 import yaml
 
+from boaviztapi.utils.data_snapshot import DataSnapshot
+
 if "pytest" in sys.modules:
     data_dir = os.path.join(os.path.dirname(__file__), '../tests/data')
 else:
     data_dir = os.path.join(os.path.dirname(__file__), 'data')
 
+# Reference data files are loaded through the snapshot, see `boaviztapi.utils.data_snapshot`
+data_snapshot = DataSnapshot(data_dir)
+
 config_file = os.path.join(data_dir, 'config.yml')
 config = yaml.safe_load(Path(config_file).read_text())
 factors_file = os.path.join(data_dir, 'factors.yml')
-factors = yaml.safe_load(Path(factors_file).read_text())
+factors = data_snapshot.load_yaml(factors_file)
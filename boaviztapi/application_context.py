@@ -5,6 +5,8 @@ from dotenv import load_dotenv
 from pymongo import AsyncMongoClient
 from pymongo.errors import ConnectionFailure
 
+from boaviztapi.service.metrics import mongo_command_metrics
+
 _logger = logging.getLogger(__name__)
 
 class ApplicationContext:
@@ -50,7 +52,7 @@ class ApplicationContext:
                 _logger.error(f"No {dep} environment variable! Related services may not work!")
 
     async def create_db_connection(self):
-        self.mongodb_client = AsyncMongoClient(os.getenv("MONGODB_URL"))
+        self.mongodb_client = AsyncMongoClient(os.getenv("MONGODB_URL"), event_listeners=[mongo_command_metrics])
         _logger.info(f"Checking if the MongoDB server is reachable at {os.getenv('MONGODB_URL')}")
         try:
             await self.mongodb_client.admin.command('ping')
@@ -1,16 +1,14 @@
-import os
 from typing import Optional
 
-import pandas as pd
-
 from boaviztapi import config
 from boaviztapi.dto.component import ComponentDTO
 from boaviztapi.dto.usage import Usage
 from boaviztapi.dto.usage.usage import mapper_usage
 from boaviztapi.model.component import ComponentRAM
 from boaviztapi.service.archetype import get_component_archetype
+from boaviztapi.service.reference_data import ram_manufacture
 
-_ram_df = pd.read_csv(os.path.join(os.path.dirname(__file__), '../../data/crowdsourcing/ram_manufacture.csv'))
+_ram_df = ram_manufacture.get()
 
 
 class RAM(ComponentDTO):
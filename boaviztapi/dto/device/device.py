@@ -18,6 +18,7 @@ from boaviztapi.model.services.cloud_instance import ServiceCloudInstance
 from boaviztapi.model.usage import ModelUsage
 from boaviztapi.service.archetype import get_server_archetype, get_arch_component, get_cloud_instance_archetype, \
     get_arch_value
+from boaviztapi.service.server_timing import timed_stage
 
 
 class DeviceDTO(BaseDTO):
@@ -43,6 +44,7 @@ class Server(DeviceDTO):
     usage: Optional[UsageServer] = None
 
 
+@timed_stage("mapping")
 def mapper_server(server_dto: Server, archetype=get_server_archetype(config["default_server"])) -> DeviceServer:
     server_model = DeviceServer(archetype=archetype)
 
@@ -77,12 +79,16 @@ class Cloud(Server):
     usage: Optional[UsageCloud] = None
 
 
+@timed_stage("mapping")
 def mapper_cloud_instance(cloud_dto: Cloud, archetype=get_cloud_instance_archetype(config["default_cloud_instance"], config["default_cloud_provider"])) -> ServiceCloudInstance:
-    if get_server_archetype(archetype_name=get_arch_value(archetype, 'platform', 'default')) is False:
-        raise HTTPException(status_code=404, detail=f"Cloud platform {get_arch_value(archetype, 'platform', 'default')} not found. Please add it to the server archetypes. For more information, please check the documentation https://doc.api.boavizta.org/contributing/server/.")
-
+    # The platform archetype is looked up once, by the model. The model is built for each request, not cloned from a
+    # cached template : a deep copy of the platform (~45 µs) costs more than building it (~6 µs), the time being spent
+    # in the Boattributes a copy would duplicate too.
     model_cloud_instance = ServiceCloudInstance(archetype=archetype)
 
+    if model_cloud_instance.platform.archetype is False:
+        raise HTTPException(status_code=404, detail=f"Cloud platform {get_arch_value(archetype, 'platform', 'default')} not found. Please add it to the server archetypes. For more information, please check the documentation https://doc.api.boavizta.org/contributing/server/.")
+
     model_cloud_instance.usage = mapper_usage_cloud(cloud_dto.usage or UsageCloud(), archetype=get_arch_component(model_cloud_instance.archetype, "USAGE"))
 
     complete_components_usage(model_cloud_instance.platform, model_cloud_instance.usage)
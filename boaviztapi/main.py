@@ -1,7 +1,9 @@
 import contextlib
 import json
 import logging
+import asyncio
 import os
+import signal
 import threading
 import time
 from typing import AsyncIterator
@@ -9,15 +11,12 @@ from typing import AsyncIterator
 import anyio
 import markdown
 import uvicorn
-import math
-import numpy as np
 from typing import Any
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi_cache import FastAPICache
-from fastapi_cache.backends.inmemory import InMemoryBackend
 from mangum import Mangum
 from starlette.middleware.authentication import AuthenticationMiddleware
 from starlette.requests import Request
@@ -33,8 +32,16 @@ from boaviztapi.service.electricity_maps.carbon_intensity_provider import Carbon
 from boaviztapi.service.electricity_maps.costs_provider import ElectricityCostsProvider
 from boaviztapi.service.currency_converter import CurrencyConverter
 from boaviztapi.service.electricity_maps.renewable_energy_provider import RenewableEnergyProvider
+from boaviztapi.service.archetype import archetype_registry
+from boaviztapi.service.cache.cache import CacheService
+from boaviztapi.service.cache.http_fetcher import http_fetcher
+from boaviztapi.service.electricitymaps_service import electricity_maps_fetcher
+from boaviztapi.service.compute_executor import compute_executor
+from boaviztapi.service.metrics import RequestMetricsMiddleware, fastapi_cache_backend
+from boaviztapi.service.server_timing import ServerTimingMiddleware, timed
 from boaviztapi.utils.auth_backend import JWTAuthBackend
 from boaviztapi.utils.get_version import get_version_from_pyproject
+from boaviztapi.utils.json_sanitizer import sanitize_json_floats, dumps_sanitized_json
 from boaviztapi.application_context import get_app_context
 from boaviztapi.routers.auth_router import auth_router
 from boaviztapi.routers.cloud_router import cloud_router
@@ -43,6 +50,7 @@ from boaviztapi.routers.configuration_router import configuration_router
 from boaviztapi.routers.consumption_profile_router import consumption_profile
 from boaviztapi.routers.electricity_prices_router import electricity_prices_router
 from boaviztapi.routers.iot_router import iot
+from boaviztapi.routers.metrics_router import metrics_router
 from boaviztapi.routers.options_router import options_router
 from boaviztapi.routers.peripheral_router import peripheral_router
 from boaviztapi.routers.server_router import server_router
@@ -50,41 +58,24 @@ from boaviztapi.routers.terminal_router import terminal_router
 from boaviztapi.routers.utils_router import utils_router
 
 
-def _sanitize_json_floats(obj: Any) -> Any:
+class SanitizedJSONResponse(JSONResponse):
     """
-    Recursively convert NaN / +/-Inf (including NumPy scalar floats) to None,
-    so responses stay valid JSON and Starlette serialization won't 500.
+    JSONResponse variant that sanitises non-JSON-compliant floats (NaN/Inf)
+    into nulls before rendering.
     """
-    if obj is None:
-        return None
-
-    # Handle NumPy scalar types (e.g. numpy.float64)
-    if np is not None:
-        try:
-            if isinstance(obj, np.generic):
-                obj = obj.item()
-        except Exception:
-            pass
-
-    if isinstance(obj, float):
-        return obj if math.isfinite(obj) else None
-
-    if isinstance(obj, dict):
-        return {k: _sanitize_json_floats(v) for k, v in obj.items()}
-
-    if isinstance(obj, (list, tuple)):
-        return [_sanitize_json_floats(v) for v in obj]
-
-    return obj
+    def render(self, content: Any) -> bytes:
+        return super().render(sanitize_json_floats(content))
 
 
-class SanitizedJSONResponse(JSONResponse):
+class FastJSONResponse(SanitizedJSONResponse):
     """
-    JSONResponse variant that sanitises non-JSON-compliant floats (NaN/Inf)
-    into nulls before rendering.
+    SanitizedJSONResponse rendered by orjson when it is installed, in a single native pass over the content.
+    The bytes are the same, contents orjson cannot render identically fall back to `SanitizedJSONResponse`.
     """
     def render(self, content: Any) -> bytes:
-        return super().render(_sanitize_json_floats(content))
+        with timed("render"):
+            rendered = dumps_sanitized_json(content)
+            return rendered if rendered is not None else super().render(content)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -92,29 +83,52 @@ logging.basicConfig(
 )
 _logger = logging.getLogger(__name__)
 
+
+def _install_archetype_reload_handler() -> None:
+    """Reload the archetype files on SIGHUP, e.g. after the data directory has been updated in place."""
+    if not hasattr(signal, "SIGHUP"):
+        return
+    loop = asyncio.get_running_loop()
+
+    def reload_archetypes():
+        _logger.info("Reloading archetypes from %s", archetype_registry.root)
+        loop.run_in_executor(None, archetype_registry.reload)
+
+    try:
+        loop.add_signal_handler(signal.SIGHUP, reload_archetypes)
+    except (NotImplementedError, RuntimeError):
+        # Signal handlers can only be set from the main thread, and not on every event loop
+        _logger.warning("Archetypes cannot be reloaded on SIGHUP in this environment")
+
+
 @contextlib.asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncIterator[None]:
     # TODO: persist cache using postgres/redis, etc.
-    FastAPICache.init(InMemoryBackend(), prefix="fastapi-cache")  # initialize in-memory cache
+    FastAPICache.init(fastapi_cache_backend, prefix="fastapi-cache")  # initialize in-memory cache
 
     _ctx = get_app_context()
     _ctx.load_secrets()
     await _ctx.create_db_connection()
+    _install_archetype_reload_handler()
 
     _logger.info("Starting caches...")
-    electricity_prices_cache_yearly = ElectricityCostsProvider.get_cache_scheduler('hourly')
-    electricity_prices_cache_hourly = ElectricityCostsProvider.get_cache_scheduler('yearly')
-    carbon_intensity_cache = CarbonIntensityProvider.get_cache_scheduler()
-    carbon_free_energy_cache = CarbonFreeEnergyProvider.get_cache_scheduler()
-    renewable_energy_cache = RenewableEnergyProvider.get_cache_scheduler()
-    currency_converter_cache = await CurrencyConverter.get_cache_scheduler()
-    await electricity_prices_cache_yearly.startup()
-    await electricity_prices_cache_hourly.startup()
-    await carbon_intensity_cache.startup()
-    await carbon_free_energy_cache.startup()
-    await renewable_energy_cache.startup()
-    await currency_converter_cache.startup()
+    caches = [
+        ElectricityCostsProvider.get_cache_scheduler('hourly'),
+        ElectricityCostsProvider.get_cache_scheduler('yearly'),
+        CarbonIntensityProvider.get_cache_scheduler(),
+        # Read by the greener region wizard
+        CarbonIntensityProvider.get_cache_scheduler('monthly'),
+        CarbonFreeEnergyProvider.get_cache_scheduler(),
+        RenewableEnergyProvider.get_cache_scheduler(),
+        await CurrencyConverter.get_cache_scheduler(),
+    ]
+    # Only loads the persisted results, the expired ones are refreshed in the background
+    await asyncio.gather(*(cache.startup() for cache in caches))
     yield
+    await asyncio.gather(*(cache.shutdown() for cache in CacheService.instances()))
+    compute_executor.shutdown()
+    await http_fetcher.aclose()
+    await electricity_maps_fetcher.aclose()
     await _ctx.close_db_connection()
 
 
@@ -122,7 +136,7 @@ async def lifespan(_: FastAPI) -> AsyncIterator[None]:
 # We have to manage it to expose openapi doc on aws and generate proper links.
 stage = os.environ.get('STAGE', None)
 openapi_prefix = f"/{stage}" if stage else "/"
-app = FastAPI(lifespan=lifespan, root_path=openapi_prefix, default_response_class=SanitizedJSONResponse)  # Here is the magic
+app = FastAPI(lifespan=lifespan, root_path=openapi_prefix, default_response_class=FastJSONResponse)  # Here is the magic
 origins = json.loads(os.getenv("ALLOWED_ORIGINS", '["*"]'))
 version = get_version_from_pyproject()
 ctx = get_app_context()
@@ -158,6 +172,10 @@ app.add_middleware(CORSMiddleware,
 
 app.middleware('http')(catch_exceptions_middleware)
 
+# Outermost : the timings cover the other middlewares
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
+
 app.include_router(server_router)
 app.include_router(cloud_router)
 app.include_router(terminal_router)
@@ -175,6 +193,7 @@ app.include_router(portfolio_router)
 app.include_router(sustainability_router)
 app.include_router(currency_router)
 app.include_router(wizard_router)
+app.include_router(metrics_router)
 
 if __name__ == '__main__':
     import uvicorn
@@ -1,21 +1,91 @@
-import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 import boaviztapi.utils.roundit as rd
-from boaviztapi import config, data_dir
+from boaviztapi import config
 from boaviztapi.model.boattribute import Boattribute
 from boaviztapi.model.component.component import Component
 from boaviztapi.model.consumption_profile import CPUConsumptionProfileModel
 from boaviztapi.model.impact import ImpactFactor
 from boaviztapi.service.archetype import get_component_archetype, get_arch_value
-from boaviztapi.utils.fuzzymatch import fuzzymatch_attr_from_cpu_name, fuzzymatch_attr_from_pdf
+from boaviztapi.service.reference_data import cpu_specs
+from boaviztapi.utils.fuzzymatch import CPUNameMatcher, fuzzymatch_attr
+from boaviztapi.utils.lazy_dataset import reference_datasets
 
-_cpu_specs = pd.read_csv(os.path.join(data_dir, 'crowdsourcing/cpu_specs.csv'))
+_cpu_specs = cpu_specs.get()
+_cpu_name_matcher = CPUNameMatcher(_cpu_specs, cache_size=config["cpu_name_cache_size"])
+_cpu_code_names = list(_cpu_specs["code_name"].unique())
+
+
+@dataclass(frozen=True)
+class DieSizeTable:
+    """
+    Die sizes of a set of cpu_specs rows, reduced once for the completion of the CPU die size : the mean, min and max
+    die size overall and per number of cores, the reference row of the rule of three (only when all the rows have
+    the same number of cores) and the coefficients (a, b) of the linear regression of the die size on the cores.
+    """
+    mean: float
+    min: float
+    max: float
+    by_cores: Dict[float, Tuple[float, float, float]]
+    reference: Optional[Tuple[str, float, float]]
+    regression: Tuple[float, float]
+
+    def cores(self, cores: float) -> Tuple[float, float, float]:
+        # No row with this number of cores : the aggregates of an empty selection
+        return self.by_cores.get(cores, (np.nan, np.nan, np.nan))
+
+    @classmethod
+    def from_cpu_specs(cls, df: pd.DataFrame) -> "DieSizeTable":
+        total_die_size = df["total_die_size"]
+        by_cores = {}
+        for cores in df["cores"].dropna().unique():
+            rows = total_die_size[df["cores"] == cores]
+            by_cores[cores] = (rows.mean(), rows.min(), rows.max())
+
+        reference = None
+        if len(df.index) == 1 or (not df.empty and (df["cores"] == df["cores"].iloc[0]).all()):
+            reference = (df["name"].iloc[0], total_die_size.iloc[0], df["cores"].iloc[0])
+
+        df = df[~df["cores"].isna()]
+        cores = df["cores"].values
+        total_die_size_values = df["total_die_size"].values
+        # Without warnings for the rows which have no regression line (a single number of cores)
+        with np.errstate(all="ignore"):
+            x̄ = cores.mean()
+            ȳ = total_die_size_values.mean()
+            b = ((cores - x̄) * (total_die_size_values - ȳ)).sum() / ((cores - x̄) ** 2).sum()
+            a = ȳ - b * x̄
+
+        return cls(mean=total_die_size.mean(), min=total_die_size.min(), max=total_die_size.max(),
+                   by_cores=by_cores, reference=reference, regression=(a, b))
+
+
+def _load_die_size_tables() -> Tuple[DieSizeTable, Dict[str, DieSizeTable]]:
+    """Die size tables of all the CPUs and of each family (code name)."""
+    cpu_specs_with_die_size = _cpu_specs[_cpu_specs["total_die_size"].notna()]
+    return DieSizeTable.from_cpu_specs(cpu_specs_with_die_size), {
+        code_name: DieSizeTable.from_cpu_specs(rows)
+        for code_name, rows in cpu_specs_with_die_size.groupby("code_name", sort=False, observed=True)
+    }
+
+
+_die_size_tables = reference_datasets.register("cpu_die_sizes", _load_die_size_tables)
 
 
 def attributes_from_cpu_name(cpu_name: str):
-    return fuzzymatch_attr_from_cpu_name(cpu_name, _cpu_specs)
+    return _cpu_name_matcher.match(cpu_name)
+
+
+def attributes_from_cpu_names(cpu_names: List[str]):
+    return _cpu_name_matcher.match_many(cpu_names)
+
+
+def cpu_name_cache_info() -> dict:
+    return _cpu_name_matcher.cache_info()
 
 
 class ComponentCPU(Component):
@@ -169,63 +239,53 @@ class ComponentCPU(Component):
                                             source=f"{die_size_source} : Completed from name name based on {source}.")
 
     def _complete_die_size_from_cpu_specs(self):
-        df = _cpu_specs[_cpu_specs["total_die_size"].notna()]
-
         # Fuzzymatch on the available code_name
-        family = fuzzymatch_attr_from_pdf(self.family.value, "code_name",
-                                          _cpu_specs) if self.family.has_value() else None
+        family = fuzzymatch_attr(self.family.value, _cpu_code_names) if self.family.has_value() else None
 
-        # if family not in df we set it to None
-        if family not in df["code_name"].values:
+        die_size_all_families, die_size_by_family = _die_size_tables.get()
+        # if family has no die size in the cpu_specs file we set it to None
+        if family not in die_size_by_family:
             family = None
 
         if family is not None:
             if family != self.family.value:
                 self.family.set_changed(family)
-            # Filter the cpu_specs file to get only the rows that match the family
-            df = df[(_cpu_specs["code_name"] == self.family.value)]
+            # Only the rows that match the family
+            die_sizes = die_size_by_family[family]
+        else:
+            die_sizes = die_size_all_families
 
-        # If we don't have a core_units, we take the average of the df
+        # If we don't have a core_units, we take the average of the cpu_specs rows
         if self.core_units.is_none():
             self.die_size.set_completed(
-                value=rd.round_to_sigfig(df["total_die_size"].mean(), 3),
-                min=rd.round_to_sigfig(df["total_die_size"].min(), 3),
-                max=rd.round_to_sigfig(df["total_die_size"].max(), 3),
+                value=rd.round_to_sigfig(die_sizes.mean, 3),
+                min=rd.round_to_sigfig(die_sizes.min, 3),
+                max=rd.round_to_sigfig(die_sizes.max, 3),
                 source=f"Average value for {self.family.value if family else 'all families'}"
             )
 
         # If we have the good number of cores in the cpu_specs file, we take the value
-        elif self.core_units.value in df["cores"].values:
-            df_value = df[(df["cores"] == self.core_units.value)]
-            df_min = df[(df["cores"] == self.core_units.min)]
-            df_max = df[(df["cores"] == self.core_units.max)]
+        elif self.core_units.value in die_sizes.by_cores:
             self.die_size.set_completed(
-                value=rd.round_to_sigfig(df_value["total_die_size"].mean(), 3),
-                min=rd.round_to_sigfig(df_min["total_die_size"].min(), 3),
-                max=rd.round_to_sigfig(df_max["total_die_size"].max(), 3),
+                value=rd.round_to_sigfig(die_sizes.cores(self.core_units.value)[0], 3),
+                min=rd.round_to_sigfig(die_sizes.cores(self.core_units.min)[1], 3),
+                max=rd.round_to_sigfig(die_sizes.cores(self.core_units.max)[2], 3),
                 source=f"Average value of {self.family.value if family else 'all families'} with {self.core_units.value} cores"
             )
 
         # If all rows have the same number of cores but different from the given cores_units
-        elif len(df.index) == 1 or (not df.empty and (df["cores"] == df["cores"].iloc[0]).all()):
+        elif die_sizes.reference is not None:
+            name, total_die_size, cores = die_sizes.reference
             self.die_size.set_completed(
-                value=rd.round_to_sigfig((df["total_die_size"].iloc[0] * self.core_units.value / df['cores'].iloc[0]),
-                                         3),
-                min=rd.round_to_sigfig((df["total_die_size"].min() * self.core_units.min / df['cores'].iloc[0]), 3),
-                max=rd.round_to_sigfig((df["total_die_size"].max() * self.core_units.max / df['cores'].iloc[0]), 3),
-                source=f"Rule of three on {df['name'].iloc[0]}"
+                value=rd.round_to_sigfig((total_die_size * self.core_units.value / cores), 3),
+                min=rd.round_to_sigfig((die_sizes.min * self.core_units.min / cores), 3),
+                max=rd.round_to_sigfig((die_sizes.max * self.core_units.max / cores), 3),
+                source=f"Rule of three on {name}"
             )
 
-        # If none of the above works, we compute a linear regression
+        # If none of the above works, we use the linear regression
         else:
-            df = df[~df['cores'].isna()]
-            cores = df["cores"].values
-            total_die_size = df["total_die_size"].values
-            x̄ = cores.mean()
-            ȳ = total_die_size.mean()
-            b = ((cores - x̄) * (total_die_size - ȳ)).sum() / ((cores - x̄) ** 2).sum()
-            a = ȳ - b * x̄
-
+            a, b = die_sizes.regression
             self.die_size.set_completed(
                 value=rd.round_to_sigfig((a + b * self.core_units.value), 3),
                 min=rd.round_to_sigfig((a + b * self.core_units.min), 3),
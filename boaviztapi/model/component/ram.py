@@ -1,21 +1,18 @@
-import os
-
-import pandas as pd
-
 import boaviztapi.utils.roundit as rd
-from boaviztapi import config, data_dir
+from boaviztapi import config
 from boaviztapi.model.boattribute import Boattribute
 from boaviztapi.model.component.component import Component
 from boaviztapi.model.consumption_profile.consumption_profile import RAMConsumptionProfileModel
 from boaviztapi.model.impact import ImpactFactor
 from boaviztapi.service.archetype import get_arch_value, get_component_archetype
+from boaviztapi.service.reference_data import ram_manufacture
 from boaviztapi.utils.fuzzymatch import fuzzymatch_attr_from_pdf
 
 
 class ComponentRAM(Component):
     NAME = "RAM"
 
-    _ram_df = pd.read_csv(os.path.join(data_dir, 'crowdsourcing/ram_manufacture.csv'))
+    _ram_df = ram_manufacture.get()
 
     def __init__(self, archetype=get_component_archetype(config["default_ram"], "ram"), **kwargs):
         super().__init__(archetype=archetype, **kwargs)
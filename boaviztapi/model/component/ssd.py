@@ -1,16 +1,13 @@
-import os
-
-import pandas as pd
-
-from boaviztapi import config, data_dir
+from boaviztapi import config
 from boaviztapi.model.boattribute import Boattribute
 from boaviztapi.model.component.component import Component
 from boaviztapi.service.archetype import get_component_archetype, get_arch_value
+from boaviztapi.service.reference_data import ssd_manufacture
 from boaviztapi.utils.fuzzymatch import fuzzymatch_attr_from_pdf
 
 
 class ComponentSSD(Component):
-    _ssd_df = pd.read_csv(os.path.join(data_dir, 'crowdsourcing/ssd_manufacture.csv'))
+    _ssd_df = ssd_manufacture.get()
 
     NAME = "SSD"
 
@@ -1,24 +1,31 @@
 import dataclasses
 import math
-import os
 from typing import Dict, Optional, List, Tuple, Union
 
 import numpy as np
-import pandas as pd
 from scipy.optimize import curve_fit
 
 import boaviztapi.utils.fuzzymatch as fuzzymatch
-from boaviztapi import config, data_dir
+from boaviztapi import config
 from boaviztapi.dto.usage.usage import WorkloadTime
 from boaviztapi.model.boattribute import Boattribute, Status
 from boaviztapi.service.archetype import get_component_archetype, get_arch_value
+from boaviztapi.service.metrics import curve_fit_calls
+from boaviztapi.service.reference_data import cpu_profile
+from boaviztapi.service.server_timing import timed
+from boaviztapi.utils.lru_cache import LRUCache
 
 fuzzymatch.pandas()
 
-_cpu_profile_consumption_df = pd.read_csv(os.path.join(data_dir, 'consumption_profile/cpu/cpu_profile.csv'))
+_cpu_profile_consumption_df = cpu_profile.get()
 
 MIN_POWER = 1   # Minimal power is 1 W
 
+# Fitted CPU consumption profile parameters, shared across requests
+fitted_params_cache = LRUCache(maxsize=config["consumption_profile_cache_size"])
+# Reference TDP and fitted model of each base model the TDP models are scaled from (see `__scale_model_with_tdp`)
+tdp_reference_cache = LRUCache(maxsize=config["consumption_profile_cache_size"])
+
 
 class ConsumptionProfileModel:
     def __iter__(self):
@@ -102,24 +109,37 @@ class CPUConsumptionProfileModel(ConsumptionProfileModel):
                                           cpu_manufacturer: str = None,
                                           cpu_model_range: str = None,
                                           cpu_tdp: int = None) -> Union[Dict[str, float], None]:
-        model = self.lookup_consumption_profile(cpu_manufacturer, cpu_model_range)
         if self.workloads.is_set():
-            model = self.__compute_model_adaptation(base_model=model or self.params.default)
+            model = self.__fitted_model(cpu_manufacturer, cpu_model_range, None)
             self.params.set_completed(model, source="From workload")
 
         elif cpu_tdp is not None:
-            model = self.__compute_model_adaptation_with_tdp(
-                base_model=model or self.params.default,
-                cpu_tdp=cpu_tdp
-            )
+            self.__set_tdp_workloads(cpu_tdp)
+            base_model = self.lookup_consumption_profile(cpu_manufacturer, cpu_model_range) or self.params.default
+            model = self.__scale_model_with_tdp(base_model=base_model, cpu_tdp=cpu_tdp)
+            if model is None:
+                model = self.__fitted_model(cpu_manufacturer, cpu_model_range, cpu_tdp)
             self.params.set_completed(model, source="From TDP")
 
         elif cpu_model_range is not None:
+            model = self.lookup_consumption_profile(cpu_manufacturer, cpu_model_range)
             self.params.set_completed(model, source="From CPU model range")
 
         return self.params.value
 
-    def __compute_model_adaptation_with_tdp(self, base_model: Dict[str, float], cpu_tdp: float) -> Dict[str, float]:
+    def __fitted_model(self, cpu_manufacturer: str, cpu_model_range: str, cpu_tdp: Optional[float]) -> Dict[str, float]:
+        load, power = self.list_workloads
+        key = (cpu_manufacturer, cpu_model_range, cpu_tdp,
+               tuple(zip(map(float, load), map(float, power))),
+               tuple(sorted(self.params.default.items())) if self.params.default else None)
+
+        def fit():
+            base_model = self.lookup_consumption_profile(cpu_manufacturer, cpu_model_range)
+            return self.__compute_model_adaptation(base_model=base_model or self.params.default)
+
+        return dict(fitted_params_cache.get_or_compute(key, fit))
+
+    def __set_tdp_workloads(self, cpu_tdp: float) -> None:
         @dataclasses.dataclass
         class _TDPWorkloadPower:
             load_percentage: float = None
@@ -128,21 +148,59 @@ class CPUConsumptionProfileModel(ConsumptionProfileModel):
             _TDPWorkloadPower(load_percentage=w, power_watt=cpu_tdp * r)
             for w, r in zip(self._TDP_RATIOS_WORKLOAD, self._TDP_RATIOS)
         ])
-        return self.__compute_model_adaptation(base_model=base_model)
 
-    def __compute_model_adaptation(self, base_model: Dict[str, float]) -> Dict[str, float]:
+    def __scale_model_with_tdp(self, base_model: Dict[str, float], cpu_tdp: float) -> Optional[Dict[str, float]]:
+        """
+        The TDP workloads are the fixed _TDP_RATIOS times the TDP : the least squares fit of a * log(b * (x + c)) + d
+        on them scales linearly with the TDP on `a` and `d`. The fit is made once per base model, at the TDP lying on
+        the base model curve, and scaled. Returns None when the base model has no positive power at full load, or when
+        the scaled model leaves the fitting bounds of the base model, the bounded fit then differs from the scaled one.
+        """
         base_model_list = self.__model_dict_to_list(base_model)
-        bounds = self.__adapt_model_bounds(base_model_list)
+        key = tuple(base_model_list)
+        reference = tdp_reference_cache.get_or_compute(key, lambda: self.__tdp_reference_model(key))
+        if reference is None:
+            return None
+        reference_tdp, reference_model = reference
+        ratio = cpu_tdp / reference_tdp
+        a, b, c, d = reference_model
+        model = [a * ratio, b, c, d * ratio]
+
+        lower_bounds, upper_bounds = self.__adapt_model_bounds(base_model_list)
+        if not all(lower <= param <= upper for lower, param, upper in zip(lower_bounds, model, upper_bounds)):
+            return None
+        return self.__model_list_to_dict(model)
+
+    @classmethod
+    def __tdp_reference_model(cls, base_model_list: Tuple[float, ...]) -> Optional[Tuple[float, Tuple[float, ...]]]:
+        reference_tdp = cls.__log_model(100, *base_model_list) / cls._TDP_RATIOS[-1]
+        # A base model without a positive power at full load has no TDP on its curve to scale from
+        if not math.isfinite(reference_tdp) or reference_tdp <= 0:
+            return None
+        model = cls.__fit_model(list(base_model_list),
+                                cls._TDP_RATIOS_WORKLOAD,
+                                [reference_tdp * ratio for ratio in cls._TDP_RATIOS])
+        return reference_tdp, tuple(model)
+
+    def __compute_model_adaptation(self, base_model: Dict[str, float]) -> Dict[str, float]:
         x_data, y_data = self.list_workloads
-        popt, _ = curve_fit(f=self.__log_model,
-                            xdata=x_data,
-                            ydata=y_data,
-                            p0=base_model_list,
-                            bounds=bounds)
-        return self.__model_list_to_dict(popt.tolist())
-
-    def __adapt_model_bounds(self, base_model_list: List[float]) -> Tuple[List[float], List[float]]:
-        default_lower_bounds, default_upper_bounds = self._DEFAULT_MODEL_BOUNDS
+        return self.__model_list_to_dict(self.__fit_model(self.__model_dict_to_list(base_model), x_data, y_data))
+
+    @classmethod
+    def __fit_model(cls, base_model_list: List[float], x_data: List[float], y_data: List[float]) -> List[float]:
+        bounds = cls.__adapt_model_bounds(base_model_list)
+        curve_fit_calls.inc()
+        with timed("curve_fit"):
+            popt, _ = curve_fit(f=cls.__log_model,
+                                xdata=x_data,
+                                ydata=y_data,
+                                p0=base_model_list,
+                                bounds=bounds)
+        return popt.tolist()
+
+    @classmethod
+    def __adapt_model_bounds(cls, base_model_list: List[float]) -> Tuple[List[float], List[float]]:
+        default_lower_bounds, default_upper_bounds = cls._DEFAULT_MODEL_BOUNDS
         lower_bounds, upper_bounds = [], []
         for lower_b, upper_b, model_param in zip(default_lower_bounds, default_upper_bounds, base_model_list):
             lower_bounds.append(max(lower_b, model_param - abs(2 * model_param)))
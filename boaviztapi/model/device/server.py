@@ -133,11 +133,7 @@ class DeviceServer(Device):
         return str(string_repr)
 
     def model_power_consumption(self):
-        conso_cpu = ImpactFactor(
-            value=self.cpu.model_power_consumption().value,
-            min=self.cpu.model_power_consumption().min,
-            max=self.cpu.model_power_consumption().max,
-        )
+        conso_cpu = self.cpu.model_power_consumption()
         self.cpu.usage.avg_power.set_completed(value=conso_cpu.value,
                                                min=conso_cpu.min,
                                                max=conso_cpu.max)
@@ -3,6 +3,7 @@ from typing import Optional
 
 import boaviztapi.utils.roundit as rd
 from boaviztapi import config
+from boaviztapi.service.projection import Fields, wants, subfields
 
 WARNING_IMPORTANT_UNCERTAINTY = ("Uncertainty from technical characteristics is very important. Results should be interpreted with caution (see min and max values)")
 NOT_IMPLEMENTED = 'not implemented'
@@ -27,6 +28,10 @@ class Impact:
             if val is not None:
                 self.__setattr__(attr, val)
 
+    @classmethod
+    def constant(cls, value):
+        return cls(value=value, min=value, max=value)
+
     def add_warning(self, warn):
         if warn not in self.warnings:
             self.warnings.append(warn)
@@ -119,18 +124,28 @@ class ImpactFactor:
             if val is not None:
                 self.__setattr__(attr, val)
 
+    @classmethod
+    def constant(cls, value):
+        return cls(value=value, min=value, max=value)
+
 
 class Assessable:
     def __init__(self, **kwargs):
         self._impacts = {}
 
-    def get_impacts(self, selected_criteria):
+    def get_impacts(self, selected_criteria, fields: Fields = None):
         result = {}
         for criteria in selected_criteria:
+            # Only the requested criteria and phases are rounded
+            if not wants(fields, criteria):
+                continue
+            phases = subfields(fields, criteria)
             result[criteria] = {}
             result[criteria]["unit"] = IMPACT_CRITERIAS[criteria].unit
             result[criteria]["description"] = IMPACT_CRITERIAS[criteria].description
             for phase in IMPACT_PHASES:
+                if not wants(phases, phase):
+                    continue
                 if criteria not in self._impacts or phase not in self._impacts[criteria] or self._impacts[criteria][phase] is None:
                     result[criteria][phase] = NOT_IMPLEMENTED
                 else:
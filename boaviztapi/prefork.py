@@ -0,0 +1,158 @@
+"""
+Prefork launcher of the API. The master process imports the API, loads all its reference data (factors, archetypes,
+CPU specs, cloud prices...) and warms it up with an impact computation, freezes it (`gc.freeze`) and forks the
+workers. The workers share the pages of the reference data copy-on-write instead of each loading its own copy.
+
+    python -m boaviztapi.prefork --host 0.0.0.0 --port 5000 --workers 4
+
+Only available where processes can be forked (not on Windows). See "Prefork workers" in docs/docs/deploy.md.
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI
+
+_log = logging.getLogger(__name__)
+
+
+def load_reference_data() -> FastAPI:
+    """Import the API and load all its reference data, the lazy datasets included. Return the application."""
+    from boaviztapi.main import app
+    from boaviztapi.utils.lazy_dataset import reference_datasets
+
+    reference_datasets.load_all()
+    _warm_up()
+    return app
+
+
+def _warm_up() -> None:
+    """
+    Compute the impacts of the default server and cloud instance, so that what is built on first use (pandas index
+    engines, categorical lookups, fitted consumption profiles) is built once, in the master, and shared.
+    """
+    from boaviztapi import config
+    from boaviztapi.dto.device import Cloud, Server
+    from boaviztapi.dto.device.device import mapper_cloud_instance, mapper_server
+    from boaviztapi.routers.cloud_router import compute_cloud_instance_impact
+    from boaviztapi.routers.server_router import compute_server_impact
+    from boaviztapi.service.archetype import get_cloud_instance_archetype, get_server_archetype
+
+    server = mapper_server(Server(), archetype=get_server_archetype(config["default_server"]))
+    compute_server_impact(server, verbose=True, duration=None, criteria=config["default_criteria"])
+    cloud = Cloud()
+    cloud.usage = {}
+    instance = mapper_cloud_instance(cloud, archetype=get_cloud_instance_archetype(config["default_cloud_instance"],
+                                                                                   config["default_cloud_provider"]))
+    compute_cloud_instance_impact(instance, verbose=True, duration=None, criteria=config["default_criteria"])
+
+
+def freeze_reference_data() -> None:
+    """
+    Move the objects allocated so far out of the reach of the garbage collector. A collection in a worker would
+    otherwise write in the header of every object it scans, copying all the pages of the reference data.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkServer:
+    """
+    Forks `workers` uvicorn servers accepting connections on a socket bound by the master, and forks a new one when
+    a worker dies (after `RESPAWN_DELAY` seconds, a worker failing on startup is not forked again in a tight loop).
+    SIGINT and SIGTERM stop the workers, then the master.
+    """
+    RESPAWN_DELAY = 1.0
+
+    def __init__(self, app: FastAPI, sock: socket.socket, workers: int, **uvicorn_options):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.uvicorn_options = uvicorn_options
+        self._children: Dict[int, int] = {}
+        self._stopping = False
+
+    def run(self) -> None:
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+        for index in range(self.workers):
+            self._spawn(index)
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            index = self._children.pop(pid, None)
+            if index is not None and not self._stopping:
+                _log.warning("Worker %s exited with status %s, forking a new one", pid, status)
+                time.sleep(self.RESPAWN_DELAY)
+                if not self._stopping:
+                    self._spawn(index)
+
+    def _spawn(self, index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+        self._children[pid] = index
+        _log.info("Started worker %s", pid)
+
+    def _run_worker(self) -> None:
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        code = 0
+        try:
+            server = uvicorn.Server(uvicorn.Config(self.app, **self.uvicorn_options))
+            server.run(sockets=[self.sock])
+        except BaseException:
+            _log.exception("Worker %s failed", os.getpid())
+            code = 1
+        finally:
+            os._exit(code)
+
+    def _stop(self, signum, frame) -> None:
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--lifespan", default="auto", choices=["auto", "on", "off"])
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, "fork"):
+        sys.exit("The prefork launcher needs os.fork, run `uvicorn boaviztapi.main:app --workers N` instead")
+
+    app = load_reference_data()
+    sock = bind_socket(args.host, args.port)
+    freeze_reference_data()
+    _log.info("Reference data loaded and frozen, forking %s workers", args.workers)
+    PreforkServer(app, sock, args.workers, log_level=args.log_level, lifespan=args.lifespan).run()
+
+
+if __name__ == "__main__":
+    main()
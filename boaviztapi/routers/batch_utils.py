@@ -0,0 +1,82 @@
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Type
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, ValidationError
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from boaviztapi.utils.json_sanitizer import sanitize_json_floats
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+_logger = logging.getLogger(__name__)
+
+
+class BatchItemError(Exception):
+    def __init__(self, status_code: int, detail: Any):
+        self.status_code = status_code
+        self.detail = detail
+
+
+async def read_batch_items(request: Request) -> List[Any]:
+    """
+    Parse the items of a batch request body : a JSON array, or NDJSON (one JSON document per line) when the content
+    type is `application/x-ndjson`. An NDJSON line which is not valid JSON is returned as a `BatchItemError`.
+    The body is read before the response starts : once a streaming response is started, the server listens for the
+    client disconnection on the same channel as the request body.
+    """
+    body = await request.body()
+    if request.headers.get("content-type", "").split(";")[0].strip() == NDJSON_MEDIA_TYPE:
+        return [_parse_line(line) for line in body.split(b"\n") if line.strip()]
+
+    try:
+        items = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Batch body must be a JSON array or NDJSON")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Batch body must be a JSON array or NDJSON")
+    return items
+
+
+def _parse_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return BatchItemError(status_code=400, detail=f"Invalid JSON: {e}")
+
+
+async def batch_response(request: Request, item_model: Type[BaseModel],
+                         assess: Callable[[Any], Awaitable[dict]]) -> StreamingResponse:
+    """
+    Assess each item of the batch request body with `assess` and stream the results back as NDJSON lines, in the
+    order of the items, as each item is assessed : `{"index": i, "result": ...}` or
+    `{"index": i, "error": {"status_code": ..., "detail": ...}}`. A failing item does not interrupt the batch.
+    """
+    items = await read_batch_items(request)
+
+    async def lines() -> AsyncIterator[str]:
+        for index, item in enumerate(items):
+            yield _ndjson_line({"index": index, **await _assess_item(item, item_model, assess)})
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
+
+
+async def _assess_item(item: Any, item_model: Type[BaseModel], assess: Callable[[Any], Awaitable[dict]]) -> dict:
+    try:
+        if isinstance(item, BatchItemError):
+            raise item
+        return {"result": await assess(item_model.model_validate(item))}
+    except (BatchItemError, HTTPException) as e:
+        return {"error": {"status_code": e.status_code, "detail": e.detail}}
+    except ValidationError as e:
+        return {"error": {"status_code": 422, "detail": e.errors(include_url=False, include_context=False)}}
+    except Exception as e:
+        _logger.exception(str(e), exc_info=e)
+        return {"error": {"status_code": 500, "detail": "Internal Server Error"}}
+
+
+def _ndjson_line(content: dict) -> str:
+    return json.dumps(sanitize_json_floats(jsonable_encoder(content))) + "\n"
@@ -1,16 +1,22 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Query, Body, HTTPException
+from fastapi import APIRouter, Query, Body, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
 import boaviztapi.service.cloud_provider as utils
 from boaviztapi import config
 from boaviztapi.dto.device import Cloud
 from boaviztapi.dto.device.device import mapper_cloud_instance
 from boaviztapi.model.services.cloud_instance import ServiceCloudInstance
+from boaviztapi.routers.batch_utils import batch_response
 from boaviztapi.routers.openapi_doc.descriptions import cloud_provider_description, all_default_cloud_instances, \
-    all_default_cloud_providers, get_instance_config
+    all_default_cloud_providers, get_instance_config, cloud_batch_description, fields_description
 from boaviztapi.routers.openapi_doc.examples import cloud_example
 from boaviztapi.service.archetype import get_cloud_instance_archetype
+from boaviztapi.service.compute_executor import compute_executor
+from boaviztapi.service.projection import Fields, parse_fields, project, subfields, wants
+from boaviztapi.service.request_key import request_key
+from boaviztapi.service.result_cache import cached_result
 from boaviztapi.service.impacts_computation import compute_impacts
 from boaviztapi.service.verbose import verbose_cloud
 
@@ -33,24 +39,39 @@ async def get_archetype_config(
 
 @cloud_router.post('/instance',
                    description=cloud_provider_description)
-async def instance_cloud_impact(cloud_instance: Cloud = Body(None, example=cloud_example),
+async def instance_cloud_impact(response: Response,
+                                cloud_instance: Cloud = Body(None, example=cloud_example),
                                 verbose: bool = True,
                                 duration: Optional[float] = config["default_duration"],
-                                criteria: List[str] = Query(config["default_criteria"])):
-    instance_archetype = get_cloud_instance_archetype(cloud_instance.instance_type, cloud_instance.provider)
-
-    if not instance_archetype:
-        raise HTTPException(status_code=404,
-                            detail=f"{cloud_instance.instance_type} at {cloud_instance.provider} not found")
-
-    instance_model = mapper_cloud_instance(cloud_instance, archetype=instance_archetype)
-
-    return await cloud_instance_impact(
-        cloud_instance=instance_model,
+                                criteria: List[str] = Query(config["default_criteria"]),
+                                fields: Optional[List[str]] = Query(None, description=fields_description)):
+    projection = parse_fields(fields)
+    key = request_key("POST /v1/cloud/instance", cloud_instance, verbose, duration, sorted(set(criteria)), projection)
+    return await cached_result(response, key, lambda: cloud_configuration_impact(
+        cloud_instance=cloud_instance,
         verbose=verbose,
         duration=duration,
-        criteria=criteria
-    )
+        criteria=criteria,
+        fields=projection
+    ))
+
+
+@cloud_router.post('/instance/batch',
+                   description=cloud_batch_description,
+                   response_class=StreamingResponse)
+async def instance_cloud_impact_batch(request: Request,
+                                      verbose: bool = True,
+                                      duration: Optional[float] = config["default_duration"],
+                                      criteria: List[str] = Query(config["default_criteria"]),
+                                      fields: Optional[List[str]] = Query(None, description=fields_description)):
+    projection = parse_fields(fields)
+    return await batch_response(request, Cloud, lambda cloud_instance: cloud_configuration_impact(
+        cloud_instance=cloud_instance,
+        verbose=verbose,
+        duration=duration,
+        criteria=criteria,
+        fields=projection
+    ))
 
 
 @cloud_router.get('/instance',
@@ -60,7 +81,8 @@ async def instance_cloud_impact(
         instance_type: str = Query(config["default_cloud_instance"], example=config["default_cloud_instance"]),
         verbose: bool = True,
         duration: Optional[float] = config["default_duration"],
-        criteria: List[str] = Query(config["default_criteria"])):
+        criteria: List[str] = Query(config["default_criteria"]),
+        fields: Optional[List[str]] = Query(None, description=fields_description)):
 
     cloud_instance = Cloud()
     cloud_instance.usage = {}
@@ -76,7 +98,8 @@ async def instance_cloud_impact(
         cloud_instance=instance_model,
         verbose=verbose,
         duration=duration,
-        criteria=criteria
+        criteria=criteria,
+        fields=parse_fields(fields)
     )
 
 
@@ -94,18 +117,53 @@ async def server_get_all_provider_name():
     return utils.get_cloud_providers()
 
 
+async def cloud_configuration_impact(cloud_instance: Cloud,
+                                     verbose: bool,
+                                     duration: Optional[float] = config["default_duration"],
+                                     criteria: List[str] = Query(config["default_criteria"]),
+                                     fields: Fields = None) -> dict:
+    instance_archetype = get_cloud_instance_archetype(cloud_instance.instance_type, cloud_instance.provider)
+
+    if not instance_archetype:
+        raise HTTPException(status_code=404,
+                            detail=f"{cloud_instance.instance_type} at {cloud_instance.provider} not found")
+
+    instance_model = mapper_cloud_instance(cloud_instance, archetype=instance_archetype)
+
+    return await cloud_instance_impact(
+        cloud_instance=instance_model,
+        verbose=verbose,
+        duration=duration,
+        criteria=criteria,
+        fields=fields
+    )
+
+
 async def cloud_instance_impact(cloud_instance: ServiceCloudInstance,
                                 verbose: bool,
                                 duration: Optional[float] = config["default_duration"],
-                                criteria: List[str] = Query(config["default_criteria"])) -> dict:
+                                criteria: List[str] = Query(config["default_criteria"]),
+                                fields: Fields = None) -> dict:
+    return await compute_executor.run(compute_cloud_instance_impact, cloud_instance, verbose, duration, criteria,
+                                      fields)
+
+
+def compute_cloud_instance_impact(cloud_instance: ServiceCloudInstance,
+                                  verbose: bool,
+                                  duration: Optional[float],
+                                  criteria: List[str],
+                                  fields: Fields = None) -> dict:
     if duration is None:
         duration = cloud_instance.platform.usage.hours_life_time.value
 
-    impacts = compute_impacts(model=cloud_instance, selected_criteria=criteria, duration=duration)
+    # As for servers, only the requested impacts are rounded and the verbose tree is built for the requested fields
+    impacts = compute_impacts(model=cloud_instance, selected_criteria=criteria, duration=duration,
+                              fields=subfields(fields, "impacts") if wants(fields, "impacts") else {})
 
-    if verbose:
-        return {
+    if verbose and wants(fields, "verbose"):
+        return project({
             "impacts": impacts,
-            "verbose": verbose_cloud(cloud_instance, selected_criteria=criteria, duration=duration)
-        }
-    return {"impacts": impacts}
+            "verbose": verbose_cloud(cloud_instance, selected_criteria=criteria, duration=duration,
+                                     fields=subfields(fields, "verbose"))
+        }, fields)
+    return project({"impacts": impacts}, fields)
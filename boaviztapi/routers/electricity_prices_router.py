@@ -1,7 +1,7 @@
 from copy import deepcopy
 from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from fastapi_cache.decorator import cache
 from pydantic import AfterValidator
 
@@ -11,6 +11,7 @@ from boaviztapi.routers.openapi_doc.descriptions import electricity_available_co
     renewable_energy_cache
 from boaviztapi.routers.openapi_doc.examples import electricity_carbon_intensity, electricity_power_breakdown, \
     electricity_maps_price
+from boaviztapi.service.cache.cache import CacheService, STALE_WARNING
 from boaviztapi.service.currency_converter import CurrencyConverter
 from boaviztapi.service.electricity_maps.carbon_free_energy_provider import CarbonFreeEnergyProvider
 from boaviztapi.service.electricity_maps.carbon_intensity_provider import CarbonIntensityProvider
@@ -25,6 +26,14 @@ electricity_prices_router = APIRouter(
 )
 
 
+async def get_cached_results(cache_service: CacheService, response: Response) -> dict:
+    """Results of the cache, with a Warning header while they are stale (being refreshed in the background)."""
+    results = await cache_service.get_results()
+    if cache_service.stale:
+        response.headers["Warning"] = STALE_WARNING
+    return results
+
+
 def validate_temporal_granularity(temporal_granularity: str) -> str:
     if temporal_granularity not in ["15_minutes", "hourly", "daily", "monthly", "quarterly", "yearly"]:
         raise ValueError(
@@ -70,6 +79,7 @@ async def get_electricity_price(
                                            "source": "nordpool.com", "temporalGranularity": "hourly"}}}}
                                }})
 async def get_electricity_prices(
+        response: Response,
         currency: Annotated[str | None, AfterValidator(CurrencyConverter.validate_currency)] = None,
         temporal_granularity: Annotated[
             str,
@@ -78,7 +88,7 @@ async def get_electricity_prices(
             ),
             AfterValidator(validate_temporal_granularity)
         ] = 'hourly'):
-    results = await ElectricityCostsProvider.get_cache_scheduler(temporal_granularity).get_results()
+    results = await get_cached_results(ElectricityCostsProvider.get_cache_scheduler(temporal_granularity), response)
     if currency is None:
         return results
     results = deepcopy(results)
@@ -110,7 +120,7 @@ async def get_carbon_intensity(
         ), AfterValidator(check_zone_code_in_electricity_maps)],
         temporalGranularity: str = Query(examples=["5_minutes", "15_minutes", "hourly"], default="hourly")):
     try:
-        return CarbonIntensityProvider.get_carbon_intensity(zone, temporalGranularity)
+        return await CarbonIntensityProvider.get_carbon_intensity(zone, temporalGranularity)
     except APIAuthenticationError as e:
         raise HTTPException(status_code=401, detail=str(e)) from e
     except APIError as e:
@@ -130,7 +140,7 @@ async def get_power_breakdown(
         ), AfterValidator(check_zone_code_in_electricity_maps)],
         temporalGranularity: str = Query(examples=["5_minutes", "15_minutes", "hourly"], default="hourly")):
     try:
-        return CarbonIntensityProvider.get_power_breakdown(zone, temporalGranularity)
+        return await CarbonIntensityProvider.get_power_breakdown(zone, temporalGranularity)
     except APIAuthenticationError as e:
         raise HTTPException(status_code=401, detail=str(e)) from e
     except APIError as e:
@@ -153,8 +163,8 @@ async def get_power_breakdown(
                                            "temporalGranularity": "hourly"}}}}}
 
                                })
-async def get_electricity_prices():
-    return await CarbonIntensityProvider.get_cache_scheduler().get_results()
+async def get_electricity_prices(response: Response):
+    return await get_cached_results(CarbonIntensityProvider.get_cache_scheduler(), response)
 
 
 @electricity_prices_router.get('/carbon-free-energy', description=carbon_free_energy_cache,
@@ -172,14 +182,14 @@ async def get_electricity_prices():
                                            "estimationMethod": "FORECASTS_HIERARCHY",
                                            "temporalGranularity": "hourly"
                                        }}}}}})
-async def get_carbon_free_energy(temporal_granularity: Annotated[
+async def get_carbon_free_energy(response: Response, temporal_granularity: Annotated[
     str,
     Query(
         examples=["15_minutes", "hourly", "daily", "monthly", "quarterly", "yearly"]
     ),
     AfterValidator(validate_temporal_granularity)
 ] = 'hourly'):
-    return await CarbonFreeEnergyProvider.get_cache_scheduler(temporal_granularity).get_results()
+    return await get_cached_results(CarbonFreeEnergyProvider.get_cache_scheduler(temporal_granularity), response)
 
 
 @electricity_prices_router.get('/renewable-energy', description=renewable_energy_cache,
@@ -197,11 +207,11 @@ async def get_carbon_free_energy(temporal_granularity: Annotated[
                                            "estimationMethod": "FORECASTS_HIERARCHY",
                                            "temporalGranularity": "hourly"
                                        }}}}}})
-async def get_renewable_energy(temporal_granularity: Annotated[
+async def get_renewable_energy(response: Response, temporal_granularity: Annotated[
     str,
     Query(
         examples=["15_minutes", "hourly", "daily", "monthly", "quarterly", "yearly"]
     ),
     AfterValidator(validate_temporal_granularity)
 ] = 'hourly'):
-    return await RenewableEnergyProvider.get_cache_scheduler(temporal_granularity).get_results()
+    return await get_cached_results(RenewableEnergyProvider.get_cache_scheduler(temporal_granularity), response)
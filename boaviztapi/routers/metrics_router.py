@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from starlette.responses import Response
+
+from boaviztapi.routers.openapi_doc.descriptions import metrics_description
+from boaviztapi.service.prometheus import CONTENT_TYPE, render_metrics
+
+metrics_router = APIRouter(
+    tags=['metrics']
+)
+
+
+@metrics_router.get('/metrics', description=metrics_description, response_class=Response)
+async def get_metrics():
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
@@ -23,6 +23,15 @@ server_impact_by_config_description = "# ✔️ Server impacts from configuratio
                                       "📋 Archetype\n\n" \
                                       "⏬ Allocation"
 
+server_batch_description = "# ✔️ Server impacts from a batch of configurations\n" \
+                           "Retrieve the impacts of many server configurations in one request.\n\n" \
+                           "📥 The body is a JSON array of server configurations, or NDJSON (one configuration " \
+                           "per line) with the `application/x-ndjson` content type.\n\n" \
+                           "📤 The results are streamed back as NDJSON, one line per configuration in the order of " \
+                           "the body : `{\"index\": 0, \"result\": {...}}`, or `{\"index\": 0, \"error\": " \
+                           "{\"status_code\": 404, \"detail\": \"...\"}}` when the configuration cannot be " \
+                           "assessed. The query parameters apply to the whole batch."
+
 all_archetype_servers = "# ✔️ Get all the available server archetype\n"
 all_archetype_components = "# ✔️ Get all the available component archetype for a given component name\n"
 all_archetype_user_terminals = "# ✔️ Get all the available user terminal archetype for a given user terminal name\n"
@@ -129,6 +138,25 @@ cloud_provider_description = "# ✔ ️Cloud instance impacts from provider, ins
                              "📋 Archetype : The configuration is set by the API, only usage is given by the user\n\n" \
                              "⏬ Allocation"
 
+cloud_batch_description = "# ✔ ️Cloud instance impacts from a batch of instances\n" \
+                          "Retrieve the impacts of many Cloud instances and usages in one request.\n\n" \
+                          "📥 The body is a JSON array of Cloud instances, or NDJSON (one instance per line) with the " \
+                          "`application/x-ndjson` content type.\n\n" \
+                          "📤 The results are streamed back as NDJSON, one line per instance in the order of the " \
+                          "body : `{\"index\": 0, \"result\": {...}}`, or `{\"index\": 0, \"error\": " \
+                          "{\"status_code\": 404, \"detail\": \"...\"}}` when the instance cannot be " \
+                          "assessed. The query parameters apply to the whole batch."
+
+user_terminal_batch_description = "# ✔ Terminal or peripheral impacts from a batch of devices\n" \
+                                  "Retrieve the impacts of many devices of the same category in one request.\n\n" \
+                                  "📥 The body is a JSON array of devices, or NDJSON (one device per line) with the " \
+                                  "`application/x-ndjson` content type.\n\n" \
+                                  "📤 The results are streamed back as NDJSON, one line per device in the order of " \
+                                  "the body : `{\"index\": 0, \"result\": {...}}`, or `{\"index\": 0, \"error\": " \
+                                  "{\"status_code\": 404, \"detail\": \"...\"}}` when the device cannot be " \
+                                  "assessed. The query parameters apply to the whole batch, the archetype defaults to " \
+                                  "the one of the category."
+
 all_default_cloud_instances = "# ✔ ️Get all the available instances for a given Cloud provider\n" \
                               "📜 Return the name of all pre-registered instances for the Cloud provider"
 
@@ -142,8 +170,27 @@ ssd_manufacturer = "# ✔ ️Get all the available ssd manufacturer in the API (
 ram_manufacturer = "# ✔ ️Get all the available ram manufacturer in the API (*ram:{manufacturer:'samsung'}*)\n"
 case_type = "# ✔ ️Get all the available case type in the API (*model:{case:'blade'}*)\n"
 name_to_cpu = "# ✔ ️Complete a cpu attributes from a cpu name\n"
+names_to_cpus = "# ✔ ️Complete the attributes of a list of cpus from their names, in one call (e.g. for inventory " \
+                "imports). Names which are not found in our database are returned as an error message, as in " \
+                "*GET /v1/utils/name_to_cpu*\n"
 cpu_names = "# ✔ ️Get all the available cpu name in the API (*cpu:{name:'intel xeon platinum 8175m'}*)\n"
 impacts_criteria = "# ✔ ️Get all the available criteria for the impacts calculation\n"
+compute_executor_description = "# ✔ ️Get the metrics of the impact computations : queue depth, running and rejected " \
+                               "computations, time waited for a computing thread (in seconds)\n"
+single_flight_description = "# ✔ ️Get the number of impact computations in flight, started, and of identical concurrent " \
+                            "requests which awaited an in-flight computation instead of starting their own\n"
+readiness_description = "# ✔ ️Get the reference datasets (cloud prices, CPU die sizes...), whether each is loaded and " \
+                        "how long its load took (in seconds). With lazy datasets, each is loaded by the first request " \
+                        "which needs it\n"
+memory_description = "# ✔ ️Get the memory taken by each loaded reference dataset (in bytes, not loaded datasets are null) " \
+                     "and the peak resident memory of the API process\n"
+server_timing_description = "# ✔ ️Get the histograms of the time taken by the stages of the requests (archetype lookups, " \
+                            "mapping, CPU name matching, consumption profile fitting, impacts, verbose output, costs, " \
+                            "currency conversion, JSON rendering), per route and stage (in seconds). The stages of each " \
+                            "request are also reported in its Server-Timing header\n"
+metrics_description = "# ✔ ️Get the metrics of the API process in the Prometheus text format : latency histograms per " \
+                      "route, requests in flight, hits, misses, size and age of the caches, consumption profile fits, " \
+                      "impact computations and MongoDB command latencies\n"
 
 
 terminal_description = "# ✔ Terminal impacts\n" \
@@ -177,3 +224,7 @@ carbon_free_energy_cache = "✔ ️Get the last known carbon-free energy percent
 renewable_energy_cache = "✔ ️Get the last known renewable energy percentage (in %) of electricity consumed in all the available locations.\n"
 power_breakdown = "# ✔ ️Get the power breakdown values for a given electricity zone (percentage of fossil vs renewable resources used to procure the energy).\n"
 power_breakdowns_cache = "# ✔ ️Get the power breakdown values for all the electricity zones (percentage of fossil vs renewable resources used to procure the energy).\n"
+
+fields_description = "Only return these fields of the response, to get smaller responses computed faster. Paths in " \
+                     "dotted (`verbose.CPU-1.die_size`) or JSONPath-like (`$.verbose['CPU-1'].die_size`) form, " \
+                     "separated by commas or repeated. `*` matches any key (`verbose.*.units`)."
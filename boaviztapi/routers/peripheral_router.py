@@ -1,12 +1,14 @@
 from typing import List, Union, Optional
-from fastapi import APIRouter, Query, Body
+from fastapi import APIRouter, Query, Body, Request
+from fastapi.responses import StreamingResponse
 
 from boaviztapi import config
 from boaviztapi.dto.device.user_terminal import Monitor, UsbStick, ExternalSSD, ExternalHDD, VrController
 from boaviztapi.routers.openapi_doc.descriptions import all_archetype_user_terminals, all_peripheral_categories, \
-    get_archetype_config_desc, peripheral_description
+    get_archetype_config_desc, peripheral_description, user_terminal_batch_description
 from boaviztapi.routers.openapi_doc.examples import end_user_terminal
-from boaviztapi.routers.terminal_router import user_terminal_impact, get_all_archetype_name, get_archetype_config
+from boaviztapi.routers.terminal_router import user_terminal_impact, get_all_archetype_name, get_archetype_config, \
+    user_terminal_batch_response
 
 peripheral_router = APIRouter(
     prefix='/v1/peripheral',
@@ -207,4 +209,27 @@ async def vr_controller_impact(archetype: str = config["default_vr_controller"],
                                       verbose=verbose,
                                       duration=duration,
                                       criteria=criteria,
-                                      archetype=archetype)
\ No newline at end of file
+                                      archetype=archetype)
+
+
+# DTO and default archetype of each peripheral category
+_PERIPHERALS = {
+    "monitor": (Monitor, config["default_monitor"]),
+    "usb_stick": (UsbStick, config["default_usb_stick"]),
+    "external_ssd": (ExternalSSD, config["default_external_ssd"]),
+    "external_hdd": (ExternalHDD, config["default_external_hdd"]),
+    "vr_controller": (VrController, config["default_vr_controller"]),
+}
+
+
+@peripheral_router.post('/{peripheral_type}/batch',
+                        description=user_terminal_batch_description,
+                        response_class=StreamingResponse)
+async def peripheral_impact_batch(peripheral_type: str,
+                                  request: Request,
+                                  verbose: bool = True,
+                                  duration: Optional[float] = config["default_duration"],
+                                  archetype: Optional[str] = None,
+                                  criteria: List[str] = Query(config["default_criteria"])):
+    return await user_terminal_batch_response(request, _PERIPHERALS, peripheral_type, archetype, verbose, duration,
+                                              criteria)
@@ -10,6 +10,8 @@ from boaviztapi.model.crud_models.portfolio_model import PortfolioCollection, Po
 from boaviztapi.model.services.portfolio_service import PortfolioService
 from boaviztapi.routers.pydantic_based_router import validate_id
 from boaviztapi.service.auth.dependencies import get_current_user
+from boaviztapi.service.request_key import request_key
+from boaviztapi.service.single_flight import impact_single_flight
 from boaviztapi.service.sustainability_provider import add_results_to_configuration, compute_portfolio_totals
 from boaviztapi.utils.costs_calculator import CostCalculator
 
@@ -88,7 +90,17 @@ async def find_extended_portfolio(
     if not portfolio_data:
         raise HTTPException(status_code=404, detail="No item found with the specified filter!")
 
-    portfolio = TypeAdapter(ExtendedPortfolioModel).validate_python(portfolio_data[0])
+    # Identical concurrent requests (e.g. dashboards opened in several tabs) share one computation
+    key = request_key("GET /v1/portfolio/extended", portfolio_data[0], impacts, costs, duration)
+    return await impact_single_flight.run(
+        key, lambda: _extended_portfolio_results(portfolio_data[0], impacts, costs, duration))
+
+
+async def _extended_portfolio_results(portfolio_data: dict,
+                                      impacts: bool,
+                                      costs: bool,
+                                      duration: float | None) -> ExtendedPortfolioWithResultsModel:
+    portfolio = TypeAdapter(ExtendedPortfolioModel).validate_python(portfolio_data)
     configs = [ConfigurationModelWithResults(results={}, configuration=c) for c in portfolio.configurations]
     totals = {}
     if costs:
@@ -1,7 +1,8 @@
 import os
 from typing import List, Optional
 
-from fastapi import APIRouter, Body, HTTPException, Query
+from fastapi import APIRouter, Body, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 from boaviztapi import config, data_dir
 from boaviztapi.dto.device import Server
@@ -9,9 +10,15 @@ from boaviztapi.dto.device.device import mapper_server
 from boaviztapi.model.device import Device
 from boaviztapi.model.device.server import DeviceServer
 from boaviztapi.routers.openapi_doc.descriptions import server_impact_by_model_description, \
-    server_impact_by_config_description, all_archetype_servers, get_archetype_config_desc
+    server_impact_by_config_description, all_archetype_servers, get_archetype_config_desc, server_batch_description, \
+    fields_description
+from boaviztapi.routers.batch_utils import batch_response
 from boaviztapi.routers.openapi_doc.examples import server_configuration_examples_openapi
 from boaviztapi.service.archetype import get_server_archetype, get_device_archetype_lst
+from boaviztapi.service.compute_executor import compute_executor
+from boaviztapi.service.projection import Fields, parse_fields, project, subfields, wants
+from boaviztapi.service.request_key import request_key
+from boaviztapi.service.result_cache import cached_result
 from boaviztapi.service.verbose import verbose_device
 from boaviztapi.service.impacts_computation import compute_impacts
 
@@ -41,7 +48,8 @@ async def get_archetype_config(archetype: str = Query(example=config["default_se
 async def server_impact_from_model(archetype: str = config["default_server"],
                                    verbose: bool = True,
                                    duration: Optional[float] = config["default_duration"],
-                                   criteria: List[str] = Query(config["default_criteria"])):
+                                   criteria: List[str] = Query(config["default_criteria"]),
+                                   fields: Optional[List[str]] = Query(None, description=fields_description)):
     archetype_config = get_server_archetype(archetype)
 
     if not archetype_config:
@@ -53,18 +61,60 @@ async def server_impact_from_model(archetype: str = config["default_server"],
         device=model_server,
         verbose=verbose,
         duration=duration,
-        criteria=criteria
+        criteria=criteria,
+        fields=parse_fields(fields)
     )
 
 
 @server_router.post('/',
                     description=server_impact_by_config_description)
 async def server_impact_from_configuration(
+        response: Response,
         server: Server = Body(None, openapi_examples=server_configuration_examples_openapi),
         verbose: bool = True,
         duration: Optional[float] = config["default_duration"],
         archetype: str = config["default_server"],
-        criteria: List[str] = Query(config["default_criteria"])):
+        criteria: List[str] = Query(config["default_criteria"]),
+        fields: Optional[List[str]] = Query(None, description=fields_description)):
+    projection = parse_fields(fields)
+    key = request_key("POST /v1/server/", server, archetype, verbose, duration, sorted(set(criteria)), projection)
+    return await cached_result(response, key, lambda: server_configuration_impact(
+        server=server,
+        archetype=archetype,
+        verbose=verbose,
+        duration=duration,
+        criteria=criteria,
+        fields=projection
+    ))
+
+
+@server_router.post('/batch',
+                    description=server_batch_description,
+                    response_class=StreamingResponse)
+async def server_impact_from_configuration_batch(
+        request: Request,
+        verbose: bool = True,
+        duration: Optional[float] = config["default_duration"],
+        archetype: str = config["default_server"],
+        criteria: List[str] = Query(config["default_criteria"]),
+        fields: Optional[List[str]] = Query(None, description=fields_description)):
+    projection = parse_fields(fields)
+    return await batch_response(request, Server, lambda server: server_configuration_impact(
+        server=server,
+        archetype=archetype,
+        verbose=verbose,
+        duration=duration,
+        criteria=criteria,
+        fields=projection
+    ))
+
+
+async def server_configuration_impact(server: Server,
+                                      archetype: str,
+                                      verbose: bool,
+                                      duration: Optional[float] = config["default_duration"],
+                                      criteria: List[str] = Query(config["default_criteria"]),
+                                      fields: Fields = None) -> dict:
     archetype_config = get_server_archetype(archetype)
 
     if not archetype_config:
@@ -76,22 +126,33 @@ async def server_impact_from_configuration(
         device=completed_server,
         verbose=verbose,
         duration=duration,
-        criteria=criteria
+        criteria=criteria,
+        fields=fields
     )
 
 
 async def server_impact(device: Device,
                         verbose: bool,
                         duration: Optional[float] = config["default_duration"],
-                        criteria: List[str] = Query(config["default_criteria"])
+                        criteria: List[str] = Query(config["default_criteria"]),
+                        fields: Fields = None
 ) -> dict:
+    return await compute_executor.run(compute_server_impact, device, verbose, duration, criteria, fields)
+
+
+def compute_server_impact(device: Device, verbose: bool, duration: Optional[float], criteria: List[str],
+                          fields: Fields = None) -> dict:
     if duration is None:
         duration = device.usage.hours_life_time.value
-    impacts = compute_impacts(model=device, selected_criteria=criteria, duration=duration)
+    # The impacts are always computed (the verbose impacts of the components come from it), only the requested
+    # ones are rounded and the verbose tree is only built for the requested fields
+    impacts = compute_impacts(model=device, selected_criteria=criteria, duration=duration,
+                              fields=subfields(fields, "impacts") if wants(fields, "impacts") else {})
 
     result = {
         "impacts": impacts
     }
-    if verbose:
-        result["verbose"] = verbose_device(device, selected_criteria=criteria, duration=duration)
-    return result
+    if verbose and wants(fields, "verbose"):
+        result["verbose"] = verbose_device(device, selected_criteria=criteria, duration=duration,
+                                           fields=subfields(fields, "verbose"))
+    return project(result, fields)
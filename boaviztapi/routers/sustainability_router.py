@@ -1,14 +1,18 @@
 from typing import Optional, List
 
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Response
 from fastapi.params import Depends
 
 from boaviztapi import config
 from boaviztapi.dto.auth.user_dto import UserPublicDTO
 from boaviztapi.model.crud_models.configuration_model import OnPremiseConfigurationModel, CloudConfigurationModel
 from boaviztapi.model.services.configuration_service import ConfigurationService
+from boaviztapi.routers.openapi_doc.descriptions import fields_description
 from boaviztapi.routers.pydantic_based_router import validate_id
 from boaviztapi.service.auth.dependencies import get_current_user
+from boaviztapi.service.projection import Fields, parse_fields, project, wants
+from boaviztapi.service.request_key import request_key
+from boaviztapi.service.result_cache import cached_result
 from boaviztapi.service.sustainability_provider import get_cloud_impact, get_server_impact_on_premise
 from boaviztapi.utils.costs_calculator import CostCalculator
 
@@ -22,21 +26,37 @@ def get_scoped_configuration_service(current_user: UserPublicDTO = Depends(get_c
 
 @sustainability_router.get('/on-premise/{id}')
 async def get_results_on_premise_configuration(
+        response: Response,
         configuration_service: ConfigurationService = Depends(get_scoped_configuration_service),
         id: str = Depends(validate_id),
         verbose: bool = True,
         costs: bool = True,
         duration: Optional[float] = config["default_duration"],
-        criteria: List[str] = Query(config["default_criteria"])
+        criteria: List[str] = Query(config["default_criteria"]),
+        fields: Optional[List[str]] = Query(None, description=fields_description)
 ):
     server = await configuration_service.get_by_id(id)
     if not server:
         raise HTTPException(status_code=404, detail=f"Configuration with id {id} not found")
     if server.type != 'on-premise':
         raise HTTPException(status_code=400, detail=f"Configuration with id {id} is not an on-premise server")
+    projection = parse_fields(fields)
+    # Repeated and identical concurrent requests (e.g. dashboards opened in several tabs) share one computation
+    key = request_key("GET /v1/sustainability/on-premise", server, verbose, costs, duration, sorted(set(criteria)),
+                      projection)
+    return await cached_result(response, key, lambda: _on_premise_configuration_results(
+        server, verbose, costs, duration, criteria, projection))
+
+
+async def _on_premise_configuration_results(server: OnPremiseConfigurationModel,
+                                            verbose: bool,
+                                            costs: bool,
+                                            duration: Optional[float],
+                                            criteria: List[str],
+                                            fields: Fields) -> dict:
     try:
-        result = await get_server_impact_on_premise(server, verbose, duration, criteria)
-        if costs:
+        result = await get_server_impact_on_premise(server, verbose, duration, criteria, fields)
+        if costs and wants(fields, "costs"):
             final_duration = duration if duration is not None else getattr(server.usage, "lifespan", 1)
 
             calculator = CostCalculator(duration=final_duration)
@@ -54,21 +74,38 @@ async def get_results_on_premise_configuration(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"An error occurred! Details: {str(e)}")
 
-    return result
+    return project(result, fields)
 
 
 @sustainability_router.post('/on-premise')
 async def post_results_on_premise_configuration(
+        response: Response,
         server: OnPremiseConfigurationModel,
         verbose: bool = True,
         costs: bool = True,
         duration: Optional[float] = Query(None),
         criteria: List[str] = Query(config["default_criteria"]),
+        fields: Optional[List[str]] = Query(None, description=fields_description),
 ):
+    projection = parse_fields(fields)
+    key = request_key("POST /v1/sustainability/on-premise", server, verbose, costs, duration, sorted(set(criteria)),
+                      projection)
+    return await cached_result(response, key, lambda: _post_on_premise_configuration_results(
+        server, verbose, costs, duration, criteria, projection))
+
+
+async def _post_on_premise_configuration_results(server: OnPremiseConfigurationModel,
+                                                 verbose: bool,
+                                                 costs: bool,
+                                                 duration: Optional[float],
+                                                 criteria: List[str],
+                                                 fields: Fields) -> dict:
     try:
         final_duration = duration if duration is not None else getattr(server.usage, "lifespan", 1)
-        result = await get_server_impact_on_premise(server, verbose, final_duration, criteria)
+        result = await get_server_impact_on_premise(server, verbose, final_duration, criteria, fields)
 
+        if not wants(fields, "costs"):
+            return project(result, fields)
         calculator = CostCalculator(duration=final_duration)
         cost_results = await calculator.configuration_costs(server)
         cost_results = cost_results.model_dump(exclude_none=True)
@@ -84,26 +121,42 @@ async def post_results_on_premise_configuration(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"An error occurred! Details: {str(e)}")
 
-    return result
+    return project(result, fields)
 
 @sustainability_router.get('/cloud/{id}')
 async def get_results_cloud_configuration(
+        response: Response,
         configuration_service: ConfigurationService = Depends(get_scoped_configuration_service),
         current_user: UserPublicDTO = Depends(get_current_user),
         id: str = Depends(validate_id),
         verbose: bool = True,
         costs: bool = True,
         duration: Optional[float] = config["default_duration"],
-        criteria: List[str] = Query(config["default_criteria"])
+        criteria: List[str] = Query(config["default_criteria"]),
+        fields: Optional[List[str]] = Query(None, description=fields_description)
 ):
     cloud_instance = await configuration_service.get_by_id(id)
     if not cloud_instance:
         raise HTTPException(status_code=404, detail=f"Configuration with id {id} not found")
     if cloud_instance.type != 'cloud':
         raise HTTPException(status_code=400, detail=f"Configuration with id {id} is not a cloud instance")
+    projection = parse_fields(fields)
+    # Repeated and identical concurrent requests (e.g. dashboards opened in several tabs) share one computation
+    key = request_key("GET /v1/sustainability/cloud", cloud_instance, verbose, costs, duration, sorted(set(criteria)),
+                      projection)
+    return await cached_result(response, key, lambda: _cloud_configuration_results(
+        cloud_instance, verbose, costs, duration, criteria, projection))
+
+
+async def _cloud_configuration_results(cloud_instance: CloudConfigurationModel,
+                                       verbose: bool,
+                                       costs: bool,
+                                       duration: Optional[float],
+                                       criteria: List[str],
+                                       fields: Fields) -> dict:
     try:
-        result = await get_cloud_impact(cloud_instance, verbose, duration, criteria)
-        if costs:
+        result = await get_cloud_impact(cloud_instance, verbose, duration, criteria, fields)
+        if costs and wants(fields, "costs"):
             final_duration = duration if duration is not None else getattr(cloud_instance.usage, "lifespan", 1)
             calculator = CostCalculator(duration=final_duration)
             cost_results = await calculator.configuration_costs(cloud_instance)
@@ -118,22 +171,39 @@ async def get_results_cloud_configuration(
                     result["costs"] = cost_results
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"An error occurred! Details: {str(e)}")
-    return result
+    return project(result, fields)
 
 
 @sustainability_router.post('/cloud')
 async def post_results_cloud_configuration(
+    response: Response,
     cloud_instance: CloudConfigurationModel,
     verbose: bool = True,
     costs: bool = True,
     duration: Optional[float] = Query(None),
-    criteria: List[str] = Query(config["default_criteria"])
+    criteria: List[str] = Query(config["default_criteria"]),
+    fields: Optional[List[str]] = Query(None, description=fields_description)
 ):
+    projection = parse_fields(fields)
+    key = request_key("POST /v1/sustainability/cloud", cloud_instance, verbose, costs, duration, sorted(set(criteria)),
+                      projection)
+    return await cached_result(response, key, lambda: _post_cloud_configuration_results(
+        cloud_instance, verbose, costs, duration, criteria, projection))
+
+
+async def _post_cloud_configuration_results(cloud_instance: CloudConfigurationModel,
+                                            verbose: bool,
+                                            costs: bool,
+                                            duration: Optional[float],
+                                            criteria: List[str],
+                                            fields: Fields) -> dict:
     try:
         final_duration = duration if duration is not None else getattr(cloud_instance.usage, "lifespan", 1)
 
-        result = await get_cloud_impact(cloud_instance, verbose, final_duration, criteria)
+        result = await get_cloud_impact(cloud_instance, verbose, final_duration, criteria, fields)
 
+        if not wants(fields, "costs"):
+            return project(result, fields)
         calculator = CostCalculator(duration=final_duration)
         cost_results = await calculator.configuration_costs(cloud_instance)
         cost_results = cost_results.model_dump(exclude_none=True)
@@ -148,4 +218,4 @@ async def post_results_cloud_configuration(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"An error occurred! Details: {str(e)}")
 
-    return result
\ No newline at end of file
+    return project(result, fields)
\ No newline at end of file
@@ -1,13 +1,15 @@
 import os
 from typing import List, Union, Optional
 
-from fastapi import APIRouter, Query, Body, HTTPException
+from fastapi import APIRouter, Query, Body, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
 from boaviztapi import config, data_dir
 from boaviztapi.dto.device.user_terminal import UserTerminal, VrHeadset, mapper_user_terminal, Laptop, Desktop, Smartphone, \
     Television, Tablet, Box
+from boaviztapi.routers.batch_utils import batch_response
 from boaviztapi.routers.openapi_doc.descriptions import all_archetype_user_terminals, all_terminal_categories, \
-    get_archetype_config_desc, terminal_description
+    get_archetype_config_desc, terminal_description, user_terminal_batch_description
 from boaviztapi.routers.openapi_doc.examples import end_user_terminal
 from boaviztapi.service.archetype import get_user_terminal_archetype, get_device_archetype_lst_with_type
 from boaviztapi.service.impacts_computation import compute_impacts
@@ -291,6 +293,50 @@ async def vr_headset_impact(archetype: str = config["default_vr_headset"],
                                       archetype=archetype)
 
 
+# DTO and default archetype of each terminal category
+_TERMINALS = {
+    "laptop": (Laptop, config["default_laptop"]),
+    "desktop": (Desktop, config["default_desktop"]),
+    "smartphone": (Smartphone, config["default_smartphone"]),
+    "television": (Television, config["default_television"]),
+    "tablet": (Tablet, config["default_tablet"]),
+    "box": (Box, config["default_box"]),
+    "vr_headset": (VrHeadset, config["default_vr_headset"]),
+}
+
+
+@terminal_router.post('/{terminal_type}/batch',
+                      description=user_terminal_batch_description,
+                      response_class=StreamingResponse)
+async def terminal_impact_batch(terminal_type: str,
+                                request: Request,
+                                verbose: bool = True,
+                                duration: Optional[float] = config["default_duration"],
+                                archetype: Optional[str] = None,
+                                criteria: List[str] = Query(config["default_criteria"])):
+    return await user_terminal_batch_response(request, _TERMINALS, terminal_type, archetype, verbose, duration, criteria)
+
+
+async def user_terminal_batch_response(request: Request,
+                                       categories: dict,
+                                       category: str,
+                                       archetype: Optional[str],
+                                       verbose: bool,
+                                       duration: Optional[float],
+                                       criteria: List[str]) -> StreamingResponse:
+    if category not in categories:
+        raise HTTPException(status_code=404, detail=f"{category} not found")
+    user_terminal_dto, default_archetype = categories[category]
+
+    return await batch_response(request, user_terminal_dto, lambda user_terminal: user_terminal_impact(
+        user_terminal_dto=user_terminal,
+        archetype=archetype or default_archetype,
+        verbose=verbose,
+        duration=duration,
+        criteria=criteria
+    ))
+
+
 async def user_terminal_impact(user_terminal_dto: UserTerminal,
                                archetype: str,
                                verbose: bool,
@@ -1,24 +1,23 @@
-import os
+from typing import List
 
-import pandas as pd
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Body, Query
 
-from boaviztapi import data_dir
 import boaviztapi.service.utils_provider as utils
 from boaviztapi.routers.openapi_doc.descriptions import country_code, cpu_family, cpu_model_range, ssd_manufacturer, \
-    ram_manufacturer, case_type, name_to_cpu, cpu_names, impacts_criteria
+    ram_manufacturer, case_type, name_to_cpu, names_to_cpus, cpu_names, impacts_criteria, compute_executor_description, \
+    single_flight_description, readiness_description, memory_description, server_timing_description
+from boaviztapi.service.compute_executor import compute_executor
 from boaviztapi.service.factor_provider import get_available_countries
+from boaviztapi.service.server_timing import stage_histogram
+from boaviztapi.service.single_flight import impact_single_flight
 from boaviztapi.utils.get_version import get_version_from_pyproject
+from boaviztapi.utils.lazy_dataset import reference_datasets
 
 utils_router = APIRouter(
     prefix='/v1/utils',
     tags=['utils']
 )
 
-_cpu_specs = pd.read_csv(os.path.join(data_dir, 'crowdsourcing/cpu_specs.csv'))
-_ssd_manuf = pd.read_csv(os.path.join(data_dir, 'crowdsourcing/ssd_manufacture.csv'))
-_ram_manuf = pd.read_csv(os.path.join(data_dir, 'crowdsourcing/ram_manufacture.csv'))
-
 @utils_router.get('/version', description="Get the version of the API")
 async def version():
     return get_version_from_pyproject()
@@ -57,6 +56,10 @@ async def utils_get_all_case_type():
 async def name_to_cpu(cpu_name: str = Query(example="Intel Core i7-9700K")):
     return utils.name_to_cpu(cpu_name)
 
+@utils_router.post('/name_to_cpu', description=names_to_cpus)
+async def names_to_cpus(cpu_names: List[str] = Body(example=["Intel Core i7-9700K", "AMD EPYC 7R32"])):
+    return utils.names_to_cpus(cpu_names)
+
 @utils_router.get('/cpu_name', description=cpu_names)
 async def utils_get_all_cpu_name():
     return utils.get_all_cpu_name()
@@ -64,3 +67,23 @@ async def utils_get_all_cpu_name():
 @utils_router.get('/impact_criteria', description=impacts_criteria)
 async def utils_get_all_impacts_criteria():
     return utils.get_all_impact_criteria()
+
+@utils_router.get('/compute_executor', description=compute_executor_description)
+async def utils_get_compute_executor_metrics():
+    return compute_executor.metrics()
+
+@utils_router.get('/single_flight', description=single_flight_description)
+async def utils_get_single_flight_metrics():
+    return impact_single_flight.metrics()
+
+@utils_router.get('/readiness', description=readiness_description)
+async def utils_get_readiness():
+    return reference_datasets.readiness()
+
+@utils_router.get('/memory', description=memory_description)
+async def utils_get_memory_report():
+    return reference_datasets.memory_report()
+
+@utils_router.get('/server_timing', description=server_timing_description)
+async def utils_get_server_timing():
+    return stage_histogram.metrics()
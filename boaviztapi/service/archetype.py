@@ -1,11 +1,128 @@
 import ast
 import csv
+import hashlib
 import os
-from typing import Union
+import threading
+from typing import Union, Mapping, Dict, Optional
 
 import pandas as pd
 
-from boaviztapi import data_dir
+from boaviztapi import data_dir, data_snapshot
+from boaviztapi.service.server_timing import timed_stage
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict. Being immutable, it is shared rather than copied by `copy.copy` and `copy.deepcopy`, e.g. when
+    a model holding an archetype is copied.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"'{type(self).__name__}' object is read-only, use `thaw` to get a mutable copy")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+def freeze(tree):
+    """Return a read-only copy of a parsed archetype tree."""
+    if isinstance(tree, dict):
+        return FrozenDict({key: freeze(value) for key, value in tree.items()})
+    if isinstance(tree, list):
+        return tuple(freeze(value) for value in tree)
+    return tree
+
+
+def thaw(tree):
+    """Return a mutable copy of a frozen archetype tree."""
+    # Concrete types : isinstance checks against typing.Mapping dominate the copy otherwise
+    if isinstance(tree, dict):
+        return {key: thaw(value) for key, value in tree.items()}
+    if isinstance(tree, tuple):
+        return [thaw(value) for value in tree]
+    return tree
+
+
+class ArchetypeRegistry:
+    """
+    Archetype files parsed once and indexed by id. Archetypes are stored as frozen trees (`FrozenDict` and tuples) which are handed out as is : a lookup copies nothing, and a caller which needs to modify an archetype
+    takes its own mutable copy with `thaw`. The registry of the API is populated when this module is imported.
+    `reload` parses the files of a data directory and swaps them in at once, concurrent lookups see either the
+    previous or the new archetypes. The API reloads its archetypes on SIGHUP (see `boaviztapi.main`).
+    """
+
+    def __init__(self, root: str):
+        self._state = (root, {})
+        self._fingerprint = ""
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> str:
+        return self._state[0]
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of the content of the archetype files of the last `reload`."""
+        return self._fingerprint
+
+    def path(self, relative_path: str) -> str:
+        return os.path.join(self.root, relative_path)
+
+    def get(self, archetype_name: str, csv_path: str) -> Union[Mapping, bool]:
+        archetype = self._table(csv_path).get(archetype_name.strip())
+        if archetype is None:
+            return False
+        return archetype
+
+    def reload(self, root: Optional[str] = None) -> None:
+        root = root or self.root
+        tables = {}
+        digest = hashlib.sha256()
+        for directory, _, files in sorted(os.walk(os.path.join(root, "archetypes"))):
+            for file in sorted(files):
+                if file.endswith(".csv"):
+                    csv_path = os.path.join(directory, file)
+                    tables[os.path.normpath(csv_path)] = data_snapshot.load(csv_path, _parse_archetype_file)
+                    with open(csv_path, "rb") as f:
+                        digest.update(os.path.relpath(csv_path, root).encode() + b"\0" + f.read())
+        with self._lock:
+            self._state = (root, tables)
+            self._fingerprint = digest.hexdigest()
+
+    def _table(self, csv_path: str) -> Dict[str, Mapping]:
+        key = os.path.normpath(csv_path)
+        table = self._state[1].get(key)
+        if table is None:
+            with self._lock:
+                root, tables = self._state
+                table = tables.get(key)
+                if table is None:
+                    table = data_snapshot.load(csv_path, _parse_archetype_file)
+                    self._state = (root, {**tables, key: table})
+        return table
+
+
+def _parse_archetype_file(csv_path: str) -> Dict[str, Mapping]:
+    table = {}
+    with open(csv_path, encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        # Files without an id column (e.g. the list of cloud providers) are not archetype files
+        if "id" not in (reader.fieldnames or []):
+            return FrozenDict(table)
+        for row in reader:
+            # As with the former linear scan, the first row of a given id wins
+            table.setdefault(row["id"].strip(), freeze(row2json(row)))
+    return FrozenDict(table)
 
 
 def get_device_archetype_lst(path):
@@ -20,21 +137,21 @@ def get_device_archetype_lst_with_type(path, name: str, ) -> Union[dict, bool]:
 
 
 def get_component_archetype(archetype_name: str, component_type: str) -> Union[dict, bool]:
-    arch = get_archetype(archetype_name, os.path.join(data_dir, "archetypes/components/" + component_type + ".csv"))
+    arch = get_archetype(archetype_name, archetype_registry.path("archetypes/components/" + component_type + ".csv"))
     if not arch:
         return False
     return arch
 
 
 def get_server_archetype(archetype_name: str) -> Union[dict, bool]:
-    arch = get_archetype(archetype_name, os.path.join(data_dir, "archetypes/server.csv"))
+    arch = get_archetype(archetype_name, archetype_registry.path("archetypes/server.csv"))
     if not arch:
         return False
     return arch
 
 
 def get_user_terminal_archetype(archetype_name: str) -> Union[dict, bool]:
-    arch = get_archetype(archetype_name, os.path.join(data_dir, "archetypes/user_terminal.csv"))
+    arch = get_archetype(archetype_name, archetype_registry.path("archetypes/user_terminal.csv"))
     if not arch:
         return False
     return arch
@@ -42,20 +159,17 @@ def get_user_terminal_archetype(archetype_name: str) -> Union[dict, bool]:
 
 def get_cloud_instance_archetype(archetype_name: str, provider: str) -> Union[dict, bool]:
     arch = False
-    if os.path.exists(data_dir + "/archetypes/cloud/" + provider + ".csv"):
-        arch = get_archetype(archetype_name, os.path.join(data_dir, "archetypes/cloud/" + provider + ".csv"))
+    csv_path = archetype_registry.path("archetypes/cloud/" + provider + ".csv")
+    if os.path.exists(csv_path):
+        arch = get_archetype(archetype_name, csv_path)
     if not arch:
         return False
     return arch
 
 
+@timed_stage("archetype")
 def get_archetype(archetype_name: str, csv_path: str) -> Union[dict, bool]:
-    with open(csv_path, encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            if row["id"].strip() == archetype_name.strip():
-                return row2json(row)
-    return False
+    return archetype_registry.get(archetype_name, csv_path)
 
 
 def parse_to_boattribute_json(value):
@@ -122,13 +236,13 @@ def get_arch_component(archetype: dict, component_name: str, default=None):
         return default
     if archetype.get(component_name) is not None:
         if component_name != "USAGE" and archetype.get("USAGE") is not None:
-            archetype[component_name]["USAGE"] = archetype.get("USAGE")
+            return {**archetype.get(component_name), "USAGE": archetype.get("USAGE")}
         return archetype.get(component_name)
     return default
 
 
 def get_iot_device_archetype(archetype_name: str) -> Union[dict, bool]:
-    arch = get_archetype(archetype_name, os.path.join(data_dir, "archetypes/iot_device.csv"))
+    arch = get_archetype(archetype_name, archetype_registry.path("archetypes/iot_device.csv"))
     if not arch:
         return False
     return arch
@@ -146,4 +260,9 @@ def convert(value):
             except ValueError:
                 pass
 
-    return value
\ No newline at end of file
+    return value
+
+
+# Populated eagerly, at import : the first requests do not pay for parsing the archetype files
+archetype_registry = ArchetypeRegistry(data_dir)
+archetype_registry.reload()
@@ -0,0 +1,422 @@
+"""
+Batch evaluation of server and cloud instance impacts.
+
+`compute_impacts_batch` returns the same results as calling `compute_impacts` on every model one after the other, but
+evaluates every (component, criteria, phase, value/min/max) term as a NumPy operation over the whole batch. The
+completion of the models (archetypes, CPU name matching, consumption profiles...) still runs model by model, only the
+impact arithmetic is vectorised. The formulas and the order of the floating point operations mirror the ones of
+`impacts_computation` so that both paths produce identical numbers. `tests/benchmarks/bench_batch_impacts.py` compares
+both paths.
+"""
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import List, Union, Tuple, Callable, Dict
+
+import numpy as np
+
+from boaviztapi import config
+from boaviztapi.model.component import Component
+from boaviztapi.model.device.server import DeviceServer
+from boaviztapi.model.impact import IMPACT_CRITERIAS, EMBEDDED, USE, Impact
+from boaviztapi.model.services.cloud_instance import ServiceCloudInstance
+from boaviztapi.service.factor_provider import get_impact_factor_vector
+from boaviztapi.service.impacts_computation import compute_impacts
+from boaviztapi.service.server_timing import timed_stage
+
+END_OF_LIFE_WARNING = "End of life is not included in the calculation"
+GENERIC_DATA_WARNING = "Generic data used for impact calculation."
+
+BatchModel = Union[DeviceServer, ServiceCloudInstance]
+
+
+@dataclass
+class BatchImpacts:
+    """
+    value, min and max of an impact for a batch of rows (models or components) and a list of criteria. Each array
+    has a (rows, criteria) shape. `ok` is False where the scalar path would have returned no impact.
+    """
+    value: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    ok: np.ndarray
+
+    @classmethod
+    def empty(cls, n_rows: int, n_criteria: int) -> "BatchImpacts":
+        return cls(value=np.zeros((n_rows, n_criteria)),
+                   min=np.zeros((n_rows, n_criteria)),
+                   max=np.zeros((n_rows, n_criteria)),
+                   ok=np.zeros((n_rows, n_criteria), dtype=bool))
+
+    def scale(self, value: np.ndarray, min: np.ndarray, max: np.ndarray) -> None:
+        self.value = self.value * value[:, None]
+        self.min = self.min * min[:, None]
+        self.max = self.max * max[:, None]
+
+    def impacts(self, warnings: List[List[str]]) -> List[List[Union[Impact, None]]]:
+        """
+        The Impact of each (row, criteria), None where `ok` is False, with the `warnings` of its row. The arrays are
+        converted to Python floats once : per cell NumPy indexing would cost more than the arithmetic of the batch.
+        """
+        return [[Impact(value=value, min=min, max=max, warnings=list(set(row_warnings))) if ok else None
+                 for value, min, max, ok in zip(*row)]
+                for *row, row_warnings in zip(self.value.tolist(), self.min.tolist(), self.max.tolist(),
+                                              self.ok.tolist(), warnings)]
+
+
+@timed_stage("impacts")
+def compute_impacts_batch(models: List[Union[BatchModel, Component]],
+                          selected_criteria=config["default_criteria"],
+                          duration=config["default_duration"]) -> List[dict]:
+    """
+    Compute the impacts of a list of `DeviceServer` and `ServiceCloudInstance` models.
+
+    Returns the list of `compute_impacts` results, in the order of `models`. As in the server and cloud routers, a
+    `duration` of None means the lifetime of each device. Models of any other type are delegated to `compute_impacts`.
+    """
+    criteria = [c.name for c in IMPACT_CRITERIAS.values() if "all" in selected_criteria or c.name in selected_criteria]
+
+    batch = [model for model in models if isinstance(model, (DeviceServer, ServiceCloudInstance))]
+    if batch and criteria:
+        durations = np.array([_resolve_duration(model, duration) for model in batch], dtype=float)
+        embedded = _batch_embedded(batch, criteria, durations)
+        use = _batch_use(batch, criteria, durations).impacts([[]] * len(batch))
+        for n, model in enumerate(batch):
+            for j, c in enumerate(criteria):
+                model.add_impacts(embedded[n][j], c, EMBEDDED)
+                model.add_impacts(use[n][j], c, USE)
+
+    results = []
+    for model in models:
+        if isinstance(model, (DeviceServer, ServiceCloudInstance)):
+            results.append(model.get_impacts(selected_criteria))
+        else:
+            results.append(compute_impacts(model, selected_criteria=selected_criteria, duration=duration))
+    return results
+
+
+def _resolve_duration(model: BatchModel, duration):
+    if duration is not None:
+        return duration
+    return _platform(model).usage.hours_life_time.value
+
+
+def _platform(model: BatchModel) -> DeviceServer:
+    if isinstance(model, ServiceCloudInstance):
+        return model.platform
+    return model
+
+
+def _read(elements: list, rows: np.ndarray, *names: str) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Read the value, min and max of the Boattributes `names` of the selected rows. As in the scalar functions, every
+    value is read (and thus completed) before the min and max. Rows that are not selected are left untouched.
+    """
+    getters = [attrgetter(name) for name in names]
+    result = [(np.ones(len(elements)), np.ones(len(elements)), np.ones(len(elements))) for _ in names]
+    selected = np.flatnonzero(rows)
+    for i in selected:
+        for getter, (value, _, _) in zip(getters, result):
+            value[i] = getter(elements[i]).value
+    for i in selected:
+        for getter, (_, min, _) in zip(getters, result):
+            min[i] = getter(elements[i]).min
+        for getter, (_, _, max) in zip(getters, result):
+            max[i] = getter(elements[i]).max
+    return result
+
+
+def _allocate(impacts: BatchImpacts, durations: np.ndarray, life_times: list) -> None:
+    """Vectorised `Impact.allocate`, applied to the rows having at least one impact."""
+    selected = np.flatnonzero(impacts.ok.any(axis=1))
+    ratio, ratio_min, ratio_max = np.ones(len(life_times)), np.ones(len(life_times)), np.ones(len(life_times))
+    for i in selected:
+        life_time = life_times[i]
+        if durations[i] > life_time.value:
+            continue
+        ratio[i] = durations[i] / life_time.value
+        ratio_min[i] = durations[i] / life_time.max
+        ratio_max[i] = durations[i] / life_time.min
+
+    impacts.scale(ratio, ratio_min, ratio_max)
+
+
+def _units_embedded(item: str) -> Callable[[List[Component], List[str], np.ndarray], BatchImpacts]:
+    def units_embedded(components: List[Component], criteria: List[str], alive: np.ndarray) -> BatchImpacts:
+        impact, available = get_impact_factor_vector(item, criteria, 'impact')
+        ok = alive & available
+        (units,) = _read(components, ok.any(axis=1), 'units')
+
+        return BatchImpacts(value=impact * units[0][:, None],
+                            min=impact * units[1][:, None],
+                            max=impact * units[2][:, None],
+                            ok=ok)
+
+    return units_embedded
+
+
+def _cpu_embedded(cpus: List[Component], criteria: List[str], alive: np.ndarray) -> BatchImpacts:
+    die_impact, die_available = get_impact_factor_vector('cpu', criteria, 'die_impact')
+    impact, available = get_impact_factor_vector('cpu', criteria, 'impact')
+    ok = alive & die_available & available
+    die_size, units = _read(cpus, ok.any(axis=1), 'die_size', 'units')
+
+    return BatchImpacts(value=(die_size[0][:, None] * die_impact + impact) * units[0][:, None],
+                        min=(die_size[1][:, None] * die_impact + impact) * units[1][:, None],
+                        max=(die_size[2][:, None] * die_impact + impact) * units[2][:, None],
+                        ok=ok)
+
+
+def _density_embedded(item: str) -> Callable[[List[Component], List[str], np.ndarray], BatchImpacts]:
+    def density_embedded(components: List[Component], criteria: List[str], alive: np.ndarray) -> BatchImpacts:
+        die_impact, die_available = get_impact_factor_vector(item, criteria, 'die_impact')
+        impact, available = get_impact_factor_vector(item, criteria, 'impact')
+        ok = alive & die_available & available
+        capacity, density, units = _read(components, ok.any(axis=1), 'capacity', 'density', 'units')
+
+        return BatchImpacts(
+            value=((capacity[0] / density[0])[:, None] * die_impact + impact) * units[0][:, None],
+            min=((capacity[1] / density[2])[:, None] * die_impact + impact) * units[1][:, None],
+            max=((capacity[2] / density[1])[:, None] * die_impact + impact) * units[2][:, None],
+            ok=ok)
+
+    return density_embedded
+
+
+def _power_supply_embedded(power_supplies: List[Component], criteria: List[str], alive: np.ndarray) -> BatchImpacts:
+    impact, available = get_impact_factor_vector('power_supply', criteria, 'impact')
+    ok = alive & available
+    unit_weight, units = _read(power_supplies, ok.any(axis=1), 'unit_weight', 'units')
+
+    return BatchImpacts(value=unit_weight[0][:, None] * impact * units[0][:, None],
+                        min=unit_weight[1][:, None] * impact * units[1][:, None],
+                        max=unit_weight[2][:, None] * impact * units[2][:, None],
+                        ok=ok)
+
+
+def _case_embedded(cases: List[Component], criteria: List[str], alive: np.ndarray) -> BatchImpacts:
+    case_types = [case.case_type.value for case in cases]
+    is_blade = np.array([case_type == 'blade' for case_type in case_types])
+    is_rack = np.array([case_type == 'rack' for case_type in case_types])
+    is_archetype = np.array([case.case_type.is_archetype() for case in cases])
+
+    rack, rack_available = get_impact_factor_vector('case', criteria, 'rack.impact')
+    blade_server, server_available = get_impact_factor_vector('case', criteria, 'blade.impact_blade_server')
+    blade_16_slots, slots_available = get_impact_factor_vector('case', criteria, 'blade.impact_blade_16_slots')
+    blade = (blade_16_slots / 16) + blade_server
+    blade_available = server_available & slots_available
+
+    # An archetype case is bounded by the impact of the other case type
+    rack_archetype = (is_archetype & is_rack)[:, None]
+    blade_archetype = (is_archetype & is_blade)[:, None]
+    needs_rack = (~is_blade)[:, None] | blade_archetype
+    needs_blade = is_blade[:, None] | rack_archetype
+    ok = alive & (~needs_rack | rack_available) & (~needs_blade | blade_available)
+    (units,) = _read(cases, ok.any(axis=1), 'units')
+
+    rack_units = [rack * units[k][:, None] for k in range(3)]
+    blade_units = [blade * units[k][:, None] for k in range(3)]
+    rack = np.broadcast_to(rack, ok.shape)
+    blade = np.broadcast_to(blade, ok.shape)
+    blade_higher = blade_units[0] > rack
+    rack_higher = rack_units[0] > blade
+
+    computed = []
+    for k, (rack_bound, blade_bound) in enumerate([(None, None),
+                                                   (np.where(blade_higher, rack, blade_units[1]),
+                                                    np.where(rack_higher, blade, rack_units[1])),
+                                                   (np.where(blade_higher, blade_units[2], rack),
+                                                    np.where(rack_higher, rack_units[2], blade))]):
+        rack_impact = np.where(rack_archetype, rack if k == 0 else rack_bound, rack_units[k])
+        blade_impact = np.where(blade_archetype, blade if k == 0 else blade_bound, blade_units[k])
+        computed.append(np.where(is_blade[:, None], blade_impact, rack_impact))
+
+    return BatchImpacts(value=computed[0] * units[0][:, None],
+                        min=computed[1] * units[1][:, None],
+                        max=computed[2] * units[2][:, None],
+                        ok=ok)
+
+
+_embedded_functions: Dict[str, Callable[[List[Component], List[str], np.ndarray], BatchImpacts]] = {
+    "ASSEMBLY": _units_embedded('assembly'),
+    "CPU": _cpu_embedded,
+    "RAM": _density_embedded('ram'),
+    "SSD": _density_embedded('ssd'),
+    "HDD": _units_embedded('hdd'),
+    "POWER_SUPPLY": _power_supply_embedded,
+    "CASE": _case_embedded,
+    "MOTHERBOARD": _units_embedded('motherboard'),
+}
+
+
+def _embedded_components(model: BatchModel) -> List[Tuple[Component, float]]:
+    """Components walked by `server_impact_embedded` / `cloud_impact_embedded`, with their allocation."""
+    if isinstance(model, DeviceServer):
+        return [(component, 1) for component in model.components]
+
+    platform = model.platform
+    default_allocation = model.vcpu.value / platform.get_total_vcpu()
+    components = []
+    for component in platform.components:
+        allocation = default_allocation
+        if component.NAME == "RAM":
+            allocation = model.memory.value / platform.get_total_memory()
+        if component.NAME == "SSD":
+            if not model.ssd_storage.has_value():
+                continue
+            allocation = model.ssd_storage.value / platform.get_total_disk_capacity("SSD")
+        if component.NAME == "HDD":
+            if not model.hdd_storage.has_value():
+                continue
+            allocation = model.hdd_storage.value / platform.get_total_disk_capacity("HDD")
+        components.append((component, allocation))
+    return components
+
+
+def _batch_embedded(models: List[BatchModel], criteria: List[str], durations: np.ndarray) -> List[List[Impact]]:
+    n_models, n_criteria = len(models), len(criteria)
+    components = [_embedded_components(model) for model in models]
+    total = BatchImpacts.empty(n_models, n_criteria)
+    # A criteria stays alive for a model as long as all its components could be assessed
+    alive = np.ones((n_models, n_criteria), dtype=bool)
+
+    for position in range(max(len(c) for c in components)):
+        by_name: Dict[str, List[int]] = {}
+        for n in range(n_models):
+            if position < len(components[n]) and alive[n].any():
+                by_name.setdefault(components[n][position][0].NAME, []).append(n)
+
+        for name, rows in by_name.items():
+            rows = np.array(rows)
+            entries = [components[n][position] for n in rows]
+            for n, (component, _) in zip(rows, entries):
+                component.usage.hours_life_time = _platform(models[n]).usage.hours_life_time
+
+            impacts = _embedded_functions[name]([component for component, _ in entries], criteria, alive[rows])
+            _allocate(impacts, durations[rows], [component.usage.hours_life_time for component, _ in entries])
+            allocation = np.array([allocation for _, allocation in entries], dtype=float)
+            impacts.scale(allocation, allocation, allocation)
+
+            component_impacts = impacts.impacts([[END_OF_LIFE_WARNING]] * len(entries))
+            for (component, _), row_alive, row_impacts in zip(entries, alive[rows].tolist(), component_impacts):
+                for c, criteria_alive, impact in zip(criteria, row_alive, row_impacts):
+                    if criteria_alive:
+                        component.add_impacts(impact, c, EMBEDDED)
+
+            total.value[rows] += impacts.value
+            total.min[rows] += impacts.min
+            total.max[rows] += impacts.max
+            alive[rows] &= impacts.ok
+
+    total.ok = alive
+    result = total.impacts([[END_OF_LIFE_WARNING] if c else [] for c in components])
+
+    _fallback_embedded(models, criteria, durations, alive, result)
+    return result
+
+
+def _fallback_embedded(models: List[BatchModel], criteria: List[str], durations: np.ndarray,
+                       alive: np.ndarray, result: List[List[Impact]]) -> None:
+    """Generic server impacts used when one of the components could not be assessed."""
+    impact, available = get_impact_factor_vector('SERVER', criteria, 'impact')
+    fallback = BatchImpacts(value=np.broadcast_to(impact, alive.shape),
+                            min=np.broadcast_to(impact, alive.shape),
+                            max=np.broadcast_to(impact, alive.shape),
+                            ok=~alive & available)
+    _allocate(fallback, durations, [_platform(model).usage.hours_life_time for model in models])
+
+    rows = fallback.ok.any(axis=1)
+    units = [np.ones(len(models)), np.ones(len(models)), np.ones(len(models))]
+    for n in np.flatnonzero(rows):
+        model = models[n]
+        if isinstance(model, DeviceServer):
+            units[0][n] = model.units.value
+        else:
+            units[0][n] = units[1][n] = units[2][n] = model.vcpu.value / model.platform.get_total_vcpu()
+    for n in np.flatnonzero(rows):
+        if isinstance(models[n], DeviceServer):
+            units[1][n], units[2][n] = models[n].units.min, models[n].units.max
+    fallback.scale(*units)
+
+    fallback_impacts = fallback.impacts([[GENERIC_DATA_WARNING]] * len(models))
+    for n in np.flatnonzero(rows):
+        for j in np.flatnonzero(~alive[n]):
+            result[n][j] = fallback_impacts[n][j]
+
+
+def _model_power(element) -> bool:
+    """Model the average power of a device or component as the use functions do. Returns False on failure."""
+    try:
+        if not element.usage.avg_power.is_set():
+            modeled_consumption = element.model_power_consumption()
+            element.usage.avg_power.set_completed(
+                modeled_consumption.value,
+                min=modeled_consumption.min,
+                max=modeled_consumption.max
+            )
+        return True
+    except (AttributeError, NotImplementedError):
+        return False
+
+
+def _elec_factors(usages: list, criteria: List[str], rows: np.ndarray) -> BatchImpacts:
+    factors = BatchImpacts.empty(len(usages), len(criteria))
+    for i in np.flatnonzero(rows):
+        for j, c in enumerate(criteria):
+            factor = usages[i].elec_factors[c]
+            try:
+                factors.value[i, j] = factor.value
+            except (AttributeError, NotImplementedError):
+                continue
+            factors.min[i, j] = factor.min
+            factors.max[i, j] = factor.max
+            factors.ok[i, j] = True
+    return factors
+
+
+def _use(factors: BatchImpacts, usages: list, power_usages: list, units: list, durations: np.ndarray) -> BatchImpacts:
+    """Vectorised `impact_factor * (avg_power / 1000) * use_time_ratio * duration * units`."""
+    rows = factors.ok.any(axis=1)
+    avg_power, use_time_ratio = [np.ones(len(usages)) for _ in range(3)], [np.ones(len(usages)) for _ in range(3)]
+    selected = np.flatnonzero(rows)
+    for i in selected:
+        avg_power[0][i] = power_usages[i].avg_power.value
+        use_time_ratio[0][i] = usages[i].use_time_ratio.value
+    for k, bound in [(1, 'min'), (2, 'max')]:
+        for i in selected:
+            avg_power[k][i] = getattr(power_usages[i].avg_power, bound)
+            use_time_ratio[k][i] = getattr(usages[i].use_time_ratio, bound)
+
+    impacts = [factor * (avg_power[k] / 1000)[:, None] * use_time_ratio[k][:, None] * durations[:, None]
+               for k, factor in enumerate([factors.value, factors.min, factors.max])]
+    impacts = BatchImpacts(value=impacts[0], min=impacts[1], max=impacts[2], ok=factors.ok)
+    if units is not None:
+        impacts.scale(*units)
+    return impacts
+
+
+def _batch_use(models: List[BatchModel], criteria: List[str], durations: np.ndarray) -> BatchImpacts:
+    modeled = np.array([_model_power(model) for model in models], dtype=bool)
+
+    # Component level impacts of the CPU and RAM of each platform
+    components, rows = [], []
+    for n in np.flatnonzero(modeled):
+        platform = _platform(models[n])
+        for component in [platform.cpu] + platform.ram:
+            components.append(component)
+            rows.append(n)
+    if components:
+        rows = np.array(rows)
+        component_modeled = np.array([_model_power(component) for component in components], dtype=bool)
+        usages = [component.usage for component in components]
+        factors = _elec_factors(usages, criteria, component_modeled)
+        impacts = _use(factors, usages, usages, None, durations[rows]).impacts([[]] * len(components))
+        for component, component_impacts in zip(components, impacts):
+            for c, impact in zip(criteria, component_impacts):
+                component.add_impacts(impact, c, USE)
+
+    # Device level impacts
+    platform_usages = [_platform(model).usage for model in models]
+    factors = _elec_factors(platform_usages, criteria, modeled)
+    servers = np.array([isinstance(model, DeviceServer) for model in models], dtype=bool)
+    (units,) = _read(models, factors.ok.any(axis=1) & servers, 'units')
+    return _use(factors, platform_usages, [model.usage for model in models], units, durations)
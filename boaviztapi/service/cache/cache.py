@@ -1,15 +1,56 @@
 import asyncio
-from typing import Dict, Any
+import contextlib
+import json
+from typing import Dict, Any, List, Optional, Tuple
 
-import httpx
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from datetime import datetime, timezone, timedelta
 import logging
+from urllib.parse import parse_qs, urlsplit
 
+from pymongo import ASCENDING, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError
 from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.asynchronous.database import AsyncDatabase
 
+from boaviztapi import config
 from boaviztapi.application_context import get_app_context
+from boaviztapi.service.cache.http_fetcher import http_fetcher
+
+# Cached results, one document per cache name and endpoint key
+CACHE_COLLECTION = "cache_entries"
+# Former layout, one document per cache name holding the results of all its endpoints, migrated on startup
+LEGACY_CACHE_COLLECTION = "electricity_prices_cache"
+
+# Warning header of the responses served from stale cached results
+STALE_WARNING = '110 - "Response is Stale"'
+
+
+def _as_utc(value) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    # MongoDB returns naive datetimes, in UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def index_by_zone(results: Dict[str, Any]) -> Dict[str, dict]:
+    """
+    Index the results by zone code : the `zone` query parameter of their endpoint, or else the `zone` field of the
+    result. The results stored as JSON strings are decoded, the errors are left out.
+    """
+    zones = {}
+    for url, result in results.items():
+        if isinstance(result, str):
+            try:
+                result = json.loads(result)
+            except ValueError:
+                continue
+        if not isinstance(result, dict) or "error" in result:
+            continue
+        zone = parse_qs(urlsplit(url).query).get("zone", [result.get("zone")])[0]
+        if zone:
+            zones[zone] = result
+    return zones
 
 
 class CacheService:
@@ -44,90 +85,260 @@ class CacheService:
         self.headers = headers
         self.save_errors = save_errors
         self.memory_cache = {}
+        # Expiry of the result of each endpoint
+        self.expires_at: Dict[str, datetime] = {}
+        # Results of the memory cache by zone code (see `index_by_zone`)
+        self.zones: Dict[str, dict] = {}
+        # Incremented each time the results in memory change, part of the key of the cached impacts (see `request_key`)
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
         self.db_cache = None
         self.scheduler = AsyncIOScheduler()
+        self._startup: Optional[asyncio.Future] = None
+        self._refresh: Optional[asyncio.Future] = None
+        # Refresh started while the cache had no result at all, awaited by the readers (see `_ensure_started`)
+        self._first_refresh: Optional[asyncio.Future] = None
         self._logger = logging.getLogger("CacheService-" + name)
         self._initialized = True  # Mark as initialized
 
 
-    async def fetch_all(self) -> None:
-        """
-        Scheduled job based on the set `ttl` value. It does a GET request for each endpoint and stores the
-        results in the memory cache. The memory cache is also persisted to MongoDB in case of server restart.
-        """
-        # First, check if the database cache is not expired.
-        cached_results = await self.get_results()
-
-        if cached_results and cached_results.get("expires_at") and cached_results.get("data"):
-            expires_at = cached_results["expires_at"]
-            if isinstance(expires_at, datetime):
-                expires_at = expires_at.replace(tzinfo=timezone.utc)
-            if isinstance(expires_at, str):
-                expires_at = datetime.fromisoformat(expires_at)
-            if datetime.now(timezone.utc) < expires_at:
-                self._logger.info("Using cached results")
-                # The cache is not expired, use the cached results.
-                self.memory_cache = cached_results["data"]
-                return
-
-        # The cache is expired or does not exist, fetch the results from the endpoints.
-        self._logger.info("Fetching results from endpoints")
-        async with httpx.AsyncClient(timeout=10) as client:
-            if self.headers:
-                client.headers.update(self.headers)
-            tasks = [client.get(url) for url in self.endpoints]
-            responses = await asyncio.gather(*tasks, return_exceptions=True)
-            self.memory_cache.clear()
-            for url, resp in zip(self.endpoints, responses):
-                if isinstance(resp, Exception) or not 200 <= resp.status_code <= 299:
-                    if self.save_errors:
-                        self._logger.error(f"Error fetching results from {url}: {resp}")
-                        self.memory_cache[url] = {"error": str(resp)}
-                else:
-                    self.memory_cache[url] = resp.json()
+    async def fetch_all(self, endpoints: Optional[List[str]] = None) -> None:
+        """
+        Does a GET request for each of `endpoints` (all the endpoints by default) and stores the results in the memory
+        cache. Each result is also persisted to MongoDB, as its own document, in case of server restart. The endpoints
+        which could not be fetched keep their previous result, served stale : with `save_errors`, an error is only
+        saved for the endpoints which have no result yet.
+        """
+        endpoints = self.endpoints if endpoints is None else endpoints
+        previous = self.memory_cache
+        self._logger.info(f"Fetching results from {len(endpoints)} endpoints")
+        responses = await http_fetcher.fetch_all(endpoints, headers=self.headers)
+        results = {}
+        for url, resp in zip(endpoints, responses):
+            if isinstance(resp, Exception) or not 200 <= resp.status_code <= 299:
+                if self.save_errors and not self._has_result(url):
+                    self._logger.error(f"Error fetching results from {url}: {resp}")
+                    results[url] = {"error": str(resp)}
+            else:
+                results[url] = resp.json()
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        if any(key not in previous or previous[key] != data for key, data in results.items()):
+            self.version += 1
+        # Swapped at once, readers never see a partial refresh
+        self.memory_cache = {**self.memory_cache, **results}
+        self.zones = index_by_zone(self.memory_cache)
+        self.expires_at = {**self.expires_at, **dict.fromkeys(results, expires_at)}
+
         self._logger.info("Persisting results to database")
-        await self.db_cache.find_one_and_update(
-            filter={"name": self.name},
-            update={"$set":{
-                "data": self.memory_cache,
-                "expires_at": datetime.now(timezone.utc) + timedelta(seconds=self.ttl)}},
-            upsert=True
-        )
+        await self._persist(results, previous, expires_at)
 
-    async def startup(self):
+    async def _load_persisted(self) -> Dict[str, Tuple[Any, datetime]]:
+        documents = await self.db_cache.find({"cache": self.name}, {"_id": 0, "key": 1, "data": 1, "expires_at": 1}) \
+            .to_list(None)
+        return {document["key"]: (document["data"], _as_utc(document["expires_at"])) for document in documents}
+
+    async def _persist(self, results: Dict[str, Any], previous: Dict[str, Any], expires_at: datetime) -> None:
+        """
+        Upsert the results which changed since `previous`, and only extend the expiry of the others, in one bulk
+        write.
+        """
+        changed = [key for key, data in results.items() if key not in previous or previous[key] != data]
+        unchanged = [key for key in results if key not in changed]
+        requests = [UpdateOne({"cache": self.name, "key": key},
+                              {"$set": {"data": results[key], "expires_at": expires_at}},
+                              upsert=True)
+                    for key in changed]
+        if unchanged:
+            requests.append(UpdateMany({"cache": self.name, "key": {"$in": unchanged}},
+                                       {"$set": {"expires_at": expires_at}}))
+        if requests:
+            await self.db_cache.bulk_write(requests, ordered=False)
+
+    def _has_result(self, url: str) -> bool:
+        result = self.memory_cache.get(url)
+        return result is not None and not (isinstance(result, dict) and "error" in result)
+
+    async def _migrate_legacy(self, db: AsyncDatabase, db_cache: AsyncCollection) -> None:
         """
-        Start the cache service. It first pre-warms the cache with the latest results from the endpoints.
+        Split the document of this cache in `LEGACY_CACHE_COLLECTION`, if any, into one document per endpoint of
+        `db_cache`, then delete it. The entries already persisted in the new layout are kept.
         """
-        self._logger.info("Starting cache service")
-        if not self.db_cache:
-            self._logger.info("Initializing database cache")
-            _ctx = get_app_context()
-            _db : AsyncDatabase = _ctx.mongodb_client.get_database(_ctx.database_name)
-            self.db_cache : AsyncCollection = _db.get_collection("electricity_prices_cache")
+        legacy: AsyncCollection = db.get_collection(LEGACY_CACHE_COLLECTION)
+        document = await legacy.find_one({"name": self.name})
+        if not document:
+            return
+        if document.get("data"):
+            expires_at = _as_utc(document["expires_at"]) if document.get("expires_at") else datetime.now(timezone.utc)
+            requests = [UpdateOne({"cache": self.name, "key": key},
+                                  {"$setOnInsert": {"data": data, "expires_at": expires_at}},
+                                  upsert=True)
+                        for key, data in document["data"].items()]
+            try:
+                await db_cache.bulk_write(requests, ordered=False)
+            except BulkWriteError:
+                # Upserts racing with another worker migrating the same cache
+                self._logger.warning("Some legacy cache entries were migrated concurrently", exc_info=True)
+        await legacy.delete_one({"_id": document["_id"]})
+        self._logger.info(f"Migrated {len(document.get('data') or {})} results from {LEGACY_CACHE_COLLECTION}")
 
-        # pre-warm the cache
-        self._logger.info("Pre-warming cache")
-        await self.fetch_all()
+    def expired_endpoints(self) -> List[str]:
+        """Endpoints whose result is missing, or past its expiry."""
+        now = datetime.now(timezone.utc)
+        return [url for url in self.endpoints if url not in self.expires_at or self.expires_at[url] <= now]
 
-        # schedule hourly refresh
-        self._logger.info("Scheduling cache refresh")
-        self.scheduler.add_job(self.fetch_all, 'interval', seconds=self.ttl)
-        self.scheduler.start()
+    @property
+    def stale(self) -> bool:
+        """True while some endpoint is served past its expiry, or has no result yet."""
+        return bool(self.expired_endpoints())
 
-    async def get_results(self) -> Dict[str, Any]:
+    def refresh_in_background(self, endpoints: Optional[List[str]] = None) -> asyncio.Future:
         """
-        Get the results from the cache.
+        Refresh the results of `endpoints` (all the endpoints by default) in a background task, the results in memory
+        are served meanwhile. A refresh in progress is returned instead of starting another one.
+        """
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.ensure_future(self._refresh_logged(endpoints))
+        return self._refresh
 
-        It first tries to get the results from the memory cache. If it fails, it tries to get the results from the database.
+    async def _refresh_logged(self, endpoints: Optional[List[str]]) -> None:
+        try:
+            await self.fetch_all(endpoints)
+        except Exception:
+            self._logger.exception("Cache refresh failed, the previous results are still served")
+
+    async def _scheduled_refresh(self) -> None:
+        await self.refresh_in_background()
+
+    async def startup(self):
+        """
+        Start the cache service (stale-while-revalidate) : the persisted results, expired ones included, are loaded in
+        memory and served at once, while the expired or missing ones are refreshed in the background. Then the results
+        are refreshed every `ttl` seconds. Concurrent calls share the same startup, which never waits on the endpoints.
+        Only when nothing is persisted at all do the readers wait for the first refresh (see `_ensure_started`).
         """
+        if self._startup is None:
+            self._startup = asyncio.ensure_future(self._start())
+        await asyncio.shield(self._startup)
+
+    async def _start(self) -> None:
+        try:
+            self._logger.info("Starting cache service")
+            if self.db_cache is None:
+                self._logger.info("Initializing database cache")
+                _ctx = get_app_context()
+                _db : AsyncDatabase = _ctx.mongodb_client.get_database(_ctx.database_name)
+                db_cache : AsyncCollection = _db.get_collection(CACHE_COLLECTION)
+                # One document per cache and endpoint, looked up by both
+                await db_cache.create_index([("cache", ASCENDING), ("key", ASCENDING)], unique=True)
+                await self._migrate_legacy(_db, db_cache)
+                self.db_cache = db_cache
+
+            self._logger.info("Loading persisted results")
+            endpoints = set(self.endpoints)
+            persisted = {key: entry for key, entry in (await self._load_persisted()).items() if key in endpoints}
+            self.memory_cache = {key: data for key, (data, _) in persisted.items()}
+            self.zones = index_by_zone(self.memory_cache)
+            self.expires_at = {key: expires_at for key, (_, expires_at) in persisted.items()}
+            self.version += 1
+
+            expired = self.expired_endpoints()
+            if expired:
+                self._logger.info(f"Refreshing {len(expired)} expired results in the background")
+                refresh = self.refresh_in_background(expired)
+                if not self.memory_cache:
+                    self._first_refresh = refresh
+
+            self._logger.info("Scheduling cache refresh")
+            self.scheduler.add_job(self._scheduled_refresh, 'interval', seconds=self.ttl, id="refresh",
+                                   replace_existing=True)
+            if not self.scheduler.running:
+                self.scheduler.start()
+        except BaseException:
+            # Tried again by the next call
+            self._startup = None
+            raise
+
+    async def shutdown(self) -> None:
+        """Stop the scheduled refreshes and cancel a refresh in progress."""
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+        refresh, self._refresh = self._refresh, None
+        self._first_refresh = None
+        if refresh is not None and not refresh.done():
+            refresh.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await refresh
+        self._startup = None
+
+    async def _ensure_started(self) -> None:
         if self.db_cache is None:
-            self._logger.info("Database cache not initialized, lazily trying to start the cache service")
+            self._logger.info("Database cache not initialized, lazily starting the cache service")
+            # Only loads the persisted results, the endpoints are fetched in the background
             await self.startup()
             if self.db_cache is None:
                 raise RuntimeError("The database cache was not initialized on application startup and lazy startup failed.")
+        first_refresh = self._first_refresh
+        if first_refresh is not None and not first_refresh.done():
+            # Nothing to serve, even stale : the first refresh is awaited, up to `cache_first_fetch_timeout` seconds
+            await asyncio.wait({first_refresh}, timeout=config["cache_first_fetch_timeout"])
+
+    async def get_results(self) -> Dict[str, Any]:
+        """
+        Get all the results from the cache, by endpoint. Does not wait on the endpoints when results are persisted :
+        they may be stale (see `stale`) until they are refreshed in the background.
+
+        It first tries to get the results from the memory cache. If it fails, it tries to get the results from the database.
+        """
+        await self._ensure_started()
+
+        if self.memory_cache:
+            self.hits += 1
+            return self.memory_cache
+
+        self.misses += 1
+        return {key: data for key, (data, _) in (await self._load_persisted()).items()}
+
+    async def get_result(self, key: str) -> Any:
+        """
+        Get the result of one endpoint, None if it is not cached. Read from the memory cache, or else with one indexed
+        read of its document in the database.
+        """
+        await self._ensure_started()
 
         if self.memory_cache:
-           return self.memory_cache
+            self.hits += 1
+            return self.memory_cache.get(key)
+
+        self.misses += 1
+        document = await self.db_cache.find_one({"cache": self.name, "key": key}, {"_id": 0, "data": 1})
+        return document["data"] if document else None
+
+    async def get_zone(self, zone: str) -> Optional[dict]:
+        """
+        Get the result of a zone (e.g. 'FR'), None if it is not cached. Looked up in the index built at refresh time,
+        or else in the results of the database.
+        """
+        await self._ensure_started()
+
+        if self.memory_cache:
+            self.hits += 1
+            return self.zones.get(zone)
+
+        self.misses += 1
+        return index_by_zone({key: data for key, (data, _) in (await self._load_persisted()).items()}).get(zone)
+
+    def metrics(self) -> dict:
+        """
+        Reads served from memory (hits) or from the database (misses), number of cached endpoints, age of the oldest
+        cached result in seconds (None before the first load) and whether some results are stale (0 or 1).
+        """
+        oldest = min(self.expires_at.values(), default=None)
+        age = (datetime.now(timezone.utc) - oldest).total_seconds() + self.ttl if oldest else None
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.memory_cache), "age": age,
+                "stale": int(self.stale)}
 
-        return await self.db_cache.find_one(({"name": self.name}))
+    @classmethod
+    def instances(cls) -> list["CacheService"]:
+        return list(cls._instances.values())
 
@@ -0,0 +1,144 @@
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+from boaviztapi import config
+
+_log = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class HostRateLimiter:
+    """Spaces the requests to each host at least `1 / rate` seconds apart. A `rate` of 0 disables the limit."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._next: Dict[str, float] = {}
+
+    async def acquire(self, host: str) -> None:
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        # Reserved before sleeping : concurrent callers queue up one interval after another
+        start = max(now, self._next.get(host, now))
+        self._next[host] = start + 1 / self.rate
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class HttpFetcher:
+    """
+    Long-lived, pooled HTTP client shared by the refreshes of the caches (see `CacheService.fetch_all`). At most
+    `concurrency` requests are in flight at once, across all the caches, and the requests to each host are rate
+    limited. Transport errors (timeouts included) and the `RETRY_STATUS_CODES` responses are retried up to `retries`
+    times, after an exponential backoff with full jitter (or the Retry-After delay of the response), capped at
+    `backoff_max` seconds. The client is created on first use, and again if used from another event loop.
+    """
+
+    def __init__(self,
+                 concurrency: int = 16,
+                 rate_per_host: float = 0,
+                 retries: int = 3,
+                 backoff: float = 0.5,
+                 backoff_max: float = 30.0,
+                 timeout: float = 10.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self._transport = transport
+        self._rate_limiter = HostRateLimiter(rate_per_host)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def from_config(cls) -> "HttpFetcher":
+        return cls(concurrency=config["cache_fetch_concurrency"],
+                   rate_per_host=config["cache_fetch_rate_per_host"],
+                   retries=config["cache_fetch_retries"],
+                   backoff=config["cache_fetch_backoff"],
+                   backoff_max=config["cache_fetch_backoff_max"],
+                   timeout=config["cache_fetch_timeout"])
+
+    async def fetch(self, url: str, headers: Optional[dict] = None,
+                    timeout: Optional[float] = None, retries: Optional[int] = None) -> httpx.Response:
+        """GET `url`, retried. Returns the last response, or raises the last transport error."""
+        retries = self.retries if retries is None else retries
+        client, semaphore = self._get_client()
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            retry_after = None
+            async with semaphore:
+                await self._rate_limiter.acquire(host)
+                try:
+                    response = await client.get(url, headers=headers, timeout=timeout or self.timeout)
+                except httpx.TransportError:
+                    if attempt >= retries:
+                        raise
+                    _log.debug("Retrying %s after a transport error", url, exc_info=True)
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                        return response
+                    retry_after = _retry_after(response)
+                    _log.debug("Retrying %s after a %s response", url, response.status_code)
+            # The backoff is waited without holding a slot
+            await asyncio.sleep(self._delay(attempt, retry_after))
+            attempt += 1
+
+    async def fetch_all(self, urls: List[str], headers: Optional[dict] = None,
+                        timeout: Optional[float] = None) -> List[Union[httpx.Response, Exception]]:
+        """Fetch every url, the responses (or errors) are returned in the order of `urls`."""
+        return await asyncio.gather(*[self.fetch(url, headers, timeout) for url in urls], return_exceptions=True)
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        self._semaphore = self._loop = None
+        if client is not None:
+            await client.aclose()
+
+    def _get_client(self):
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            # A client (and its connections) cannot be shared across event loops
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+                timeout=self.timeout,
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._client, self._semaphore
+
+    def _delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt))
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        # An HTTP date
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+http_fetcher = HttpFetcher.from_config()
@@ -1,13 +1,11 @@
-import os.path
-
 import pandas as pd
 
-from boaviztapi import data_dir
 from boaviztapi.model.cloud_prices.cloud_prices import AzurePriceModel, GcpPriceModel, AWSPriceModel
 from boaviztapi.model.crud_models.configuration_model import CloudConfigurationModel
+from boaviztapi.service.reference_data import PriceTable, aws_prices, azure_prices, cloud_regions, gcp_prices
+from boaviztapi.utils.lazy_dataset import LazyDataset
 
-cloud_region_map_path = os.path.join(data_dir, 'electricity/cloud_region_to_electricity_maps.csv')
-cloud_region_map = pd.read_csv(cloud_region_map_path, header=0)
+cloud_region_map = cloud_regions.get()
 def _estimate_cloud_region(localisation: str, provider: str) -> str:
     """
     Estimate the approximate cloud region in which the device is located by using a mapping file. The mapping file
@@ -98,21 +96,38 @@ def get_localisations_for_instance(provider: str, instance_id: str, all_zones: l
 
     return localisations
 
-class AWSPriceProvider:
+class _PriceTableProvider:
+    """
+    Price provider reading the price table `_table`, a reference dataset : with lazy datasets, the parquet file
+    is only read by the first request which needs the prices of the provider.
+    """
+    _table: LazyDataset[PriceTable]
+
+    @property
+    def regions(self) -> list[str]:
+        return self._table.get().regions
+
+    @property
+    def savings_types(self) -> list[str]:
+        return self._table.get().savings_types
+
+    @property
+    def instance_ids(self) -> list[str]:
+        return self._table.get().instance_ids
+
+
+class AWSPriceProvider(_PriceTableProvider):
     _instance = None
+    _table = aws_prices
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self):
-        aws_path = os.path.join(data_dir, 'utils/aws_pricing/aws.parquet')
-        self.aws_prices = pd.read_parquet(aws_path, engine='fastparquet')
-        self.aws_prices.sort_index(inplace=True)
-        self.regions = self.aws_prices.index.get_level_values('region').unique().tolist()
-        self.savings_types = self.aws_prices.index.get_level_values('saving').unique().tolist()
-        self.instance_ids = self.aws_prices.index.get_level_values('id').unique().tolist()
+    @property
+    def aws_prices(self) -> pd.DataFrame:
+        return self._table.get().prices
 
     def _df_to_pydantic(self, df: pd.DataFrame, region: str, instance_id: str, saving: str | None = None) -> list[AWSPriceModel]:
         result = []
@@ -172,21 +187,18 @@ class AWSPriceProvider:
             df = self.aws_prices.xs(instance_id, level='id')
         return df.columns[df.notna().any()].tolist()
 
-class AzurePriceProvider:
+class AzurePriceProvider(_PriceTableProvider):
     _instance = None
+    _table = azure_prices
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self):
-        azure_path = os.path.join(data_dir, 'utils/azure_pricing/azure.parquet')
-        self.azure_prices = pd.read_parquet(azure_path, engine='fastparquet')
-        self.azure_prices.sort_index(inplace=True)
-        self.regions = self.azure_prices.index.get_level_values('region').unique().tolist()
-        self.savings_types = self.azure_prices.index.get_level_values('saving').unique().tolist()
-        self.instance_ids = self.azure_prices.index.get_level_values('id').unique().tolist()
+    @property
+    def azure_prices(self) -> pd.DataFrame:
+        return self._table.get().prices
 
     # @classmethod
     # def normalise_instance_id(cls, instance_id: str):
@@ -266,20 +278,18 @@ class AzurePriceProvider:
         return df.columns[df.notna().any()].tolist()
 
 
-class GcpPriceProvider:
+class GcpPriceProvider(_PriceTableProvider):
     _instance = None
+    _table = gcp_prices
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self):
-        gcp_path = os.path.join(data_dir, 'utils/gcp_pricing/gcp.parquet')
-        self.gcp_prices = pd.read_parquet(gcp_path, engine='fastparquet')
-        self.gcp_prices.sort_index(inplace=True)
-        self.regions = self.gcp_prices.index.get_level_values('region').unique().tolist()
-        self.instance_ids = self.gcp_prices.index.get_level_values('id').unique().tolist()
+    @property
+    def gcp_prices(self) -> pd.DataFrame:
+        return self._table.get().prices
 
     @staticmethod
     def _df_to_pydantic(df: pd.DataFrame, region: str, instance_id: str) -> GcpPriceModel:
@@ -1,14 +1,14 @@
 import os
 from typing import List
 
-import pandas as pd
 import logging
 
 from boaviztapi import data_dir
 from boaviztapi.service.archetype import get_device_archetype_lst as _get_device_archetype_lst
 from boaviztapi.service.cloud_pricing_provider import AzurePriceProvider, AWSPriceProvider, GcpPriceProvider
+from boaviztapi.service.reference_data import cloud_providers
 
-archetype_instances = pd.read_csv(os.path.join(data_dir, 'archetypes/cloud/providers.csv'))
+archetype_instances = cloud_providers.get()
 aws_pricing_instances = AWSPriceProvider()
 azure_pricing_instances = AzurePriceProvider()
 gcp_pricing_instances = GcpPriceProvider()
@@ -0,0 +1,99 @@
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from boaviztapi import config
+from boaviztapi.service.exceptions import ServiceOverloadedError
+
+
+class ComputeExecutor:
+    """
+    Runs the synchronous, CPU bound part of the impact routes (model completion, impact computation, verbose output)
+    in a pool of threads, so that the event loop keeps serving the other requests while an impact is computed.
+    At most `max_queue` computations are admitted at once, running or waiting for a thread : further computations are
+    rejected with a `ServiceOverloadedError` rather than queued without bound.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    async def run(self, function: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            if self._admitted >= self.max_queue:
+                self._rejected += 1
+                raise ServiceOverloadedError()
+            self._admitted += 1
+            executor = self._get_executor()
+
+        submitted = time.perf_counter()
+
+        def job():
+            self._start(time.perf_counter() - submitted)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        try:
+            future = executor.submit(contextvars.copy_context().run, job)
+        except BaseException:
+            self._release(None)
+            raise
+        # Released once the computation is over, or cancelled before it started, even if the caller stops awaiting it
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._admitted - self._running,
+                "running": self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_time_total": self._wait_time_total,
+                "wait_time_max": self._wait_time_max,
+                "wait_time_mean": self._wait_time_total / started if started else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="compute")
+        return self._executor
+
+    def _start(self, wait_time: float) -> None:
+        with self._lock:
+            self._running += 1
+            self._wait_time_total += wait_time
+            self._wait_time_max = max(self._wait_time_max, wait_time)
+
+    def _release(self, future: Optional[Future]) -> None:
+        with self._lock:
+            self._admitted -= 1
+            if future is not None and not future.cancelled():
+                self._completed += 1
+
+
+compute_executor = ComputeExecutor(workers=config["compute_executor_workers"],
+                                   max_queue=config["compute_executor_max_queue"])
@@ -1,14 +1,11 @@
-import os
 from typing import Union
 
-import pandas as pd
-from boaviztapi import data_dir
 from boaviztapi.model.component import Component
 from boaviztapi.model.device import Device
 from boaviztapi.service.electricity_maps.costs_provider import ElectricityCostsProvider
+from boaviztapi.service.reference_data import electricity_prices
 
-_electricity_prices_df = pd.read_csv(os.path.join(data_dir,
-                                                  'electricity/european_wholesale_electricity_price_data_monthly.csv'))
+_electricity_prices_df = electricity_prices.get()
 
 
 async def get_electricity_price(model: Union[Component, Device], location: str = None) -> dict:
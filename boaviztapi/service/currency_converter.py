@@ -1,15 +1,13 @@
-import os
 from typing import Any, Dict, List
 
-from boaviztapi import data_dir
 from boaviztapi.model.currency.currency_models import Currency, CurrencyWithValue
 from boaviztapi.service.cache.cache import CacheService
+from boaviztapi.service.reference_data import currencies
+from boaviztapi.service.server_timing import timed_stage
 from fastapi_cache.decorator import cache
-import pandas as pd
-
 url = "https://api.frankfurter.dev/v1/latest"
 
-currencies_df = pd.read_csv(os.path.join(data_dir, 'currency/frankfurter_currencies.csv'))
+currencies_df = currencies.get()
 
 class CurrencyConverter:
     @staticmethod
@@ -34,8 +32,8 @@ class CurrencyConverter:
         """
         CurrencyConverter.validate_currency(base_currency)
         _cache = await CurrencyConverter.get_cache_scheduler()
-        _cached_results = await _cache.get_results()
-        return _cached_results[CurrencyConverter._url_for_currency(base_currency)]["rates"]
+        _cached_result = await _cache.get_result(CurrencyConverter._url_for_currency(base_currency))
+        return _cached_result["rates"]
 
     @staticmethod
     def get_available_currencies() -> List[Currency]:
@@ -69,6 +67,7 @@ class CurrencyConverter:
         return None
 
     @staticmethod
+    @timed_stage("currency")
     async def convert(source_currency: str, target_currency: str, amount: float) -> CurrencyWithValue | None:
         """
         Converts an amount of a source currency to a target currency.
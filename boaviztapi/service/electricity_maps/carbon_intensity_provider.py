@@ -9,14 +9,19 @@ from boaviztapi.service.utils import temporal_granularity_to_ttl
 class CarbonIntensityProvider(ElectricityMapsService):
 
     @staticmethod
-    def get_carbon_intensity(zone: str, temporalGranularity: str = 'hourly'):
+    async def get_carbon_intensity(zone: str, temporalGranularity: str = 'hourly'):
         url = f"{ElectricityMapsService.base_url}/carbon-intensity/latest?zone={zone}&temporalGranularity={temporalGranularity}"
-        return ElectricityMapsService._perform_request(url)
+        return await ElectricityMapsService._perform_request(url)
 
     @staticmethod
-    def get_power_breakdown(zone: str, temporalGranularity: str = 'hourly'):
+    async def get_cached_carbon_intensity(zone: str, temporalGranularity: str = 'hourly') -> dict | None:
+        """Get the cached carbon intensity of a zone, None if it is not cached."""
+        return await CarbonIntensityProvider.get_cache_scheduler(temporalGranularity).get_zone(zone)
+
+    @staticmethod
+    async def get_power_breakdown(zone: str, temporalGranularity: str = 'hourly'):
         url = f"{ElectricityMapsService.base_url}/power-breakdown/latest?zone={zone}&temporalGranularity={temporalGranularity}"
-        return ElectricityMapsService._perform_request(url)
+        return await ElectricityMapsService._perform_request(url)
 
     @staticmethod
     def get_cache_scheduler(temporalGranularity: str = 'hourly') -> CacheService:
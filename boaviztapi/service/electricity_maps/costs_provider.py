@@ -1,13 +1,9 @@
 import logging
-import os
 from datetime import datetime, timezone, timedelta
 
-import pandas as pd
 import requests
 import xmltodict
-import re
 
-from boaviztapi import data_dir
 from boaviztapi.application_context import get_app_context
 from boaviztapi.dto.electricity.electricity import Country
 from boaviztapi.service.cache.cache import CacheService
@@ -15,12 +11,12 @@ from boaviztapi.service.cloud_pricing_provider import get_localisations_for_inst
 from boaviztapi.service.electricitymaps_service import ElectricityMapsService
 from boaviztapi.service.exceptions import APIError, APIAuthenticationError, APIMissingValueError, \
     APIResponseParsingError
+from boaviztapi.service.reference_data import electricity_zones
 from boaviztapi.service.utils import temporal_granularity_to_ttl
 
 _logger = logging.getLogger(__name__)
 
-df = pd.read_csv(os.path.join(data_dir, 'electricity/electricity_zones.csv'))
-df.fillna(value='', inplace=True)
+df = electricity_zones.get().fillna(value='')
 
 class ElectricityCostsProvider(ElectricityMapsService):
     """
@@ -59,22 +55,26 @@ class ElectricityCostsProvider(ElectricityMapsService):
         """
         if temporalGranularity.lower() == 'hourly':
             url = f"{ElectricityMapsService.base_url}/price-day-ahead/latest?zone={zone}&temporalGranularity={temporalGranularity}"
-            cached_results = await ElectricityCostsProvider.get_cache_scheduler(temporalGranularity).get_results()
-            if cached_results and url in cached_results:
-                return cached_results[url]
-            return ElectricityMapsService._perform_request(url)
         elif temporalGranularity.lower() == 'yearly':
             datetime_parameter = (datetime.now() - timedelta(seconds=temporal_granularity_to_ttl(temporalGranularity))).strftime("%Y-%m-%dT%H:%M:00Z")
             url = f"{ElectricityMapsService.base_url}/price-day-ahead/past?zone={zone}&datetime={datetime_parameter}&temporalGranularity={temporalGranularity}"
-            cached_results = await ElectricityCostsProvider.get_cache_scheduler(temporalGranularity).get_results()
-            if cached_results:
-                pattern = re.compile(rf"zone={re.escape(zone)}&")
-                for key in cached_results.keys():
-                    if pattern.search(key):
-                        return cached_results[key]
-            return ElectricityMapsService._perform_request(url)
         else:
             raise APIError("Please use the /prices endpoint for other temporal granularity parameters than 'hourly' or 'yearly'.")
+        cached_result = await ElectricityCostsProvider.get_price(zone, temporalGranularity)
+        if cached_result is not None:
+            return cached_result
+        return await ElectricityMapsService._perform_request(url)
+
+    @staticmethod
+    async def get_price(zone: str, temporalGranularity: str = 'hourly') -> dict | None:
+        """
+        Get the cached electricity price of a zone, None if it is not cached.
+
+        Args:
+            zone: Zone code as defined in the ElectricityMaps API
+            temporalGranularity: The temporal granularity of the price data. Defaults to hourly.
+        """
+        return await ElectricityCostsProvider.get_cache_scheduler(temporalGranularity).get_zone(zone)
 
 
     @staticmethod
@@ -1,13 +1,60 @@
 import logging
 
-import requests
+import httpx
 
+from boaviztapi import config
 from boaviztapi.application_context import get_app_context
 from boaviztapi.service.base import BaseService
+from boaviztapi.service.cache.http_fetcher import HttpFetcher
 from boaviztapi.service.exceptions import APIAuthenticationError, APIError, APIMissingValueError
+from boaviztapi.service.single_flight import SingleFlight
+from boaviztapi.utils.lru_cache import LRUCache
 
 _log = logging.getLogger(__name__)
 
+
+class ElectricityMapsClient:
+    """
+    Async requests to the Electricity Maps API, on the connection pool of `fetcher`. Concurrent requests for the same
+    url make a single upstream call, and the urls answered with a 404 are remembered `not_found_ttl` seconds : the
+    zone is reported missing again without asking. The results are shared and must not be modified by the callers.
+    """
+
+    def __init__(self, fetcher: HttpFetcher, retries: int = 1, not_found_ttl: float = 60, not_found_maxsize: int = 4096):
+        self.fetcher = fetcher
+        self.retries = retries
+        self.single_flight = SingleFlight()
+        self.not_found = LRUCache(maxsize=not_found_maxsize, ttl=not_found_ttl)
+
+    async def get(self, url: str, headers: dict) -> dict:
+        if self.not_found.get(url):
+            raise APIMissingValueError(msg="No data was found for the requested zone.", logger=_log)
+        return await self.single_flight.run(url, lambda: self._get(url, headers))
+
+    async def _get(self, url: str, headers: dict) -> dict:
+        try:
+            r = await self.fetcher.fetch(url, headers=headers, retries=self.retries)
+        except httpx.TransportError as e:
+            raise APIError(msg="Could not reach the ElectricityMaps API.", logger=_log) from e
+        if r.status_code == 401:
+            raise APIAuthenticationError(msg="Invalid ElectricityMaps API key.", logger=_log)
+        if r.status_code == 404:
+            self.not_found.put(url, True)
+            raise APIMissingValueError(msg="No data was found for the requested zone.", logger=_log)
+        elif r.status_code != 200:
+            raise APIError(msg="Unexpected response from ElectricityMaps API.", status_code=r.status_code, logger=_log)
+        return r.json()
+
+
+# Not the fetcher of the cache refreshes : sharing its slots and rate limit, a lookup would wait behind hundreds of
+# refresh requests
+electricity_maps_fetcher = HttpFetcher(concurrency=config["electricity_maps_concurrency"],
+                                       timeout=config["electricity_maps_timeout"])
+electricity_maps_client = ElectricityMapsClient(electricity_maps_fetcher,
+                                                retries=config["electricity_maps_retries"],
+                                                not_found_ttl=config["electricity_maps_not_found_ttl"])
+
+
 class ElectricityMapsService(BaseService):
 
     base_url = "https://api.electricitymaps.com/v3"
@@ -21,13 +68,6 @@ class ElectricityMapsService(BaseService):
         return api_token
 
     @staticmethod
-    def _perform_request(url: str):
+    async def _perform_request(url: str):
         api_token = ElectricityMapsService._get_api_key()
-        r = requests.get(url, headers={"auth-token": api_token})
-        if r.status_code == 401:
-            raise APIAuthenticationError(msg="Invalid ElectricityMaps API key.", logger=_log)
-        if r.status_code == 404:
-            raise APIMissingValueError(msg="No data was found for the requested zone.", logger=_log)
-        elif r.status_code != 200:
-            raise APIError(msg="Unexpected response from ElectricityMaps API.", status_code=r.status_code, logger=_log)
-        return r.json()
\ No newline at end of file
+        return await electricity_maps_client.get(url, headers={"auth-token": api_token})
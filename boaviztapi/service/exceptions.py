@@ -44,3 +44,10 @@ class APIMissingValueError(APIError):
         self.msg = msg
         self.status_code = 422
         super().__init__(detail=self.detail, msg=self.msg, status_code=self.status_code)
+
+class ServiceOverloadedError(HTTPException):
+    """Raised when too many impact computations are already running or waiting"""
+    def __init__(self, retry_after: int = 1):
+        super().__init__(status_code=503,
+                         detail="Too many impact computations are in progress, please retry later.",
+                         headers={"Retry-After": str(retry_after)})
@@ -1,11 +1,57 @@
 import os
-from pathlib import Path
-
-import yaml
-from boaviztapi import data_dir
-
-config_file = os.path.join(data_dir, 'factors.yml')
-impact_factors = yaml.load(Path(config_file).read_text(), Loader=yaml.CSafeLoader)
+from typing import Dict, List, Tuple
+
+import numpy as np
+from boaviztapi import factors
+
+# factors.yml is loaded once, with the package
+impact_factors = factors
+
+# Sections of factors.yml which are not (item, criteria, field) impact factors
+_NOT_ITEM_FACTORS = ("electricity", "IoT")
+
+
+def _factor_fields(factor: dict, prefix: str = "") -> Dict[str, float]:
+    fields = {}
+    for key, value in factor.items():
+        if isinstance(value, dict):
+            fields.update(_factor_fields(value, prefix=f"{prefix}{key}."))
+        elif key != "source":
+            # A null factor has always been read as 0 by Impact
+            fields[f"{prefix}{key}"] = 0.0 if value is None else float(value)
+    return fields
+
+
+def _compile_impact_factors(factors: dict) -> Tuple[Dict[str, int], Dict[str, int], Dict[str, int], np.ndarray]:
+    """
+    Compile the impact factors of factors.yml into a read-only (item, criteria, field) array.
+    Nested fields are flattened with dots (e.g. `rack.impact`). Missing factors are NaN.
+    """
+    items, criteria, fields = {}, {}, {}
+    flattened = {}
+    for item, item_factors in factors.items():
+        if item in _NOT_ITEM_FACTORS or not item_factors:
+            continue
+        for impact_type, factor in item_factors.items():
+            if not factor:
+                continue
+            flattened[(item, impact_type)] = _factor_fields(factor)
+            items.setdefault(item, len(items))
+            criteria.setdefault(impact_type, len(criteria))
+            for field in flattened[(item, impact_type)]:
+                fields.setdefault(field, len(fields))
+
+    tensor = np.full((len(items), len(criteria), len(fields)), np.nan)
+    for (item, impact_type), item_fields in flattened.items():
+        for field, value in item_fields.items():
+            tensor[items[item], criteria[impact_type], fields[field]] = value
+    tensor.setflags(write=False)
+    return items, criteria, fields, tensor
+
+
+impact_factor_items, impact_factor_criteria, impact_factor_fields, impact_factor_tensor = \
+    _compile_impact_factors(impact_factors)
+_defined_impact_factors = ~np.isnan(impact_factor_tensor).all(axis=2)
 
 
 def get_impact_factor(item, impact_type) -> dict:
@@ -15,6 +61,39 @@ def get_impact_factor(item, impact_type) -> dict:
     raise NotImplementedError
 
 
+def get_impact_factor_value(item: str, impact_type: str, field: str = "impact") -> float:
+    """
+    Return the `field` factor (e.g. `impact`, `die_impact` or `rack.impact`) of `item` for `impact_type`.
+    Raises NotImplementedError when the item has no factor for this criteria, as `get_impact_factor`.
+    """
+    i = impact_factor_items.get(item)
+    c = impact_factor_criteria.get(impact_type)
+    if i is None or c is None or not _defined_impact_factors[i, c]:
+        raise NotImplementedError
+    value = impact_factor_tensor[i, c, impact_factor_fields[field]]
+    if np.isnan(value):
+        raise KeyError(field)
+    return float(value)
+
+
+def get_impact_factor_vector(item: str, impact_types: List[str], field: str = "impact") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the `field` factors of `item` for each of `impact_types`, with the mask of the criteria having a factor.
+    Missing factors are set to 0.
+    """
+    values = np.full(len(impact_types), np.nan)
+    i = impact_factor_items.get(item)
+    f = impact_factor_fields.get(field)
+    if i is None or f is None:
+        return np.zeros(len(impact_types)), np.zeros(len(impact_types), dtype=bool)
+    criteria = np.array([impact_factor_criteria.get(impact_type, -1) for impact_type in impact_types], dtype=int)
+    known = criteria >= 0
+    values[known] = impact_factor_tensor[i, criteria[known], f]
+    available = ~np.isnan(values)
+    values[~available] = 0
+    return values, available
+
+
 def get_electrical_impact_factor(usage_location, impact_type) -> dict:
     if impact_factors["electricity"].get(usage_location):
         if impact_factors["electricity"].get(usage_location).get(impact_type):
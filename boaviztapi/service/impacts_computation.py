@@ -11,7 +11,9 @@ from boaviztapi.model.component.functional_block import ComponentFunctionalBlock
 from boaviztapi.model.device import Device
 from boaviztapi.model.device.iot import DeviceIoT
 from boaviztapi.model.impact import ImpactFactor, IMPACT_PHASES, IMPACT_CRITERIAS, Impact, USE
-from boaviztapi.service.factor_provider import get_impact_factor, get_iot_impact_factor
+from boaviztapi.service.factor_provider import get_impact_factor_value, get_iot_impact_factor
+from boaviztapi.service.projection import Fields
+from boaviztapi.service.server_timing import timed_stage
 
 
 def compute_single_impact(model: Union[Component, Device, Service],
@@ -39,8 +41,9 @@ def compute_single_impact(model: Union[Component, Device, Service],
         return None
 
 
+@timed_stage("impacts")
 def compute_impacts(model: Union[Component, Device, Service], selected_criteria=config["default_criteria"],
-                    duration=config["default_duration"]) -> dict:
+                    duration=config["default_duration"], fields: Fields = None) -> dict:
     for c in IMPACT_CRITERIAS.keys():
         criteria = IMPACT_CRITERIAS[c]
         if "all" not in selected_criteria:
@@ -49,7 +52,7 @@ def compute_impacts(model: Union[Component, Device, Service], selected_criteria=
         for phase in IMPACT_PHASES:
             compute_single_impact(model, phase, criteria.name, duration)
 
-    return model.get_impacts(selected_criteria)
+    return model.get_impacts(selected_criteria, fields)
 
 
 def get_impact_function(model: Union[Component, Device, Service], phase: str):
@@ -75,15 +78,14 @@ def simple_impact_use(impact_type: str, duration: int, model: Union[Component, D
 
 def simple_embedded(impact_type: str, duration: int, model: [Device, Component, Service]) -> ComputedImpacts:
     if hasattr(model, 'type') and model.type is not None:
-        impact = Impact(
-            value=float(get_impact_factor(item=model.NAME, impact_type=impact_type)[model.type.value]["impact"]) * model.units.value,
-            min=float(get_impact_factor(item=model.NAME, impact_type=impact_type)[model.type.value]["impact"]) * model.units.min,
-            max=float(get_impact_factor(item=model.NAME, impact_type=impact_type)[model.type.value]["impact"]) * model.units.max)
+        impact_factor = get_impact_factor_value(item=model.NAME, impact_type=impact_type, field=f"{model.type.value}.impact")
     else:
-        impact = Impact(
-            value=float(get_impact_factor(item=model.NAME, impact_type=impact_type)["impact"]) * model.units.value,
-            min=float(get_impact_factor(item=model.NAME, impact_type=impact_type)["impact"]) * model.units.min,
-            max=float(get_impact_factor(item=model.NAME, impact_type=impact_type)["impact"]) * model.units.max)
+        impact_factor = get_impact_factor_value(item=model.NAME, impact_type=impact_type)
+
+    impact = Impact(
+        value=impact_factor * model.units.value,
+        min=impact_factor * model.units.min,
+        max=impact_factor * model.units.max)
 
     impact.allocate(duration, model.usage.hours_life_time)
 
@@ -116,16 +118,8 @@ def cpu_impact_use(impact_type: str, duration: int, cpu: ComponentCPU) -> Comput
 
 
 def cpu_impact_embedded(impact_type: str, duration: int, cpu: ComponentCPU) -> ComputedImpacts:
-    cpu_die_impact = Impact(
-        value=get_impact_factor(item='cpu', impact_type=impact_type)['die_impact'],
-        min=get_impact_factor(item='cpu', impact_type=impact_type)['die_impact'],
-        max=get_impact_factor(item='cpu', impact_type=impact_type)['die_impact']
-    )
-    cpu_impact = Impact(
-        value=get_impact_factor(item='cpu', impact_type=impact_type)['impact'],
-        min=get_impact_factor(item='cpu', impact_type=impact_type)['impact'],
-        max=get_impact_factor(item='cpu', impact_type=impact_type)['impact']
-    )
+    cpu_die_impact = ImpactFactor.constant(get_impact_factor_value(item='cpu', impact_type=impact_type, field='die_impact'))
+    cpu_impact = ImpactFactor.constant(get_impact_factor_value(item='cpu', impact_type=impact_type, field='impact'))
 
     impact = Impact(
         value=(cpu.die_size.value * cpu_die_impact.value + cpu_impact.value) * cpu.units.value,
@@ -138,10 +132,11 @@ def cpu_impact_embedded(impact_type: str, duration: int, cpu: ComponentCPU) -> C
 
 
 def assembly_impact_embedded(impact_type: str, duration: int, model: ComponentAssembly) -> ComputedImpacts:
+    impact_factor = get_impact_factor_value(item='assembly', impact_type=impact_type)
     impact = Impact(
-        value=get_impact_factor(item='assembly', impact_type=impact_type)['impact'] * model.units.value,
-        min=get_impact_factor(item='assembly', impact_type=impact_type)['impact'] * model.units.min,
-        max=get_impact_factor(item='assembly', impact_type=impact_type)['impact'] * model.units.max
+        value=impact_factor * model.units.value,
+        min=impact_factor * model.units.min,
+        max=impact_factor * model.units.max
     )
 
     impact.allocate(duration, model.usage.hours_life_time)
@@ -169,11 +164,7 @@ def casing_impact_embedded(impact_type: str, duration: int, case: ComponentCase)
 
 
 def impact_manufacture_rack(impact_type: str, case: ComponentCase) -> ComputedImpacts:
-    impact_factor = Impact(
-        value=get_impact_factor(item='case', impact_type=impact_type)['rack']['impact'],
-        min=get_impact_factor(item='case', impact_type=impact_type)['rack']['impact'],
-        max=get_impact_factor(item='case', impact_type=impact_type)['rack']['impact']
-    )
+    impact_factor = ImpactFactor.constant(get_impact_factor_value(item='case', impact_type=impact_type, field='rack.impact'))
 
     if case.case_type.is_archetype() and case.case_type.value == 'rack':
         blade_impact = impact_manufacture_blade(impact_type, case)
@@ -201,17 +192,11 @@ def impact_manufacture_blade(impact_type: str, case: ComponentCase) -> ComputedI
     return impact.value * case.units.value, impact.min * case.units.min, impact.max * case.units.max, ["End of life is not included in the calculation"]
 
 
-def get_impact_constants_blade(impact_type: str) -> Tuple[Impact, Impact]:
-    impact_blade_server = Impact(
-        value=get_impact_factor(item='case', impact_type=impact_type)['blade']['impact_blade_server'],
-        min=get_impact_factor(item='case', impact_type=impact_type)['blade']['impact_blade_server'],
-        max=get_impact_factor(item='case', impact_type=impact_type)['blade']['impact_blade_server'],
-    )
-    impact_blade_16_slots = Impact(
-        value=get_impact_factor(item='case', impact_type=impact_type)['blade']['impact_blade_16_slots'],
-        min=get_impact_factor(item='case', impact_type=impact_type)['blade']['impact_blade_16_slots'],
-        max=get_impact_factor(item='case', impact_type=impact_type)['blade']['impact_blade_16_slots'],
-    )
+def get_impact_constants_blade(impact_type: str) -> Tuple[ImpactFactor, ImpactFactor]:
+    impact_blade_server = ImpactFactor.constant(
+        get_impact_factor_value(item='case', impact_type=impact_type, field='blade.impact_blade_server'))
+    impact_blade_16_slots = ImpactFactor.constant(
+        get_impact_factor_value(item='case', impact_type=impact_type, field='blade.impact_blade_16_slots'))
 
     return impact_blade_server, impact_blade_16_slots
 
@@ -239,10 +224,11 @@ def iot_functional_blocks_impact_embedded(impact_type: str, duration: int,
 
 
 def hdd_impact_embedded(impact_type: str, duration: int, hdd: ComponentHDD) -> ComputedImpacts:
+    impact_factor = get_impact_factor_value(item='hdd', impact_type=impact_type)
     impact = Impact(
-        value=get_impact_factor(item='hdd', impact_type=impact_type)['impact'] * hdd.units.value,
-        min=get_impact_factor(item='hdd', impact_type=impact_type)['impact'] * hdd.units.min,
-        max=get_impact_factor(item='hdd', impact_type=impact_type)['impact'] * hdd.units.max
+        value=impact_factor * hdd.units.value,
+        min=impact_factor * hdd.units.min,
+        max=impact_factor * hdd.units.max
     )
 
     impact.allocate(duration, hdd.usage.hours_life_time)
@@ -251,10 +237,11 @@ def hdd_impact_embedded(impact_type: str, duration: int, hdd: ComponentHDD) -> C
 
 
 def motherboard_impact_embedded(impact_type: str, duration: int, motherboard: ComponentMotherboard) -> ComputedImpacts:
+    impact_factor = get_impact_factor_value(item='motherboard', impact_type=impact_type)
     impact = Impact(
-        value=get_impact_factor(item='motherboard', impact_type=impact_type)['impact'] * motherboard.units.value,
-        min=get_impact_factor(item='motherboard', impact_type=impact_type)['impact'] * motherboard.units.min,
-        max=get_impact_factor(item='motherboard', impact_type=impact_type)['impact'] * motherboard.units.max
+        value=impact_factor * motherboard.units.value,
+        min=impact_factor * motherboard.units.min,
+        max=impact_factor * motherboard.units.max
     )
 
     impact.allocate(duration, motherboard.usage.hours_life_time)
@@ -274,11 +261,7 @@ def power_supply_impact_embedded(impact_type: str, duration: int,
 
 def server_power_supply_impact_embedded(impact_type: str, duration: int,
                                         power_supply: ComponentPowerSupply) -> ComputedImpacts:
-    impact_factor = Impact(
-        value=get_impact_factor(item='power_supply', impact_type=impact_type)['impact'],
-        min=get_impact_factor(item='power_supply', impact_type=impact_type)['impact'],
-        max=get_impact_factor(item='power_supply', impact_type=impact_type)['impact']
-    )
+    impact_factor = ImpactFactor.constant(get_impact_factor_value(item='power_supply', impact_type=impact_type))
 
     impact = Impact(
         value=power_supply.unit_weight.value * impact_factor.value * power_supply.units.value,
@@ -292,17 +275,9 @@ def server_power_supply_impact_embedded(impact_type: str, duration: int,
 
 
 def ram_impact_embedded(impact_type: str, duration: int, ram: ComponentRAM) -> ComputedImpacts:
-    ram_die_impact = Impact(
-        value=get_impact_factor(item='ram', impact_type=impact_type)['die_impact'],
-        min=get_impact_factor(item='ram', impact_type=impact_type)['die_impact'],
-        max=get_impact_factor(item='ram', impact_type=impact_type)['die_impact']
-    )
+    ram_die_impact = ImpactFactor.constant(get_impact_factor_value(item='ram', impact_type=impact_type, field='die_impact'))
 
-    ram_impact = Impact(
-        value=get_impact_factor(item='ram', impact_type=impact_type)['impact'],
-        min=get_impact_factor(item='ram', impact_type=impact_type)['impact'],
-        max=get_impact_factor(item='ram', impact_type=impact_type)['impact']
-    )
+    ram_impact = ImpactFactor.constant(get_impact_factor_value(item='ram', impact_type=impact_type, field='impact'))
 
     impact = Impact(
         value=((ram.capacity.value / ram.density.value) * ram_die_impact.value + ram_impact.value) * ram.units.value,
@@ -339,16 +314,8 @@ def ram_impact_use(impact_type: str, duration: int, ram: ComponentRAM) -> Comput
 
 
 def ssd_impact_embedded(impact_type: str, duration: int, ssd: ComponentSSD) -> ComputedImpacts:
-    ssd_die_impact = Impact(
-        value=get_impact_factor(item='ssd', impact_type=impact_type)['die_impact'],
-        min=get_impact_factor(item='ssd', impact_type=impact_type)['die_impact'],
-        max=get_impact_factor(item='ssd', impact_type=impact_type)['die_impact']
-    )
-    ssd_impact = Impact(
-        value=get_impact_factor(item='ssd', impact_type=impact_type)['impact'],
-        min=get_impact_factor(item='ssd', impact_type=impact_type)['impact'],
-        max=get_impact_factor(item='ssd', impact_type=impact_type)['impact']
-    )
+    ssd_die_impact = ImpactFactor.constant(get_impact_factor_value(item='ssd', impact_type=impact_type, field='die_impact'))
+    ssd_impact = ImpactFactor.constant(get_impact_factor_value(item='ssd', impact_type=impact_type, field='impact'))
 
     impact = Impact(
         value=((ssd.capacity.value / ssd.density.value) * ssd_die_impact.value + ssd_impact.value) * ssd.units.value,
@@ -414,9 +381,7 @@ def server_impact_embedded(impact_type: str, duration: int, server: DeviceServer
         return sum(impacts), sum(min_impacts), sum(max_impacts), warnings
 
     except NotImplementedError:
-        impact = Impact(value=get_impact_factor(item='SERVER', impact_type=impact_type)["impact"],
-                        min=get_impact_factor(item='SERVER', impact_type=impact_type)["impact"],
-                        max=get_impact_factor(item='SERVER', impact_type=impact_type)["impact"])
+        impact = Impact.constant(get_impact_factor_value(item='SERVER', impact_type=impact_type))
 
         warnings = ["Generic data used for impact calculation."]
 
@@ -484,9 +449,7 @@ def cloud_impact_embedded(impact_type: str, duration: int, cloud_instance: Servi
         return sum(impacts), sum(min_impacts), sum(max_impacts), warnings
 
     except NotImplementedError:
-        impact = Impact(value=get_impact_factor(item='SERVER', impact_type=impact_type)["impact"],
-                        min=get_impact_factor(item='SERVER', impact_type=impact_type)["impact"],
-                        max=get_impact_factor(item='SERVER', impact_type=impact_type)["impact"])
+        impact = Impact.constant(get_impact_factor_value(item='SERVER', impact_type=impact_type))
 
         warnings = ["Generic data used for impact calculation."]
 
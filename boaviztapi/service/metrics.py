@@ -0,0 +1,127 @@
+"""
+Operational metrics of the API process, exported in the Prometheus text format by `GET /metrics` (see
+`boaviztapi.service.prometheus`) : request latencies and requests in flight, MongoDB command latencies, `curve_fit`
+calls and the hits of the fastapi-cache backend. Collected in process, no external service is needed.
+"""
+import time
+from typing import Dict, Optional, Tuple
+
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from pymongo import monitoring
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from boaviztapi.utils.metric_types import Counter, Histogram
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Fitted CPU consumption profiles (see `CPUConsumptionProfileModel`)
+curve_fit_calls = Counter()
+
+
+class RequestMetrics:
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.latency = Histogram(buckets, label_names=("method", "route", "status"))
+        self.in_flight: Dict[str, int] = {}
+
+
+request_metrics = RequestMetrics()
+
+
+class RequestMetricsMiddleware:
+    """
+    Counts the HTTP requests in flight per method and records the latency of each request, until its response is
+    sent, per method, route and status code. Requests matching no route are only counted in flight : their paths
+    would add a label value each.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_flight = self.metrics.in_flight
+        in_flight[method] = in_flight.get(method, 0) + 1
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight[method] -= 1
+            route = scope.get("route")
+            if route is not None and hasattr(route, "path"):
+                self.metrics.latency.observe((method, route.path, str(status)), time.perf_counter() - start)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Latency of the MongoDB commands, per command name and outcome, registered on the client of the API."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.latency = Histogram(buckets, label_names=("command", "outcome"))
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self.latency.observe((event.command_name, "succeeded"), event.duration_micros / 1e6)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self.latency.observe((event.command_name, "failed"), event.duration_micros / 1e6)
+
+
+mongo_command_metrics = MongoCommandMetrics()
+
+
+class InstrumentedInMemoryBackend(InMemoryBackend):
+    """fastapi-cache in-memory backend counting its hits and misses, and when each entry was stored."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._stored_at: Dict[str, float] = {}
+
+    async def get_with_ttl(self, key: str):
+        ttl, value = await super().get_with_ttl(key)
+        self._count(value)
+        return ttl, value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._count(await super().get(key))
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        await super().set(key, value, expire)
+        self._stored_at[key] = time.time()
+
+    def metrics(self) -> dict:
+        # Entries expired or cleared since are forgotten
+        for key in self._stored_at.keys() - self._store.keys():
+            del self._stored_at[key]
+        oldest = min(self._stored_at.values(), default=None)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._store),
+            "age": time.time() - oldest if oldest is not None else None,
+        }
+
+    def _count(self, value: Optional[bytes]) -> Optional[bytes]:
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+
+fastapi_cache_backend = InstrumentedInMemoryBackend()
@@ -0,0 +1,67 @@
+import re
+from typing import Any, Dict, List, Optional
+
+# Projection of a response, as a tree of the requested keys : None stands for the whole subtree
+Fields = Optional[Dict[str, "Fields"]]
+
+WILDCARD = "*"
+_PATH_SEGMENT = re.compile(r"\[\s*['\"]?([^'\"\]]+)['\"]?\s*\]|([^.\[\]]+)")
+
+
+def parse_fields(fields: Optional[List[str]]) -> Fields:
+    """
+    Parse the `fields` query parameter : paths of the response in dotted (`verbose.CPU-1.die_size`) or
+    JSONPath-like (`$.verbose['CPU-1'].die_size`) form, separated by commas or repeated. `*` matches any key.
+    No paths is no projection : the whole response.
+    """
+    projection = {}
+    for path in (path for value in fields or [] for path in value.split(",")):
+        segments = [quoted or plain for quoted, plain in _PATH_SEGMENT.findall(path.strip().lstrip("$"))]
+        if not segments:
+            continue
+        node = projection
+        for segment in segments[:-1]:
+            if segment in node and node[segment] is None:
+                break
+            node = node.setdefault(segment, {})
+        else:
+            node[segments[-1]] = None
+    return projection or None
+
+
+def wants(fields: Fields, key: str) -> bool:
+    return fields is None or key in fields or WILDCARD in fields
+
+
+def subfields(fields: Fields, key: str) -> Fields:
+    """Projection of the subtree `key`, to be called for the wanted keys only."""
+    if fields is None:
+        return None
+    if key in fields and WILDCARD in fields:
+        return _merge(fields[key], fields[WILDCARD])
+    return fields[key] if key in fields else fields[WILDCARD]
+
+
+def project(content: Any, fields: Fields) -> Any:
+    """
+    Keep only the requested keys of `content`, lists are kept whole. The keys only matched by `*` are dropped
+    when none of their keys are requested (`*.units` does not return every component without units).
+    """
+    if fields is None or not isinstance(content, dict):
+        return content
+    projected = {}
+    for key, value in content.items():
+        if key in fields:
+            projected[key] = project(value, subfields(fields, key))
+        elif WILDCARD in fields:
+            value = project(value, fields[WILDCARD])
+            if value != {}:
+                projected[key] = value
+    return projected
+
+
+def _merge(fields: Fields, other: Fields) -> Fields:
+    if fields is None or other is None:
+        return None
+    return {key: _merge(fields[key], other[key]) if key in fields and key in other else fields.get(key, other.get(key))
+            for key in {**fields, **other}}
@@ -0,0 +1,116 @@
+"""
+Rendering of the metrics of the API process in the Prometheus text exposition format (version 0.0.4), served by
+`GET /metrics`.
+"""
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from boaviztapi.model.component.cpu import cpu_name_cache_info
+from boaviztapi.model.consumption_profile.consumption_profile import fitted_params_cache, tdp_reference_cache
+from boaviztapi.service.cache.cache import CacheService
+from boaviztapi.service.compute_executor import compute_executor
+from boaviztapi.service.metrics import curve_fit_calls, mongo_command_metrics, request_metrics, fastapi_cache_backend
+from boaviztapi.service.result_cache import impact_result_cache
+from boaviztapi.service.server_timing import stage_histogram
+from boaviztapi.service.single_flight import impact_single_flight
+from boaviztapi.utils.metric_types import Histogram
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Exposition:
+    def __init__(self):
+        self._lines: List[str] = []
+
+    def metric(self, name: str, kind: str, description: str, samples: Iterable[Tuple[Labels, Optional[float]]]) -> None:
+        self._lines.append(f"# HELP {name} {description}")
+        self._lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            if value is not None:
+                self._sample(name, labels, value)
+
+    def histogram(self, name: str, description: str, histogram: Histogram) -> None:
+        self._lines.append(f"# HELP {name} {description}")
+        self._lines.append(f"# TYPE {name} histogram")
+        for label_values, sample in histogram.collect().items():
+            labels = tuple(zip(histogram.label_names, label_values))
+            for bound, count in sample.buckets:
+                self._sample(f"{name}_bucket", labels + (("le", _format_value(bound)),), count)
+            self._sample(f"{name}_sum", labels, sample.sum)
+            self._sample(f"{name}_count", labels, sample.count)
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+    def _sample(self, name: str, labels: Labels, value: float) -> None:
+        if labels:
+            label_text = ",".join(f'{key}="{_escape(label_value)}"' for key, label_value in labels)
+            self._lines.append(f"{name}{{{label_text}}} {_format_value(value)}")
+        else:
+            self._lines.append(f"{name} {_format_value(value)}")
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(value)
+
+
+def cache_metrics() -> Dict[str, dict]:
+    """Hits, misses, size and age (in seconds, when known) of the caches of the API, by cache name."""
+    caches = {service.name: service.metrics() for service in CacheService.instances()}
+    caches["impact_results"] = impact_result_cache.info()
+    caches["cpu_name"] = cpu_name_cache_info()
+    caches["consumption_profile"] = fitted_params_cache.info()
+    caches["consumption_profile_tdp"] = tdp_reference_cache.info()
+    caches["fastapi_cache"] = fastapi_cache_backend.metrics()
+    return caches
+
+
+def render_metrics() -> str:
+    exposition = Exposition()
+
+    exposition.histogram("boaviztapi_http_request_duration_seconds",
+                         "Latency of the HTTP requests, until their response is sent.", request_metrics.latency)
+    exposition.metric("boaviztapi_http_requests_in_flight", "gauge", "HTTP requests being served.",
+                      [((("method", method),), count) for method, count in sorted(request_metrics.in_flight.items())])
+    exposition.histogram("boaviztapi_request_stage_duration_seconds",
+                         "Time taken by the stages of the requests (see the Server-Timing header).",
+                         stage_histogram.histogram)
+
+    caches = cache_metrics()
+    for name, kind, key, description in (
+            ("boaviztapi_cache_hits_total", "counter", "hits", "Cache lookups served by the cache."),
+            ("boaviztapi_cache_misses_total", "counter", "misses", "Cache lookups not served by the cache."),
+            ("boaviztapi_cache_size", "gauge", "size", "Entries held by the cache."),
+            ("boaviztapi_cache_age_seconds", "gauge", "age", "Age of the oldest cached entry."),
+            ("boaviztapi_cache_stale", "gauge", "stale", "1 while some cached entries are served past their expiry."),
+    ):
+        exposition.metric(name, kind, description,
+                          [((("cache", cache),), info.get(key)) for cache, info in sorted(caches.items())])
+
+    exposition.metric("boaviztapi_curve_fit_calls_total", "counter", "Fits of CPU consumption profiles.",
+                      [((), curve_fit_calls.value)])
+
+    executor = compute_executor.metrics()
+    exposition.metric("boaviztapi_compute_queue_depth", "gauge", "Impact computations waiting for a thread.",
+                      [((), executor["queue_depth"])])
+    exposition.metric("boaviztapi_compute_running", "gauge", "Impact computations running.",
+                      [((), executor["running"])])
+    exposition.metric("boaviztapi_compute_rejected_total", "counter", "Impact computations rejected when overloaded.",
+                      [((), executor["rejected"])])
+    exposition.metric("boaviztapi_single_flight_coalesced_total", "counter",
+                      "Requests which awaited an identical computation in flight.",
+                      [((), impact_single_flight.metrics()["coalesced"])])
+
+    exposition.histogram("boaviztapi_mongodb_command_duration_seconds", "Latency of the MongoDB commands.",
+                         mongo_command_metrics.latency)
+    return exposition.render()
@@ -0,0 +1,84 @@
+"""
+Reference datasets of the API (CPU specs, manufacturing data, cloud prices, electricity zones...), loaded once per
+process and shared by every module which uses them. Each dataset is a `LazyDataset` of `reference_datasets` : loaded
+when registered, on import, or on its first use with lazy datasets.
+
+The DataFrames are stored with compact dtypes (see `compact_dtypes`) and must not be modified in place by their users.
+"""
+import os
+from typing import Iterable, NamedTuple
+
+import pandas as pd
+
+from boaviztapi import data_dir, data_snapshot, factors
+from boaviztapi.utils.lazy_dataset import reference_datasets
+
+
+def compact_dtypes(df: pd.DataFrame, categories: Iterable[str] = ()) -> pd.DataFrame:
+    """
+    Store the repeated strings of the `categories` columns as categoricals, the integer columns in the narrowest integer
+    dtype holding their values, and drop the levels of a MultiIndex no row uses (its codes are already narrowed by
+    pandas). Float columns are kept in float64 : the impacts and costs computed from float32 values would change.
+    """
+    df = df.astype({column: "category" for column in categories if column in df.columns})
+    for column in df.select_dtypes("integer").columns:
+        df[column] = pd.to_numeric(df[column], downcast="integer")
+    if isinstance(df.index, pd.MultiIndex):
+        df.index = df.index.remove_unused_levels()
+    return df
+
+
+def read_compact_csv(path: str, categories: Iterable[str] = (), **kwargs) -> pd.DataFrame:
+    return compact_dtypes(pd.read_csv(path, **kwargs), categories)
+
+
+class PriceTable(NamedTuple):
+    prices: pd.DataFrame
+    regions: list[str]
+    savings_types: list[str]
+    instance_ids: list[str]
+
+
+def read_price_table(path: str, categories: Iterable[str] = ()) -> PriceTable:
+    prices = compact_dtypes(pd.read_parquet(path, engine='fastparquet'), categories)
+    prices.sort_index(inplace=True)
+    index = prices.index
+    return PriceTable(
+        prices=prices,
+        regions=index.get_level_values('region').unique().tolist(),
+        savings_types=index.get_level_values('saving').unique().tolist() if 'saving' in index.names else [],
+        instance_ids=index.get_level_values('id').unique().tolist(),
+    )
+
+
+def _csv(name: str, path: str, categories: Iterable[str] = (), **kwargs):
+    # Parsed and compacted once, when the snapshot is built
+    return reference_datasets.register(name, lambda: data_snapshot.load(
+        os.path.join(data_dir, path), read_compact_csv, categories=tuple(categories), **kwargs))
+
+
+def _price_table(name: str, path: str, categories: Iterable[str] = ()):
+    return reference_datasets.register(name, lambda: data_snapshot.load(
+        os.path.join(data_dir, path), read_price_table, categories=tuple(categories)))
+
+
+impact_factors = reference_datasets.register("factors", lambda: factors)
+
+cpu_specs = _csv("cpu_specs", 'crowdsourcing/cpu_specs.csv',
+                 categories=("code_name", "generation", "foundry", "manufacturer", "model_range"))
+ssd_manufacture = _csv("ssd_manufacture", 'crowdsourcing/ssd_manufacture.csv', categories=("manufacturer",))
+ram_manufacture = _csv("ram_manufacture", 'crowdsourcing/ram_manufacture.csv', categories=("manufacturer",))
+cpu_profile = _csv("cpu_profile", 'consumption_profile/cpu/cpu_profile.csv')
+
+cloud_providers = _csv("cloud_providers", 'archetypes/cloud/providers.csv')
+cloud_regions = _csv("cloud_regions", 'electricity/cloud_region_to_electricity_maps.csv',
+                     categories=("provider", "zone_code"), header=0)
+aws_prices = _price_table("aws_prices", 'utils/aws_pricing/aws.parquet')
+azure_prices = _price_table("azure_prices", 'utils/azure_pricing/azure.parquet')
+gcp_prices = _price_table("gcp_prices", 'utils/gcp_pricing/gcp.parquet',
+                          categories=("Instance Name", "Instance Memory"))
+
+electricity_prices = _csv("electricity_prices", 'electricity/european_wholesale_electricity_price_data_monthly.csv',
+                          categories=("Country", "ISO3 Code", "Date"))
+electricity_zones = _csv("electricity_zones", 'electricity/electricity_zones.csv')
+currencies = _csv("currencies", 'currency/frankfurter_currencies.csv')
@@ -0,0 +1,40 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from boaviztapi import factors_file
+from boaviztapi.service.archetype import archetype_registry
+from boaviztapi.service.cache.cache import CacheService
+
+# factors.yml is loaded once, when the API starts
+_factors_digest = hashlib.sha256(Path(factors_file).read_bytes()).hexdigest()
+
+
+def get_data_version() -> str:
+    """
+    Fingerprint of the data the impacts and costs are computed from : the impact factors, the archetypes and the
+    results of the caches (electricity prices, currency rates...), which change when the caches are refreshed.
+    """
+    caches = ",".join(f"{cache.name}={cache.version}" for cache in CacheService.instances())
+    return hashlib.sha256(f"{_factors_digest}:{archetype_registry.fingerprint}:{caches}".encode()).hexdigest()[:16]
+
+
+def request_key(endpoint: str, *parts: Any) -> str:
+    """
+    Canonical hash of a request : the endpoint, its normalised inputs (pydantic models, dicts, lists, scalars) and
+    the data version. Equal inputs give the same key whatever the order of their dict keys.
+    """
+    payload = json.dumps([get_data_version(), endpoint, *parts], sort_keys=True, separators=(",", ":"),
+                         default=_json_default)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
@@ -0,0 +1,30 @@
+from typing import Any, Awaitable, Callable
+
+from starlette.responses import Response
+
+from boaviztapi import config
+from boaviztapi.service.single_flight import impact_single_flight
+from boaviztapi.utils.lru_cache import LRUCache
+
+CACHE_STATUS_HEADER = "Cache-Status"
+_CACHE_NAME = "boaviztapi"
+_MISSING = object()
+
+impact_result_cache = LRUCache(maxsize=config["result_cache_size"], ttl=config["result_cache_ttl"])
+
+
+async def cached_result(response: Response, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Return the result cached for `key` (see `request_key`), or compute it, once for identical concurrent requests,
+    and cache it. Failures are not cached. The outcome is reported in a `Cache-Status` header (RFC 9211).
+    The cached result is shared between the responses and must not be modified.
+    """
+    result = impact_result_cache.get(key, _MISSING)
+    if result is not _MISSING:
+        response.headers[CACHE_STATUS_HEADER] = f"{_CACHE_NAME}; hit"
+        return result
+
+    result = await impact_single_flight.run(key, compute)
+    impact_result_cache.put(key, result)
+    response.headers[CACHE_STATUS_HEADER] = f"{_CACHE_NAME}; fwd=miss; stored"
+    return result
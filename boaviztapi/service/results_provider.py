@@ -5,8 +5,10 @@ from boaviztapi.dto.usage.usage import WorkloadTime
 from boaviztapi.model.crud_models.configuration_model import ConfigurationModel, OnPremiseConfigurationModel, \
     CloudConfigurationModel
 from boaviztapi.service.electricity_maps.costs_provider import ElectricityCostsProvider
+from boaviztapi.service.server_timing import timed_stage
 
 
+@timed_stage("mapping")
 def mapper_config_to_server(onprem: ConfigurationModel) -> Server | Cloud:
     boavizta_config = None
     if onprem.type == 'on-premise':
@@ -0,0 +1,190 @@
+"""
+Timings of the stages of a request (archetype lookups, DTO mapping, CPU name matching, consumption profile fitting,
+impact computation, verbose output, costs, currency conversion, JSON rendering). `ServerTimingMiddleware` collects
+the timings of each request, reports them in a `Server-Timing` response header and aggregates them per route in
+`stage_histogram`, queried by `GET /v1/utils/server_timing`.
+
+The stages are marked with `timed` (context manager) or `timed_stage` (decorator). Outside of a timed request, or when
+`server_timing` is disabled in config.yml, a stage only costs the lookup of a context variable. The timings follow the
+request in the computing threads (see `ComputeExecutor`), whose context is copied from the request. A stage entered
+again while it is open (e.g. `verbose_device` called by `verbose_cloud`) is timed once, by its outermost entry.
+Different stages may nest (e.g. the CPU name matching in the mapping), their durations then overlap.
+"""
+import functools
+import inspect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from boaviztapi import config
+from boaviztapi.utils.metric_types import Histogram
+
+SERVER_TIMING_HEADER = "Server-Timing"
+TOTAL_STAGE = "total"
+
+# Upper bounds of the histogram buckets, in seconds
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestTimings:
+    """Total duration and number of entries of each stage of a request, in seconds."""
+
+    def __init__(self):
+        self._stages: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, duration: float) -> None:
+        with self._lock:
+            total, count = self._stages.get(stage, (0.0, 0))
+            self._stages[stage] = (total + duration, count + 1)
+
+    def stages(self) -> Dict[str, Tuple[float, int]]:
+        with self._lock:
+            return dict(self._stages)
+
+    def header(self) -> str:
+        """Value of the `Server-Timing` header, durations in milliseconds."""
+        return ", ".join(f"{stage};dur={total * 1000:.3f}" for stage, (total, _) in self.stages().items())
+
+
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+_open_stages: ContextVar[FrozenSet[str]] = ContextVar("open_stages", default=frozenset())
+
+
+class _Stage:
+    __slots__ = ("stage", "timings", "_token", "_start")
+
+    def __init__(self, stage: str, timings: RequestTimings):
+        self.stage = stage
+        self.timings = timings
+
+    def __enter__(self) -> None:
+        open_stages = _open_stages.get()
+        if self.stage in open_stages:
+            self.timings = None
+            return
+        self._token = _open_stages.set(open_stages | {self.stage})
+        self._start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self.timings is not None:
+            self.timings.add(self.stage, time.perf_counter() - self._start)
+            _open_stages.reset(self._token)
+
+
+class _NotTimed:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+_NOT_TIMED = _NotTimed()
+
+
+def timed(stage: str):
+    """Context manager timing the enclosed block as `stage` of the current request."""
+    timings = _request_timings.get()
+    if timings is None:
+        return _NOT_TIMED
+    return _Stage(stage, timings)
+
+
+def timed_stage(stage: str) -> Callable[[Callable], Callable]:
+    """Decorator timing each call of a function, or coroutine function, as `stage` of the current request."""
+    def decorator(function: Callable) -> Callable:
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                timings = _request_timings.get()
+                if timings is None:
+                    return await function(*args, **kwargs)
+                with _Stage(stage, timings):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            timings = _request_timings.get()
+            if timings is None:
+                return function(*args, **kwargs)
+            with _Stage(stage, timings):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class StageHistogram:
+    """
+    Histograms of the durations of the stages of the requests, per route and stage. Each request adds the total
+    duration of each of its stages.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = STAGE_BUCKETS):
+        self.histogram = Histogram(buckets, label_names=("route", "stage"))
+
+    def observe(self, route: str, timings: RequestTimings) -> None:
+        for stage, (duration, _) in timings.stages().items():
+            self.histogram.observe((route, stage), duration)
+
+    def metrics(self) -> dict:
+        routes = {}
+        for (route, stage), sample in self.histogram.collect().items():
+            routes.setdefault(route, {})[stage] = {
+                "count": sample.count,
+                "sum": sample.sum,
+                "mean": sample.sum / sample.count,
+                "max": sample.max,
+                "buckets": {"+Inf" if bound == float("inf") else str(bound): count for bound, count in sample.buckets},
+            }
+        return routes
+
+    def clear(self) -> None:
+        self.histogram.clear()
+
+
+stage_histogram = StageHistogram()
+
+
+class ServerTimingMiddleware:
+    """
+    Times the stages of each HTTP request, adds them and the `total` time until the response starts in a
+    `Server-Timing` header, and aggregates them in `histogram` under the route of the request (requests matching no
+    route are not aggregated). The response body is rendered before it starts : the rendering is reported.
+    """
+
+    def __init__(self, app: ASGIApp, histogram: StageHistogram = stage_histogram,
+                 enabled: bool = config["server_timing"]):
+        self.app = app
+        self.histogram = histogram
+        self.enabled = enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+
+        async def send_with_timings(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                timings.add(TOTAL_STAGE, time.perf_counter() - start)
+                MutableHeaders(scope=message).append(SERVER_TIMING_HEADER, timings.header())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            _request_timings.reset(token)
+            route = scope.get("route")
+            if route is not None and hasattr(route, "path"):
+                self.histogram.observe(f"{scope['method']} {route.path}", timings)
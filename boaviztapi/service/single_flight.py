@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+_log = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent computations : while a computation for a key is in flight, further calls with the
+    same key await its result instead of starting their own. The computation runs in its own task, a caller which
+    goes away (e.g. client disconnection) does not cancel it for the others. The result is shared between the
+    callers and must not be modified by them.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._started = 0
+        self._coalesced = 0
+
+    async def run(self, key: str, function: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            self._started += 1
+            task = asyncio.ensure_future(function())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+        else:
+            self._coalesced += 1
+        return await asyncio.shield(task)
+
+    def metrics(self) -> dict:
+        return {"in_flight": len(self._in_flight), "started": self._started, "coalesced": self._coalesced}
+
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Retrieved here in case every caller went away, it is raised to the callers still awaiting it
+        if not task.cancelled() and task.exception() is not None:
+            _log.debug("Coalesced computation failed", exc_info=task.exception())
+
+
+impact_single_flight = SingleFlight()
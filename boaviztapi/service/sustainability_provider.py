@@ -6,9 +6,11 @@ from boaviztapi import config
 from boaviztapi.dto.device.device import mapper_cloud_instance, mapper_server
 from boaviztapi.model.crud_models.configuration_model import CloudConfigurationModel, OnPremiseConfigurationModel, \
     ConfigurationModelWithResults
-from boaviztapi.routers.cloud_router import cloud_instance_impact
+from boaviztapi.routers.cloud_router import compute_cloud_instance_impact
 from boaviztapi.routers.server_router import server_impact
 from boaviztapi.service.archetype import get_cloud_instance_archetype, get_server_archetype
+from boaviztapi.service.compute_executor import compute_executor
+from boaviztapi.service.projection import Fields
 from boaviztapi.service.results_provider import mapper_config_to_server
 
 _log = logging.getLogger(__name__)
@@ -17,18 +19,28 @@ async def get_cloud_impact(
         cloud_instance: CloudConfigurationModel,
         verbose: bool = True,
         duration: Optional[float] = config["default_duration"],
-        criteria: List[str] = config["default_criteria"]):
+        criteria: List[str] = config["default_criteria"],
+        fields: Fields = None):
+    return await compute_executor.run(_compute_cloud_impact, cloud_instance, verbose, duration, criteria, fields)
+
+
+def _compute_cloud_impact(cloud_instance: CloudConfigurationModel,
+                          verbose: bool,
+                          duration: Optional[float],
+                          criteria: List[str],
+                          fields: Fields = None):
     cloud_provider = cloud_instance.cloud_provider.lower()  # Solves the path not being found issue.
     cloud_archetype = get_cloud_instance_archetype(cloud_instance.instance_type, cloud_provider)
     if not cloud_archetype:
         raise ValueError(f"{cloud_instance.instance_type} at {cloud_instance.cloud_provider} not found")
     cloud_model = mapper_config_to_server(cloud_instance)
     instance_model = mapper_cloud_instance(cloud_model, archetype=cloud_archetype)
-    return await cloud_instance_impact(
+    return compute_cloud_instance_impact(
         cloud_instance=instance_model,
         verbose=verbose,
         duration=duration,
         criteria=criteria,
+        fields=fields,
     )
 
 
@@ -36,7 +48,8 @@ async def get_server_impact_on_premise(
         server: OnPremiseConfigurationModel,
         verbose: bool = True,
         duration: Optional[float] = config["default_duration"],
-        criteria: List[str] = config["default_criteria"]
+        criteria: List[str] = config["default_criteria"],
+        fields: Fields = None
 ):
     archetype_config = get_server_archetype(config["default_server"])
     configured_server = mapper_config_to_server(server)
@@ -45,7 +58,8 @@ async def get_server_impact_on_premise(
         device=completed_server,
         verbose=verbose,
         duration=duration,
-        criteria=criteria)
+        criteria=criteria,
+        fields=fields)
 
 
 async def add_results_to_configuration(c: ConfigurationModelWithResults):
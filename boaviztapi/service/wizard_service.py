@@ -4,10 +4,9 @@ import os
 import numpy as np
 import pandas as pd
 import logging
-import json
 from datetime import datetime
 
-from boaviztapi import config
+from boaviztapi import config, data_snapshot
 from boaviztapi.model.crud_models.configuration_model import CloudConfigurationModel, OnPremiseConfigurationModel, \
     CloudServerUsage
 from boaviztapi.service.archetype import get_cloud_instance_archetype
@@ -34,7 +33,7 @@ except ValueError:
 # Dataframe of all the cloud configurations in the archetype folder
 df_list = []
 for filename in all_files:
-    df = pd.read_csv(filename)
+    df = data_snapshot.read_csv(filename)
 
     file_label = os.path.splitext(os.path.basename(filename))[0]
     # Add the provider name (from filename) as a column
@@ -49,7 +48,7 @@ for filename in all_files:
 all_cloud_configs: pd.DataFrame = pd.concat(df_list, join="outer", axis=0, ignore_index=True, sort=False)
 
 # Dataframe with pricing availability
-pricing_availability = pd.read_csv(os.path.join(data_dir, 'electricity/electricitymaps_zones.csv'),
+pricing_availability = data_snapshot.read_csv(os.path.join(data_dir, 'electricity/electricitymaps_zones.csv'),
                                    header=0)
 
 def _get_pricing_type(provider: str, instance_type: str):
@@ -320,14 +319,11 @@ async def strategy_greener_region(input_config: CloudConfigurationModel) -> Clou
             continue
     locations = np.unique(locations)
     intensities = {}
-    carbon_intensity_cache = await CarbonIntensityProvider.get_cache_scheduler('monthly').get_results()
-    carbon_intensity_cache = {key: (json.loads(value) if isinstance(value, str) else value) 
-                                  for key, value in carbon_intensity_cache.items()}
     for location in locations:
         try:
-            for carbon_intensity in carbon_intensity_cache.values():
-                if carbon_intensity['zone'] == location:
-                    intensities[location] = carbon_intensity['carbonIntensity']
+            carbon_intensity = await CarbonIntensityProvider.get_cached_carbon_intensity(location, 'monthly')
+            if carbon_intensity is not None:
+                intensities[location] = float(carbon_intensity['carbonIntensity'])
         except Exception as e:
             log.warning(f"Error while computing carbon intensity for {location}: {e}")
             continue
@@ -11,6 +11,7 @@ from boaviztapi.service.cloud_pricing_provider import GcpPriceProvider, AWSPrice
 from boaviztapi.service.costs_computation import get_electricity_price
 from boaviztapi.service.currency_converter import CurrencyConverter
 from boaviztapi.service.exceptions import APIError
+from boaviztapi.service.server_timing import timed_stage
 from boaviztapi.service.sustainability_provider import get_server_impact_on_premise, get_cloud_impact
 
 log = logging.getLogger(__name__)
@@ -244,6 +245,7 @@ class CostCalculator:
 
         return CurrencyConvertedCostBreakdown(local=local_costs, eur=eur_costs, usd=usd_costs)
 
+    @timed_stage("costs")
     async def configuration_costs(self, server: ConfigurationModelWithResults) -> CurrencyConvertedCostBreakdown:
         if server.type == "on-premise":
             return await self.on_premise_costs(server)
@@ -0,0 +1,138 @@
+"""
+Reference data (factors.yml, the CSV and parquet files, the archetypes) parsed once, when the snapshot is built, and
+saved in a single versioned binary file. The API loads each file from the snapshot when the content hash of the file
+matches the one of the snapshot, and parses the file otherwise.
+
+Build the snapshot of the data directory of the API (run it again after changing the data files, outdated entries
+are ignored) :
+
+    python -m boaviztapi.utils.data_snapshot
+"""
+import hashlib
+import importlib
+import logging
+import os
+import pickle
+import sys
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+import yaml
+
+SNAPSHOT_FILE = "reference_data.snapshot"
+# Pickled objects can only be loaded by the versions of Python and pandas they were written with
+SNAPSHOT_VERSION = (1, sys.version_info[:2], pd.__version__)
+
+_log = logging.getLogger(__name__)
+
+SnapshotKey = Tuple[str, str, str]
+
+
+def load_yaml(path: str) -> Any:
+    with open(path, encoding="utf-8") as file:
+        return yaml.load(file, Loader=yaml.CSafeLoader)
+
+
+class DataSnapshot:
+    """
+    Loader of the reference data files of a data directory. `load` parses a file with a module level function
+    (`pd.read_csv`, `pd.read_parquet`, `load_yaml`...) or, when the file has not changed, unpickles the object the
+    snapshot holds for it. Each call returns a new object, callers are free to modify it. The files loaded by the
+    process are recorded, these are the files `build` saves in the snapshot.
+    """
+
+    def __init__(self, root: str, path: Optional[str] = None):
+        self.root = root
+        self.path = path or os.path.join(root, SNAPSHOT_FILE)
+        self._entries: Optional[Dict[SnapshotKey, Tuple[str, bytes]]] = None
+        self._loaded: Dict[SnapshotKey, Tuple[str, Callable, dict]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def read_csv(self, path: str, **kwargs) -> pd.DataFrame:
+        return self.load(path, pd.read_csv, **kwargs)
+
+    def read_parquet(self, path: str, **kwargs) -> pd.DataFrame:
+        return self.load(path, pd.read_parquet, **kwargs)
+
+    def load_yaml(self, path: str) -> Any:
+        return self.load(path, load_yaml)
+
+    def load(self, path: str, parser: Callable, **kwargs) -> Any:
+        key = (f"{parser.__module__}:{parser.__qualname__}", self._relative_path(path), repr(sorted(kwargs.items())))
+        entry = self._snapshot().get(key)
+        with self._lock:
+            self._loaded[key] = (path, parser, kwargs)
+        if entry is not None and entry[0] == _file_digest(path):
+            self._hits += 1
+            return pickle.loads(entry[1])
+        self._misses += 1
+        return parser(path, **kwargs)
+
+    def metrics(self) -> dict:
+        return {
+            "path": self.path,
+            "entries": len(self._snapshot()),
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+    def build(self) -> int:
+        """Save the files loaded so far, freshly parsed, in the snapshot. Return the number of files saved."""
+        with self._lock:
+            loaded = dict(self._loaded)
+        entries = {key: (_file_digest(path), pickle.dumps(parser(path, **kwargs), protocol=pickle.HIGHEST_PROTOCOL))
+                   for key, (path, parser, kwargs) in loaded.items()}
+        # Written aside and moved, processes starting meanwhile read either snapshot
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump({"version": SNAPSHOT_VERSION, "entries": entries}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+        self._entries = entries
+        return len(entries)
+
+    def _snapshot(self) -> Dict[SnapshotKey, Tuple[str, bytes]]:
+        if self._entries is None:
+            with self._lock:
+                if self._entries is None:
+                    self._entries = self._read_snapshot()
+        return self._entries
+
+    def _read_snapshot(self) -> Dict[SnapshotKey, Tuple[str, bytes]]:
+        try:
+            with open(self.path, "rb") as file:
+                snapshot = pickle.load(file)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            _log.warning("Ignoring the reference data snapshot %s : %s", self.path, e)
+            return {}
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            _log.warning("Ignoring the reference data snapshot %s : built for %s, expected %s",
+                         self.path, snapshot.get("version"), SNAPSHOT_VERSION)
+            return {}
+        return snapshot["entries"]
+
+    def _relative_path(self, path: str) -> str:
+        return os.path.relpath(os.path.normpath(path), self.root)
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def main():
+    from boaviztapi import data_snapshot
+    from boaviztapi.utils.lazy_dataset import reference_datasets
+    # Importing the API loads its reference data, but the lazy datasets
+    importlib.import_module("boaviztapi.main")
+    reference_datasets.load_all()
+    count = data_snapshot.build()
+    print(f"{count} reference data files saved in {data_snapshot.path}")
+
+
+if __name__ == "__main__":
+    main()
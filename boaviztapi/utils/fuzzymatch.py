@@ -1,40 +1,83 @@
+import numpy as np
 import pandas as pd
 from pandas.core.series import Series
 from rapidfuzz import process, fuzz
-from typing import Tuple, Union
+from typing import List, Tuple, Union
 
 from boaviztapi import config
+from boaviztapi.service.server_timing import timed_stage
+from boaviztapi.utils.lru_cache import LRUCache
 
+CPUAttributes = Tuple[str, str, str, str, int, int, int, int, str, str]
 
-def fuzzymatch_attr_from_cpu_name(cpu_name: str, df: pd.DataFrame) -> Union[
-    Tuple[str, str, str, str, int, int, int, int, str, str], None]:
-    cpu_name = cpu_name.lower()
-    score = df["name"].str.lower().apply(lambda x: fuzz.token_set_ratio(x, cpu_name))
-    max_score = score.max()
-    if max_score <= config["cpu_name_fuzzymatch_threshold"]:
-        return None
-    else:
-        best = df.iloc[score.idxmax()]
-        best = best.mask(best.isnull(), None)  # replace all NaN by None
-        safe_int = lambda x: x if x is None else int(x)  # float to int but keep None
-
-        return (
-            best["name"],  # .name is reserved by pandas for indexes
-            best.manufacturer,
-            best.code_name,
-            best.model_range,
-            safe_int(best.tdp),
-            safe_int(best.cores),
-            safe_int(best.threads),
-            safe_int(best.total_die_size),
-            best.total_die_size_source,
-            best.source,
-        )
+_CPU_ATTRIBUTES_COLUMNS = ["name", "manufacturer", "code_name", "model_range", "tdp", "cores", "threads",
+                           "total_die_size", "total_die_size_source", "source"]
+_CPU_ATTRIBUTES_INT_COLUMNS = {"tdp", "cores", "threads", "total_die_size"}
+_MISSING = object()
+
+
+class CPUNameMatcher:
+    """
+    CPU specs prepared once for the fuzzy matching of CPU names : the names are lower-cased and the attributes
+    returned for each row are extracted up front. The best match is the first row with the highest
+    `token_set_ratio`, if above the `cpu_name_fuzzymatch_threshold`. Resolved names are kept in an LRU cache.
+    """
+
+    def __init__(self, df: pd.DataFrame, cache_size: int = 1024):
+        # A missing name scores 0, as it did when scored by pandas
+        self._choices = [name.lower() if isinstance(name, str) else "" for name in df["name"]]
+        self._attributes = [_cpu_attributes(row) for row in
+                            df[_CPU_ATTRIBUTES_COLUMNS].astype(object).itertuples(index=False, name=None)]
+        self._cache = LRUCache(maxsize=cache_size)
+
+    @timed_stage("cpu_match")
+    def match(self, cpu_name: str) -> Union[CPUAttributes, None]:
+        cpu_name = cpu_name.lower()
+        attributes = self._cache.get(cpu_name, _MISSING)
+        if attributes is _MISSING:
+            best = process.extractOne(cpu_name, self._choices, scorer=fuzz.token_set_ratio, processor=None)
+            attributes = self._attributes_above_threshold(best[1], best[2]) if best is not None else None
+            self._cache.put(cpu_name, attributes)
+        return attributes
+
+    @timed_stage("cpu_match")
+    def match_many(self, cpu_names: List[str]) -> List[Union[CPUAttributes, None]]:
+        """Match a list of CPU names at once, all pairs of names and choices are scored in one vectorised call."""
+        cpu_names = [cpu_name.lower() for cpu_name in cpu_names]
+        if not cpu_names:
+            return []
+        scores = process.cdist(cpu_names, self._choices, scorer=fuzz.token_set_ratio, processor=None,
+                               dtype=np.float64, workers=-1)
+        best_indexes = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(cpu_names)), best_indexes]
+        return [self._attributes_above_threshold(score, index)
+                for score, index in zip(best_scores.tolist(), best_indexes.tolist())]
+
+    def cache_info(self) -> dict:
+        return self._cache.info()
+
+    def _attributes_above_threshold(self, score: float, index: int) -> Union[CPUAttributes, None]:
+        if score <= config["cpu_name_fuzzymatch_threshold"]:
+            return None
+        return self._attributes[index]
+
+
+def _cpu_attributes(row: tuple) -> CPUAttributes:
+    return tuple(
+        None if pd.isnull(value) else int(value) if column in _CPU_ATTRIBUTES_INT_COLUMNS else value
+        for column, value in zip(_CPU_ATTRIBUTES_COLUMNS, row)
+    )
+
+
+def fuzzymatch_attr_from_cpu_name(cpu_name: str, df: pd.DataFrame) -> Union[CPUAttributes, None]:
+    return CPUNameMatcher(df, cache_size=0).match(cpu_name)
 
 
 def fuzzymatch_attr_from_pdf(name: str, attr: str, pdf: pd.DataFrame) -> str:
-    name_list = list(pdf[attr].unique())
+    return fuzzymatch_attr(name, list(pdf[attr].unique()))
+
 
+def fuzzymatch_attr(name: str, name_list: list) -> str:
     result = process.extractOne(name, name_list, scorer=fuzz.WRatio)
     if result is not None:
         result = result[0] if result[1] > 79.0 else None
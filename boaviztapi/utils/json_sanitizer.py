@@ -0,0 +1,97 @@
+import math
+import re
+from typing import Any, Optional
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # a dependency, but responses are still rendered by the standard library without it
+    orjson = None
+
+# orjson and `float.__repr__` format the floats under 1e-4 and from 1e16 differently (0.00001 / 1e-05,
+# 1e16 / 1e+16), these are the only floats of orjson with an exponent or starting with 0.0000
+_ORJSON_EXPONENT = re.compile(rb"e[-1-9]")
+_NUMBER_BYTES = frozenset(b"0123456789.-e")
+
+
+def sanitize_json_floats(obj: Any) -> Any:
+    """
+    Recursively convert NaN / +/-Inf (including NumPy scalar floats) to None,
+    so responses stay valid JSON and Starlette serialization won't 500.
+    """
+    if obj is None:
+        return None
+
+    # Handle NumPy scalar types (e.g. numpy.float64)
+    if np is not None:
+        try:
+            if isinstance(obj, np.generic):
+                obj = obj.item()
+        except Exception:
+            pass
+
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+
+    if isinstance(obj, dict):
+        return {k: sanitize_json_floats(v) for k, v in obj.items()}
+
+    if isinstance(obj, (list, tuple)):
+        return [sanitize_json_floats(v) for v in obj]
+
+    return obj
+
+
+def dumps_sanitized_json(content: Any) -> Optional[bytes]:
+    """
+    Render `content` with orjson, in a single native pass, exactly as the standard library renders the content
+    sanitized by `sanitize_json_floats` : compact separators, NaN / +/-Inf as null and NumPy scalars and arrays
+    by value (NumPy float32 are written with their float32 shortest representation).
+    Return None when orjson is not installed or cannot render the content byte for byte as the standard library
+    (e.g. non-string keys, integers over 64 bits), the caller then falls back to the standard library.
+    """
+    if orjson is None:
+        return None
+    try:
+        rendered = orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    except TypeError:
+        return None
+
+    return _float_repr_as_standard_library(rendered)
+
+
+def _float_repr_as_standard_library(rendered: bytes) -> Optional[bytes]:
+    """Format the floats of an orjson output as `float.__repr__`, both write the shortest round-tripping digits."""
+    positions = {match.start() for match in _ORJSON_EXPONENT.finditer(rendered)}
+    position = rendered.find(b"0.0000")
+    while position != -1:
+        positions.add(position)
+        position = rendered.find(b"0.0000", position + 1)
+    if not positions:
+        return rendered
+    # Markers inside of strings are told apart by counting the quotes before them, which escaped quotes would
+    # break : these (rare) outputs are left to the standard library
+    if b"\\" in rendered and b'\\"' in rendered:
+        return None
+
+    parts = []
+    written = counted = quotes = 0
+    for position in sorted(positions):
+        if position < written:
+            continue
+        quotes += rendered.count(b'"', counted, position)
+        counted = position
+        if quotes % 2:
+            continue
+        start, stop = position, position
+        while start > 0 and rendered[start - 1] in _NUMBER_BYTES:
+            start -= 1
+        while stop < len(rendered) and rendered[stop] in _NUMBER_BYTES:
+            stop += 1
+        number = rendered[start:stop]
+        if b"e" in number or number.lstrip(b"-").startswith(b"0.0000"):
+            parts += (rendered[written:start], repr(float(number)).encode())
+            written = stop
+    parts.append(rendered[written:])
+    return b"".join(parts)
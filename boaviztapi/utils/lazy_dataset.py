@@ -0,0 +1,126 @@
+"""
+Reference datasets which are only needed by some routes (the cloud prices, the CPU die sizes...) are registered in
+`reference_datasets`. They are loaded when registered, on import, unless the lazy mode is enabled (`lazy_datasets` in
+config.yml, or the LAZY_DATASETS environment variable) : each dataset is then loaded on its first use, so that a
+serverless cold start only pays for the datasets of the invoked route. `GET /v1/utils/readiness` reports which
+datasets are loaded and how long each took, `GET /v1/utils/memory` how much memory each takes.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+
+import pandas as pd
+
+from boaviztapi import config
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+T = TypeVar("T")
+
+_log = logging.getLogger(__name__)
+
+
+class LazyDataset(Generic[T]):
+    """
+    Dataset built by `loader` the first time `get` is called. Concurrent first calls wait for a single load, a
+    failed load is attempted again by the next call.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], T]):
+        self.name = name
+        self._loader = loader
+        self._value: Optional[T] = None
+        self._loaded = False
+        self._load_time: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self) -> T:
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    start = time.perf_counter()
+                    self._value = self._loader()
+                    self._load_time = time.perf_counter() - start
+                    self._loaded = True
+                    _log.info("Loaded the %s dataset in %.3f s", self.name, self._load_time)
+        return self._value
+
+    def status(self) -> dict:
+        return {"loaded": self._loaded, "load_time": self._load_time}
+
+
+class DatasetRegistry:
+    def __init__(self, lazy: bool):
+        self.lazy = lazy
+        self._datasets: Dict[str, LazyDataset] = {}
+
+    def register(self, name: str, loader: Callable[[], T]) -> LazyDataset[T]:
+        dataset = LazyDataset(name, loader)
+        self._datasets[name] = dataset
+        if not self.lazy:
+            dataset.get()
+        return dataset
+
+    def load_all(self) -> None:
+        for dataset in self._datasets.values():
+            dataset.get()
+
+    def readiness(self) -> dict:
+        return {
+            "lazy": self.lazy,
+            "datasets": {name: dataset.status() for name, dataset in self._datasets.items()},
+        }
+
+    def memory_report(self) -> dict:
+        """Memory taken by each loaded dataset, in bytes, and the peak resident memory of the process."""
+        datasets = {name: deep_size(dataset.get()) if dataset.loaded else None
+                    for name, dataset in self._datasets.items()}
+        return {
+            "datasets": datasets,
+            "total": sum(size for size in datasets.values() if size is not None),
+            "max_rss": max_rss(),
+        }
+
+
+def deep_size(value: Any) -> int:
+    """Approximate size in memory of `value` : DataFrames as reported by pandas, containers with their items."""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        size = value.memory_usage(deep=True)
+        return int(size.sum() if isinstance(value, pd.DataFrame) else size)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        return size + sum(deep_size(key) + deep_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(deep_size(item) for item in value)
+    if hasattr(value, "__dict__"):
+        return size + deep_size(vars(value))
+    return size
+
+
+def max_rss() -> Optional[int]:
+    """Peak resident memory of the process in bytes, None where it cannot be measured."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _lazy_mode() -> bool:
+    value = os.getenv("LAZY_DATASETS")
+    if value is None:
+        return bool(config["lazy_datasets"])
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+reference_datasets = DatasetRegistry(lazy=_lazy_mode())
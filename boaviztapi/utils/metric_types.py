@@ -0,0 +1,69 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Tuple
+
+
+class Counter:
+    """Thread-safe, monotonically increasing count."""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+
+class HistogramSample(NamedTuple):
+    buckets: List[Tuple[float, int]]
+    count: int
+    sum: float
+    max: float
+
+
+class Histogram:
+    """
+    Thread-safe histograms of values (e.g. durations in seconds), one per combination of label values. Buckets are
+    cumulative, as in Prometheus : a bucket counts the values lower or equal to its upper bound, the last one (inf)
+    counts all the values.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...], label_names: Tuple[str, ...]):
+        self.buckets = tuple(buckets)
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        # Count per bucket (not cumulative, the last one unbounded), number of values, sum and max
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0, 0.0, 0.0]
+            series[0][index] += 1
+            series[1] += 1
+            series[2] += value
+            series[3] = max(series[3], value)
+
+    def collect(self) -> Dict[Tuple[str, ...], HistogramSample]:
+        with self._lock:
+            series = {labels: (list(counts), count, total, maximum)
+                      for labels, (counts, count, total, maximum) in self._series.items()}
+        samples = {}
+        for labels, (counts, count, total, maximum) in sorted(series.items()):
+            cumulative, buckets = 0, []
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                buckets.append((bound, cumulative))
+            samples[labels] = HistogramSample(buckets, count, total, maximum)
+        return samples
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
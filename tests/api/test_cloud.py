@@ -1,3 +1,4 @@
+import json
 import csv
 import os
 
@@ -1026,4 +1027,36 @@ async def test_all_instances():
     except FileNotFoundError:
         pytest.fail(f"provider file not found : {cloud_path}/providers.csv")
 
-    assert True
\ No newline at end of file
+    assert True
+
+@pytest.mark.asyncio
+async def test_cloud_instance_batch():
+    instances = [{"provider": "aws", "instance_type": "a1.4xlarge", "usage": {}},
+                 {"provider": "aws", "instance_type": "r5ad.12xlarge", "usage": {"usage_location": "FRA"}},
+                 {"provider": "aws", "instance_type": "unknown", "usage": {}}]
+    body = "\n".join(json.dumps(instance) for instance in instances)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        res = await ac.post("/v1/cloud/instance/batch?verbose=true", content=body,
+                            headers={"content-type": "application/x-ndjson"})
+        expected = [(await ac.post("/v1/cloud/instance?verbose=true", json=instance)).json()
+                    for instance in instances[:2]]
+
+    lines = [json.loads(line) for line in res.text.splitlines()]
+    assert lines[:2] == [{"index": index, "result": result} for index, result in enumerate(expected)]
+    assert lines[2] == {"index": 2, "error": {"status_code": 404, "detail": "unknown at aws not found"}}
+
+
+@pytest.mark.asyncio
+async def test_repeated_request_is_served_from_result_cache():
+    transport = ASGITransport(app=app)
+    body = {"provider": "aws", "instance_type": "a1.medium", "usage": {"usage_location": "FRA"}}
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = await ac.post('/v1/cloud/instance?verbose=false&duration=1234&criteria=gwp', json=body)
+        second = await ac.post('/v1/cloud/instance?verbose=false&duration=1234&criteria=gwp', json=body)
+        other = await ac.post('/v1/cloud/instance?verbose=false&duration=1235&criteria=gwp', json=body)
+
+    assert first.headers["Cache-Status"] == "boaviztapi; fwd=miss; stored"
+    assert second.headers["Cache-Status"] == "boaviztapi; hit"
+    assert other.headers["Cache-Status"] == "boaviztapi; fwd=miss; stored"
+    assert second.json() == first.json()
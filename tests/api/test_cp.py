@@ -34,7 +34,7 @@ class CPUConsumptionProfileTest:
 
 @pytest.mark.asyncio
 async def test_complete_valid_cpu_manufacturer_family_partial():
-    await CPUConsumptionProfileTest(name="intel xeon", expected=(15.7628, 0.07359, 20.4511, -2.7476)).run()
+    await CPUConsumptionProfileTest(name="intel xeon", expected=(15.7628, 0.0629, 20.4511, -0.2728)).run()
 
 @pytest.mark.asyncio
 async def test_complete_valid_cpu_manufacturer_family():
@@ -42,11 +42,11 @@ async def test_complete_valid_cpu_manufacturer_family():
 
 @pytest.mark.asyncio
 async def test_complete_valid_cpu_overrides_tdp_if_present():
-    await CPUConsumptionProfileTest(name="intel xeon gold 6134", tdp=100, expected=(50.8479, 0.0630, 20.4511, -0.9999)).run()
+    await CPUConsumptionProfileTest(name="intel xeon gold 6134", tdp=100, expected=(50.8479, 0.0632, 20.4511, -1.0972)).run()
 
 @pytest.mark.asyncio
 async def test_complete_alternative_valid_cpu_manufacturer_family():
-    await CPUConsumptionProfileTest(name="amd epyc 7251", expected=(61.0175, 0.0677, 20.4511, -5.5482)).run()
+    await CPUConsumptionProfileTest(name="amd epyc 7251", expected=(61.0175, 0.0629, 20.4511, -1.0559)).run()
 
 @pytest.mark.asyncio
 async def test_complete_invalid_cpu_returns_default():
@@ -1,3 +1,6 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
 import pytest
 import pytest_asyncio
 
@@ -5,6 +8,8 @@ from jsonschema import validate
 from starlette.testclient import TestClient
 
 from boaviztapi.main import app
+from boaviztapi.service.cache.cache import STALE_WARNING
+from boaviztapi.service.electricity_maps.renewable_energy_provider import RenewableEnergyProvider
 from tests.json_schemas.electricity import available_countries_schema, electricity_prices_elecmaps_latest_schema, \
     electricity_carbon_intensity_elecmaps_latest_schema
 
@@ -52,4 +57,22 @@ async def test_get_power_breakdown(client):
     res = client.get('/v1/electricity/power_breakdown?zone=AT&temporalGranularity=hourly')
     assert res.status_code == 200
     assert res.json()
-    # we don't validate the schema because it varies a lot between zones
\ No newline at end of file
+    # we don't validate the schema because it varies a lot between zones
+
+@pytest.mark.asyncio
+async def test_get_renewable_energy_marks_stale_results(client):
+    cache_service = RenewableEnergyProvider.get_cache_scheduler('daily')
+    url = cache_service.endpoints[0]
+    cache_service.db_cache = AsyncMock()
+    cache_service.memory_cache = {url: {"zone": "FR", "value": "25"}}
+    cache_service.expires_at = {url: datetime.now(timezone.utc) + timedelta(hours=1)}
+
+    # Only one zone has a result yet, the others are being refreshed
+    res = client.get('/v1/electricity/renewable-energy?temporal_granularity=daily')
+    assert res.status_code == 200
+    assert res.json() == {url: {"zone": "FR", "value": "25"}}
+    assert res.headers["Warning"] == STALE_WARNING
+
+    cache_service.expires_at = dict.fromkeys(cache_service.endpoints, datetime.now(timezone.utc) + timedelta(hours=1))
+    res = client.get('/v1/electricity/renewable-energy?temporal_granularity=daily')
+    assert "Warning" not in res.headers
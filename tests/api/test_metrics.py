@@ -0,0 +1,24 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from boaviztapi.main import app
+
+pytest_plugins = ('pytest_asyncio',)
+
+
+@pytest.mark.asyncio
+async def test_get_metrics():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        await ac.get('/v1/utils/version')
+        res = await ac.get('/metrics')
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = res.text.splitlines()
+    assert any(line.startswith('boaviztapi_http_request_duration_seconds_count{method="GET",route="/v1/utils/version",'
+                               'status="200"}') for line in lines)
+    assert 'boaviztapi_http_requests_in_flight{method="GET"} 1' in lines
+    assert any(line.startswith('boaviztapi_cache_hits_total{cache="cpu_name"}') for line in lines)
+    assert any(line.startswith('boaviztapi_curve_fit_calls_total ') for line in lines)
+    assert "# TYPE boaviztapi_mongodb_command_duration_seconds histogram" in lines
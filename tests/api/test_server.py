@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from httpx import AsyncClient, ASGITransport
 
@@ -457,3 +459,75 @@ async def test_utils_version():
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         res = await ac.get('/v1/utils/version')
         assert res.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_server_batch():
+    servers = [{}, {"configuration": {"cpu": {"units": 2, "core_units": 24}}}, {"usage": {"usage_location": "FRA"}}]
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        res = await ac.post('/v1/server/batch?verbose=false&criteria=gwp', json=servers)
+        expected = [(await ac.post('/v1/server/?verbose=false&criteria=gwp', json=server)).json()
+                    for server in servers]
+
+    assert res.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in res.text.splitlines()] == \
+           [{"index": index, "result": result} for index, result in enumerate(expected)]
+
+
+@pytest.mark.asyncio
+async def test_server_batch_ndjson_item_errors():
+    body = '{}\n{"configuration": \n{"configuration": {"cpu": {"units": "two"}}}\n'
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        res = await ac.post('/v1/server/batch?verbose=false&criteria=gwp', content=body,
+                            headers={"content-type": "application/x-ndjson"})
+        expected = (await ac.post('/v1/server/?verbose=false&criteria=gwp', json={})).json()
+
+    lines = [json.loads(line) for line in res.text.splitlines()]
+    assert res.status_code == 200
+    assert lines[0] == {"index": 0, "result": expected}
+    assert lines[1]["index"] == 1 and lines[1]["error"]["status_code"] == 400
+    assert lines[2]["index"] == 2 and lines[2]["error"]["status_code"] == 422
+
+
+@pytest.mark.asyncio
+async def test_server_batch_unknown_archetype():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        res = await ac.post('/v1/server/batch?archetype=unknown', json=[{}])
+
+    assert res.json() == {"index": 0, "error": {"status_code": 404, "detail": "unknown not found"}}
+
+
+@pytest.mark.asyncio
+async def test_server_batch_invalid_body():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        res = await ac.post('/v1/server/batch', json={"configuration": {}})
+
+    assert res.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_failed_request_is_not_cached():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = await ac.post('/v1/server/?archetype=unknown_server', json={})
+        second = await ac.post('/v1/server/?archetype=unknown_server', json={})
+
+    assert first.status_code == second.status_code == 404
+    assert "Cache-Status" not in second.headers
+
+
+@pytest.mark.asyncio
+async def test_server_fields_projection():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        full = (await ac.post('/v1/server/?archetype=dellR740', json={})).json()
+        res = await ac.post("/v1/server/?archetype=dellR740&fields=impacts.gwp.use"
+                            "&fields=$.verbose['CPU-1'].die_size,verbose.avg_power", json={})
+
+    assert res.json() == {'impacts': {'gwp': {'use': full['impacts']['gwp']['use']}},
+                          'verbose': {'CPU-1': {'die_size': full['verbose']['CPU-1']['die_size']},
+                                      'avg_power': full['verbose']['avg_power']}}
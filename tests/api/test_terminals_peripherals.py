@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from httpx import AsyncClient, ASGITransport
 
@@ -157,3 +159,19 @@ async def test_tv_archetype_perso_duration():
                                                      "min": 0.023, "max": 0.9},
                                       "type": {"value": "perso", "status": "ARCHETYPE"},
                                       "units": {"value": 1, "status": "ARCHETYPE", "min": 1, "max": 1}}}
+
+
+@pytest.mark.asyncio
+async def test_terminal_and_peripheral_batch():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        laptops = await ac.post('/v1/terminal/laptop/batch?verbose=false&criteria=gwp', json=[{}, {"usage": {"usage_location": "FRA"}}])
+        expected_laptops = [(await ac.post('/v1/terminal/laptop?verbose=false&criteria=gwp', json=laptop)).json()
+                            for laptop in [{}, {"usage": {"usage_location": "FRA"}}]]
+        monitors = await ac.post('/v1/peripheral/monitor/batch?verbose=false&archetype=unknown', json=[{}])
+        unknown = await ac.post('/v1/terminal/toaster/batch', json=[{}])
+
+    assert [json.loads(line) for line in laptops.text.splitlines()] == \
+           [{"index": index, "result": result} for index, result in enumerate(expected_laptops)]
+    assert monitors.json() == {"index": 0, "error": {"status_code": 404, "detail": "unknown not found"}}
+    assert unknown.status_code == 404
@@ -72,3 +72,70 @@ async def test_get_api_version_is_not_empty_string():
 #         # Check returned version matches semver regex
 #         # See https://semver.org/#is-there-a-suggested-regular-expression-regex-to-check-a-semver-string
 #         assert re.match("^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$", res.json())
+
+
+@pytest.mark.asyncio
+async def test_get_compute_executor_metrics():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        await ac.post('/v1/server/?verbose=false', json={})
+        res = await ac.get('/v1/utils/compute_executor')
+    metrics = res.json()
+    assert metrics["completed"] >= 1
+    assert metrics["queue_depth"] == 0
+    assert {"running", "rejected", "wait_time_total", "wait_time_max", "wait_time_mean"} <= metrics.keys()
+
+
+@pytest.mark.asyncio
+async def test_get_single_flight_metrics():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        res = await ac.get('/v1/utils/single_flight')
+    assert res.json().keys() == {"in_flight", "started", "coalesced"}
+
+
+@pytest.mark.asyncio
+async def test_get_readiness():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        res = await ac.get('/v1/utils/readiness')
+    readiness = res.json()
+    assert readiness["lazy"] is False
+    assert {"aws_prices", "azure_prices", "gcp_prices", "cpu_die_sizes"} <= readiness["datasets"].keys()
+    assert all(dataset["loaded"] for dataset in readiness["datasets"].values())
+
+
+@pytest.mark.asyncio
+async def test_get_memory_report():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        res = await ac.get('/v1/utils/memory')
+    report = res.json()
+    assert report["datasets"]["cpu_specs"] > 0
+    assert report["total"] == sum(size for size in report["datasets"].values() if size is not None)
+    assert report["max_rss"] is None or report["max_rss"] >= report["total"]
+
+
+@pytest.mark.asyncio
+async def test_complete_cpus_from_names():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        res = await ac.post('/v1/utils/name_to_cpu', json=["i7-8565U", "deijeijdiejdzij"])
+        single = await ac.get('/v1/utils/name_to_cpu?cpu_name=i7-8565U')
+
+    assert res.json() == [single.json(), "CPU name deijeijdiejdzij is not found in our database"]
+
+
+@pytest.mark.asyncio
+async def test_get_server_timing():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        impact = await ac.post('/v1/cloud/instance?verbose=true',
+                               json={"provider": "aws", "instance_type": "a1.4xlarge"})
+        res = await ac.get('/v1/utils/server_timing')
+
+    stages = {stage.split(";")[0] for stage in impact.headers["Server-Timing"].split(", ")}
+    assert {"mapping", "total"} <= stages
+    histograms = res.json()["POST /v1/cloud/instance"]
+    assert {"mapping", "render", "total"} <= histograms.keys()
+    assert histograms["total"]["buckets"]["+Inf"] == histograms["total"]["count"]
@@ -0,0 +1,76 @@
+"""
+Compare `compute_impacts_batch` with `compute_impacts` called on each model, for batches of completed server and cloud
+instance models (completion runs model by model in both paths and is left out of the timings).
+
+    python -m tests.benchmarks.bench_batch_impacts --sizes 10 100 1000
+"""
+import argparse
+import gc
+import time
+from typing import Callable, List
+
+from boaviztapi import config
+from boaviztapi.dto.device import Cloud, Server
+from boaviztapi.dto.device.device import mapper_cloud_instance, mapper_server
+from boaviztapi.model.device.server import DeviceServer
+from boaviztapi.service.archetype import get_cloud_instance_archetype, get_server_archetype
+from boaviztapi.service.batch_impacts_computation import BatchModel, compute_impacts_batch
+from boaviztapi.service.impacts_computation import compute_impacts
+
+SERVER_ARCHETYPES = ["dellR740", "platform_compute_medium", "platform_compute_high"]
+CLOUD_INSTANCES = [("aws", "a1.medium"), ("aws", "r5ad.12xlarge"), ("aws", "c5a.24xlarge"), ("scaleway", "dev1-l")]
+
+
+def build_models(size: int) -> List[BatchModel]:
+    models = []
+    for i in range(size):
+        if i % 2 == 0:
+            archetype = get_server_archetype(SERVER_ARCHETYPES[i // 2 % len(SERVER_ARCHETYPES)])
+            models.append(mapper_server(Server(), archetype=archetype))
+        else:
+            provider, instance_type = CLOUD_INSTANCES[i // 2 % len(CLOUD_INSTANCES)]
+            cloud = Cloud()
+            cloud.usage = {}
+            models.append(mapper_cloud_instance(cloud, archetype=get_cloud_instance_archetype(instance_type, provider)))
+    # Completes the models : archetypes, CPU name matching and consumption profiles are out of the comparison
+    compute_impacts_batch(models, duration=None)
+    return models
+
+
+def loop_compute_impacts(models: List[BatchModel]) -> None:
+    for model in models:
+        platform = model if isinstance(model, DeviceServer) else model.platform
+        compute_impacts(model, selected_criteria=config["default_criteria"],
+                        duration=platform.usage.hours_life_time.value)
+
+
+def batch_compute_impacts(models: List[BatchModel]) -> None:
+    compute_impacts_batch(models, duration=None)
+
+
+def best_time(function: Callable[[List[BatchModel]], None], size: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        models = build_models(size)
+        gc.collect()
+        start = time.perf_counter()
+        function(models)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'models':>8} {'loop (ms)':>12} {'batch (ms)':>12} {'speedup':>8}")
+    for size in args.sizes:
+        loop = best_time(loop_compute_impacts, size, args.repeat)
+        batch = best_time(batch_compute_impacts, size, args.repeat)
+        print(f"{size:>8} {loop * 1000:>12.1f} {batch * 1000:>12.1f} {loop / batch:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
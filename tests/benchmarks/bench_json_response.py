@@ -0,0 +1,62 @@
+"""
+Compare the rendering of `SanitizedJSONResponse` (recursive sanitization, then the standard library) with
+`FastJSONResponse` (orjson) on verbose server and cloud instance impacts, as returned by the API.
+
+    python -m tests.benchmarks.bench_json_response --sizes 1 10 100
+"""
+import argparse
+import time
+from typing import Any, Callable, List
+
+from boaviztapi import config
+from boaviztapi.main import FastJSONResponse, SanitizedJSONResponse
+from boaviztapi.model.device.server import DeviceServer
+from boaviztapi.routers.cloud_router import compute_cloud_instance_impact
+from boaviztapi.routers.server_router import compute_server_impact
+from tests.benchmarks.bench_batch_impacts import build_models
+
+
+def build_content(size: int) -> List[Any]:
+    content = []
+    for model in build_models(size):
+        if isinstance(model, DeviceServer):
+            content.append(compute_server_impact(model, verbose=True, duration=None,
+                                                 criteria=config["default_criteria"]))
+        else:
+            content.append(compute_cloud_instance_impact(model, verbose=True, duration=None,
+                                                         criteria=config["default_criteria"]))
+    return content
+
+
+def best_time(render: Callable[[Any], bytes], content: Any, repeat: int, number: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            render(content)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100],
+                        help="number of impacts in the rendered response")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    sanitized = SanitizedJSONResponse(None)
+    fast = FastJSONResponse(None)
+    print(f"{'impacts':>8} {'bytes':>10} {'sanitized (ms)':>15} {'fast (ms)':>10} {'speedup':>8}")
+    for size in args.sizes:
+        content = build_content(size)[0] if size == 1 else build_content(size)
+        assert fast.render(content) == sanitized.render(content)
+        reference = best_time(sanitized.render, content, args.repeat, args.number)
+        candidate = best_time(fast.render, content, args.repeat, args.number)
+        print(f"{size:>8} {len(fast.render(content)):>10} {reference * 1000:>15.3f} {candidate * 1000:>10.3f} "
+              f"{reference / candidate:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
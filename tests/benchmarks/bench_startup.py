@@ -0,0 +1,54 @@
+"""
+Compare the time to import the API (what a worker does when it starts) when the reference data is parsed from the
+data files and when it is loaded from the snapshot (`python -m boaviztapi.utils.data_snapshot`). Each start runs in
+a new interpreter. The snapshot of the data directory, if any, is left as it was.
+
+    python -m tests.benchmarks.bench_startup --repeat 5
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from boaviztapi import data_snapshot
+
+_IMPORT = ("import time; start = time.perf_counter(); import boaviztapi.main; "
+           "print(time.perf_counter() - start)")
+
+
+def start_time(repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", _IMPORT], check=True, capture_output=True, text=True).stdout
+        best = min(best, float(output.split()[-1]))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as saved:
+        saved_path = os.path.join(saved, "snapshot")
+        if os.path.exists(data_snapshot.path):
+            shutil.move(data_snapshot.path, saved_path)
+        try:
+            subprocess.run([sys.executable, "-m", "boaviztapi.utils.data_snapshot"], check=True, capture_output=True)
+            with_snapshot = start_time(args.repeat)
+            os.remove(data_snapshot.path)
+            without_snapshot = start_time(args.repeat)
+        finally:
+            if os.path.exists(saved_path):
+                shutil.move(saved_path, data_snapshot.path)
+            elif os.path.exists(data_snapshot.path):
+                os.remove(data_snapshot.path)
+
+    print(f"{'data files (s)':>15} {'snapshot (s)':>13} {'speedup':>8}")
+    print(f"{without_snapshot:>15.3f} {with_snapshot:>13.3f} {without_snapshot / with_snapshot:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
 import logging
 from unittest.mock import AsyncMock
 
+import pytest
+
 logging.basicConfig(level=logging.DEBUG)
 
+# Functions replaced by pytest_configure, by name
+_unpatched = {}
+
 
 class DummyCtx:
     def __init__(self):
@@ -40,6 +45,7 @@ def pytest_configure(config):
         return None
 
     import boaviztapi.service.cache.cache as cache_mod
+    _unpatched["CacheService.startup"] = cache_mod.CacheService.startup
     cache_mod.CacheService.startup = _noop_startup
 
     # Patch electricity and carbon providers to return deterministic sample data
@@ -58,7 +64,7 @@ def pytest_configure(config):
             "temporalGranularity": temporalGranularity,
         }
 
-    def _fake_carbon(zone: str, temporalGranularity: str = 'hourly'):
+    async def _fake_carbon(zone: str, temporalGranularity: str = 'hourly'):
         return {
             "zone": zone,
             "carbonIntensity": 200.5,
@@ -71,9 +77,17 @@ def pytest_configure(config):
             "temporalGranularity": temporalGranularity,
         }
 
-    def _fake_power_breakdown(zone: str, temporalGranularity: str = 'hourly'):
+    async def _fake_power_breakdown(zone: str, temporalGranularity: str = 'hourly'):
         return {"zone": zone, "temporalGranularity": temporalGranularity, "powerProductionBreakdown": {}}
 
     costs_mod.ElectricityCostsProvider.get_price_for_country_elecmaps = _fake_price
     carbon_mod.CarbonIntensityProvider.get_carbon_intensity = _fake_carbon
     carbon_mod.CarbonIntensityProvider.get_power_breakdown = _fake_power_breakdown
+
+
+@pytest.fixture
+def cache_service_startup(monkeypatch):
+    """Restores `CacheService.startup`, for the tests of the cache service run along the other tests."""
+    if "CacheService.startup" in _unpatched:
+        import boaviztapi.service.cache.cache as cache_mod
+        monkeypatch.setattr(cache_mod.CacheService, "startup", _unpatched["CacheService.startup"])
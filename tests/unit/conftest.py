@@ -1,4 +1,8 @@
+import json
 import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pandas as pd
 import pytest
@@ -404,3 +408,84 @@ def ram_dataframe():
 @pytest.fixture(scope="function")
 def ssd_dataframe():
     return pd.read_csv(data_dir + "/crowdsourcing/ssd_manufacture.csv")
+
+
+# HTTP
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Local HTTP server standing in for the upstream APIs. Paths :
+    `/json/<name>` answers {"name": <name>}, `/flaky/<n>/<name>` answers 503 the first n times, `/limited` answers 429
+    with a Retry-After of 0 the first time, `/slow/<ms>` answers after <ms> milliseconds and any other path 404. The requests received
+    and the highest number of requests served at once are recorded.
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, path: str) -> int:
+        return sum(1 for request_path, _ in self.requests if request_path == path)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, time.monotonic()))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            seen = server.count(self.path)
+        try:
+            parts = self.path.strip("/").split("/")
+            if parts[0] == "json":
+                self._reply(200, {"name": parts[1]})
+            elif parts[0] == "flaky":
+                if seen <= int(parts[1]):
+                    self._reply(503, {"error": "unavailable"})
+                else:
+                    self._reply(200, {"name": parts[2]})
+            elif parts[0] == "limited":
+                if seen == 1:
+                    self._reply(429, {"error": "rate limited"}, {"Retry-After": "0"})
+                else:
+                    self._reply(200, {"name": "limited"})
+            elif parts[0] == "slow":
+                time.sleep(int(parts[1]) / 1000)
+                self._reply(200, {"name": "slow"})
+            else:
+                self._reply(404, {"error": "not found"})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _reply(self, status: int, body: dict, headers: dict = None):
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="function")
+def stub_server():
+    server = StubServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
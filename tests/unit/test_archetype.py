@@ -1,8 +1,9 @@
+import copy
 import os
 
 import pytest
 
-from boaviztapi.service.archetype import get_archetype
+from boaviztapi.service.archetype import get_archetype, get_arch_component, ArchetypeRegistry, thaw
 from tests.unit import data_dir
 
 pytest_plugins = ('pytest_asyncio',)
@@ -45,3 +46,62 @@ async def test_get_server_archetype_dellr740(archetype_id):
 @pytest.mark.parametrize("archetype_id", ["dellR740", "dellR740 "])
 async def test_get_server_archetype_dellr740_faulty_csv(archetype_id):
     assert get_archetype(archetype_id, csv_path=os.path.join(data_dir, "archetypes/server_with_space.csv")) == EXPECTED_ARCHETYPE
+
+
+def test_get_archetype_is_read_only():
+    csv_path = os.path.join(data_dir, "archetypes/server.csv")
+    archetype = get_archetype("dellR740", csv_path=csv_path)
+
+    assert get_archetype("dellR740", csv_path=csv_path) is archetype
+    assert copy.deepcopy(archetype) is archetype
+    with pytest.raises(TypeError):
+        archetype["CPU"]["units"]["default"] = 8.0
+
+
+def test_thaw_archetype_returns_independent_copy():
+    csv_path = os.path.join(data_dir, "archetypes/server.csv")
+    archetype = thaw(get_archetype("dellR740", csv_path=csv_path))
+    archetype["CPU"]["units"]["default"] = 8.0
+    archetype["RAM"] = {}
+
+    assert get_archetype("dellR740", csv_path=csv_path) == EXPECTED_ARCHETYPE
+
+
+def test_get_arch_component_does_not_alter_archetype():
+    archetype = get_archetype("dellR740", csv_path=os.path.join(data_dir, "archetypes/server.csv"))
+    cpu = get_arch_component(archetype, "CPU")
+
+    assert cpu["USAGE"] == EXPECTED_ARCHETYPE["USAGE"]
+    assert archetype == EXPECTED_ARCHETYPE
+
+
+def test_archetype_registry_reload(tmp_path):
+    (tmp_path / "archetypes").mkdir()
+    csv_path = tmp_path / "archetypes" / "server.csv"
+    csv_path.write_text("id,manufacturer\nmy_server,Dell\n")
+    registry = ArchetypeRegistry(str(tmp_path))
+    registry.reload()
+
+    assert registry.get("my_server", registry.path("archetypes/server.csv")) == {"manufacturer": {"default": "Dell"}}
+
+    csv_path.write_text("id,manufacturer\nmy_server,HP\n")
+    assert registry.get("my_server", registry.path("archetypes/server.csv")) == {"manufacturer": {"default": "Dell"}}
+
+    registry.reload()
+    assert registry.get("my_server", registry.path("archetypes/server.csv")) == {"manufacturer": {"default": "HP"}}
+
+
+def test_archetype_registry_fingerprint_follows_the_files(tmp_path):
+    (tmp_path / "archetypes").mkdir()
+    csv_path = tmp_path / "archetypes" / "server.csv"
+    csv_path.write_text("id,manufacturer\nmy_server,Dell\n")
+    registry = ArchetypeRegistry(str(tmp_path))
+    registry.reload()
+    fingerprint = registry.fingerprint
+
+    registry.reload()
+    assert registry.fingerprint == fingerprint
+
+    csv_path.write_text("id,manufacturer\nmy_server,HP\n")
+    registry.reload()
+    assert registry.fingerprint != fingerprint
@@ -0,0 +1,86 @@
+import copy
+
+import pytest
+
+from boaviztapi import config
+from boaviztapi.dto.device import Cloud
+from boaviztapi.dto.device.device import mapper_server, mapper_cloud_instance
+from boaviztapi.model.device.server import DeviceServer
+from boaviztapi.service.archetype import get_cloud_instance_archetype
+from boaviztapi.service.batch_impacts_computation import compute_impacts_batch
+from boaviztapi.service.impacts_computation import compute_impacts
+from boaviztapi.service.verbose import verbose_device, verbose_cloud
+
+
+def _cloud_instance(instance_type, provider="aws"):
+    cloud = Cloud()
+    cloud.usage = {}
+    return mapper_cloud_instance(cloud, archetype=get_cloud_instance_archetype(instance_type, provider))
+
+
+def _servers(dell_r740_dto, incomplete_server_dto, completed_server_with_dellr740_dto, blade_case_model):
+    blade_server = DeviceServer()
+    blade_server.case = blade_case_model
+    return [DeviceServer(),
+            mapper_server(dell_r740_dto),
+            mapper_server(incomplete_server_dto),
+            mapper_server(completed_server_with_dellr740_dto),
+            blade_server]
+
+
+def _cloud_instances():
+    return [_cloud_instance("a1.medium"),
+            _cloud_instance("r5ad.12xlarge"),
+            _cloud_instance("c5a.24xlarge"),
+            _cloud_instance("dev1-l", "scaleway")]
+
+
+def _verbose(model, criteria, duration):
+    if duration is None:
+        duration = model.usage.hours_life_time.value if isinstance(model, DeviceServer) \
+            else model.platform.usage.hours_life_time.value
+    if isinstance(model, DeviceServer):
+        return verbose_device(model, selected_criteria=criteria, duration=duration)
+    return verbose_cloud(model, selected_criteria=criteria, duration=duration)
+
+
+def _scalar_impacts(model, criteria, duration):
+    if duration is None:
+        duration = model.usage.hours_life_time.value if isinstance(model, DeviceServer) \
+            else model.platform.usage.hours_life_time.value
+    return compute_impacts(model, selected_criteria=criteria, duration=duration)
+
+
+@pytest.mark.parametrize("criteria", [config["default_criteria"], ["gwp", "gwppb", "ir"], ["pe"]])
+@pytest.mark.parametrize("duration", [None, 24 * 365, 10 * 24 * 365])
+def test_batch_impacts_match_compute_impacts(criteria, duration, dell_r740_dto, incomplete_server_dto,
+                                             completed_server_with_dellr740_dto, blade_case_model):
+    models = _servers(dell_r740_dto, incomplete_server_dto, completed_server_with_dellr740_dto,
+                      blade_case_model) + _cloud_instances()
+    twins = copy.deepcopy(models)
+
+    batch = compute_impacts_batch(models, selected_criteria=criteria, duration=duration)
+    expected = [_scalar_impacts(twin, criteria, duration) for twin in twins]
+
+    assert batch == expected
+    assert [_verbose(model, criteria, duration) for model in models] == \
+           [_verbose(twin, criteria, duration) for twin in twins]
+
+
+def test_batch_impacts_keeps_model_order(dell_r740_dto):
+    models = [_cloud_instance("a1.4xlarge"), mapper_server(dell_r740_dto), _cloud_instance("a1.medium")]
+    twins = copy.deepcopy(models)
+
+    assert compute_impacts_batch(models, duration=None) == [_scalar_impacts(twin, config["default_criteria"], None)
+                                                            for twin in twins]
+
+
+def test_batch_impacts_delegates_other_models(complete_cpu_model, blade_case_model):
+    twins = copy.deepcopy([complete_cpu_model, blade_case_model])
+
+    assert compute_impacts_batch([complete_cpu_model, blade_case_model], duration=24 * 365) == \
+           [compute_impacts(twin, duration=24 * 365) for twin in twins]
+
+
+def test_batch_impacts_empty_batch():
+    assert compute_impacts_batch([]) == []
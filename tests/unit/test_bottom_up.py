@@ -1,3 +1,7 @@
+import pandas as pd
+import pytest
+
+from boaviztapi.model.component.cpu import DieSizeTable
 from boaviztapi.service.impacts_computation import compute_impacts
 
 
@@ -471,3 +475,18 @@ def test_bottom_up_component_assembly(assembly_model):
                                              'calculation']},
                    'unit': 'MJ',
                    'use': 'not implemented'}}
+
+
+def test_die_size_table_from_cpu_specs():
+    cpu_specs = pd.DataFrame({"name": ["a", "b", "c", "d"],
+                              "cores": [4.0, 4.0, 8.0, None],
+                              "total_die_size": [100.0, 120.0, 200.0, 50.0]})
+    table = DieSizeTable.from_cpu_specs(cpu_specs)
+
+    assert (table.mean, table.min, table.max) == (117.5, 50.0, 200.0)
+    assert table.by_cores == {4.0: (110.0, 100.0, 120.0), 8.0: (200.0, 200.0, 200.0)}
+    assert table.reference is None
+    assert table.regression == pytest.approx((20.0, 22.5))
+
+    table = DieSizeTable.from_cpu_specs(cpu_specs.iloc[:2])
+    assert table.reference == ("a", 100.0, 4.0)
@@ -1,13 +1,19 @@
+import asyncio
+
 import pytest
 import respx
 from httpx import Response
 from datetime import datetime, timezone, timedelta
 from unittest.mock import AsyncMock, patch, MagicMock
 
-from boaviztapi.service.cache.cache import CacheService
+from pymongo import UpdateMany, UpdateOne
+
+from boaviztapi import config
+
+from boaviztapi.service.cache.cache import CACHE_COLLECTION, LEGACY_CACHE_COLLECTION, CacheService, index_by_zone
 
 @pytest.fixture(autouse=True)
-def reset_singleton():
+def reset_singleton(cache_service_startup):
     """Ensure each test has a fresh CacheService instance."""
     CacheService._instances = {}
 
@@ -18,10 +24,21 @@ def mock_db():
     collection = AsyncMock()
     # Default behavior: no cache found in DB
     collection.find_one.return_value = None
-    collection.find_one_and_update = AsyncMock()
+    collection.find = MagicMock(return_value=MagicMock(to_list=AsyncMock(return_value=[])))
+    collection.bulk_write = AsyncMock()
     return collection
 
 
+def persisted(mock_db, documents):
+    """Documents of the cache entries returned by the mocked collection."""
+    mock_db.find.return_value.to_list.return_value = documents
+
+
+def bulk_requests(mock_db):
+    args, kwargs = mock_db.bulk_write.call_args
+    return args[0]
+
+
 @pytest.mark.asyncio
 async def test_singleton_behavior():
     """Verify that same name returns same instance, different name returns new."""
@@ -50,35 +67,33 @@ async def test_fetch_all_cache_miss(mock_db):
     assert route.called
     # Verify memory update
     assert service.memory_cache[url] == {"result": "ok"}
-    # Verify DB update call
-    assert mock_db.find_one_and_update.called
-    args, kwargs = mock_db.find_one_and_update.call_args
-    assert kwargs['update']['$set']['data'][url] == {"result": "ok"}
+    # Verify DB update call : one document per endpoint
+    [request] = bulk_requests(mock_db)
+    assert isinstance(request, UpdateOne)
+    assert request._filter == {"cache": "test_miss", "key": url}
+    assert request._doc["$set"]["data"] == {"result": "ok"}
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_fetch_all_cache_hit_valid(mock_db):
-    """Test that fetch_all skips API call if DB cache is still valid."""
+async def test_startup_with_valid_cache(mock_db):
+    """Test that startup skips API call if DB cache is still valid."""
     url = "https://api.test/data"
-    route = respx.get(url).mock(return_value=Response(200, json={"new": "data"}))
-
     # Mock valid cache in DB (expires in 1 hour)
     valid_time = datetime.now(timezone.utc) + timedelta(hours=1)
-    mock_db.find_one.return_value = {
-        "expires_at": valid_time,
-        "data": {url: {"old": "data"}}
-    }
+    persisted(mock_db, [{"key": url, "data": {"old": "data"}, "expires_at": valid_time}])
 
     service = CacheService(name="test_hit", endpoints=[url])
     service.db_cache = mock_db
 
-    await service.fetch_all()
+    with patch("boaviztapi.service.cache.cache.http_fetcher") as fetcher:
+        await service.startup()
+    await service.shutdown()
 
     # Assert API was NEVER called
-    assert not route.called
+    assert not fetcher.fetch_all.called
     # Assert memory was populated from DB
     assert service.memory_cache[url] == {"old": "data"}
+    assert not service.stale
 
 
 @pytest.mark.asyncio
@@ -122,17 +137,243 @@ async def test_fetch_all_with_errors_saved(mock_db):
 #             service.scheduler.shutdown()
 
 
+@pytest.mark.asyncio
+async def test_startup_serves_stale_results_while_refreshing(mock_db):
+    """The persisted results, expired ones included, are served at once, the expired ones are refreshed meanwhile."""
+    valid_url, expired_url, missing_url = "https://api.test/valid", "https://api.test/expired", "https://api.test/new"
+    now = datetime.now(timezone.utc)
+    persisted(mock_db, [
+        {"key": valid_url, "data": {"old": "valid"}, "expires_at": now + timedelta(hours=1)},
+        {"key": expired_url, "data": {"old": "expired"}, "expires_at": now - timedelta(hours=1)},
+    ])
+    upstream = asyncio.Event()
+
+    async def fetch_all(urls, headers=None):
+        await upstream.wait()
+        return [Response(200, json={"new": url}) for url in urls]
+
+    service = CacheService(name="test_stale", endpoints=[valid_url, expired_url, missing_url])
+    service.db_cache = mock_db
+
+    with patch("boaviztapi.service.cache.cache.http_fetcher") as fetcher:
+        fetcher.fetch_all = AsyncMock(side_effect=fetch_all)
+        await service.startup()
+
+        # Served before the upstream API answers
+        assert await service.get_results() == {valid_url: {"old": "valid"}, expired_url: {"old": "expired"}}
+        assert service.stale
+        assert service.metrics()["stale"] == 1
+
+        upstream.set()
+        await service._refresh
+
+    assert fetcher.fetch_all.call_args.args[0] == [expired_url, missing_url]
+    assert service.memory_cache == {valid_url: {"old": "valid"}, expired_url: {"new": expired_url},
+                                    missing_url: {"new": missing_url}}
+    assert not service.stale
+    # Only the refreshed entries are written
+    assert [request._filter["key"] for request in bulk_requests(mock_db)] == [expired_url, missing_url]
+    await service.shutdown()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_failed_refresh_keeps_the_stale_results(mock_db):
+    url = "https://api.test/data"
+    respx.get(url).mock(return_value=Response(500))
+    service = CacheService(name="test_failed_refresh", endpoints=[url])
+    service.db_cache = mock_db
+    service.memory_cache = {url: {"old": "data"}}
+
+    await service.refresh_in_background()
+
+    assert service.memory_cache == {url: {"old": "data"}}
+    assert service.stale
+    assert not mock_db.bulk_write.called
+
+
 @pytest.mark.asyncio
 async def test_get_results_lazy_start(mock_db):
-    """Verifies that get_results triggers startup if db_cache is missing."""
-    service = CacheService(name="lazy", endpoints=["http://api"])
+    """get_results lazily starts the cache, only waiting on the database : the endpoints are fetched in the background."""
+    service = CacheService(name="lazy", endpoints=["http://api/FR"])
+    persisted(mock_db, [{"key": "http://api/FR", "data": {"zone": "FR"}, "expires_at": datetime.now()}])
+    upstream = asyncio.Event()
+
+    async def fetch_all(urls, headers=None):
+        await upstream.wait()
+        return [Response(200, json={"zone": "FR", "new": True})]
+
+    with patch("boaviztapi.service.cache.cache.get_app_context") as get_ctx, \
+            patch("boaviztapi.service.cache.cache.http_fetcher") as fetcher:
+        get_ctx.return_value.mongodb_client.get_database.return_value.get_collection.return_value = mock_db
+        fetcher.fetch_all = AsyncMock(side_effect=fetch_all)
+
+        # Concurrent requests share the same startup
+        results = await asyncio.gather(service.get_results(), service.get_results())
+
+        assert results == [{"http://api/FR": {"zone": "FR"}}] * 2
+        assert mock_db.create_index.call_count == 1
+        assert mock_db.find.call_count == 1
+        upstream.set()
+        await service.shutdown()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_refresh_only_writes_the_changed_entries(mock_db):
+    changed_url, unchanged_url = "https://api.test/changed", "https://api.test/unchanged"
+    respx.get(changed_url).mock(return_value=Response(200, json={"value": 2}))
+    respx.get(unchanged_url).mock(return_value=Response(200, json={"value": 1}))
+
+    service = CacheService(name="test_refresh", endpoints=[changed_url, unchanged_url])
+    service.db_cache = mock_db
+    service.memory_cache = {changed_url: {"value": 1}, unchanged_url: {"value": 1}}
+
+    await service.fetch_all()
+
+    assert not mock_db.find.called
+    assert service.version == 1
+    upsert, extension = bulk_requests(mock_db)
+    assert upsert._filter == {"cache": "test_refresh", "key": changed_url}
+    assert isinstance(extension, UpdateMany)
+    assert extension._filter == {"cache": "test_refresh", "key": {"$in": [unchanged_url]}}
+    assert list(extension._doc["$set"]) == ["expires_at"]
+
+    # Nothing changed : the cached impacts computed from the results are still valid
+    await service.fetch_all()
+    assert service.version == 1
+
+
+@pytest.mark.asyncio
+async def test_get_result(mock_db):
+    service = CacheService(name="test_get_result", endpoints=["http://api/FR", "http://api/DE"])
+    service.db_cache = mock_db
+
+    # Not in memory : one indexed read of the document of the endpoint
+    mock_db.find_one.return_value = {"data": {"zone": "FR"}}
+    assert await service.get_result("http://api/FR") == {"zone": "FR"}
+    args, _ = mock_db.find_one.call_args
+    assert args[0] == {"cache": "test_get_result", "key": "http://api/FR"}
+
+    mock_db.find_one.return_value = None
+    assert await service.get_result("http://api/ES") is None
+
+    service.memory_cache = {"http://api/DE": {"zone": "DE"}}
+    assert await service.get_result("http://api/DE") == {"zone": "DE"}
+    assert mock_db.find_one.call_count == 2
+    assert (service.hits, service.misses) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_get_results_from_database(mock_db):
+    service = CacheService(name="test_get_results", endpoints=["http://api/FR"])
+    service.db_cache = mock_db
+    persisted(mock_db, [{"key": "http://api/FR", "data": {"zone": "FR"}, "expires_at": datetime.now()}])
+
+    assert await service.get_results() == {"http://api/FR": {"zone": "FR"}}
+
+
+def test_index_by_zone():
+    base = "https://api.test/carbon-intensity/past"
+    results = {
+        f"{base}?zone=FR&temporalGranularity=monthly": {"zone": "FR", "carbonIntensity": 30},
+        f"{base}?zone=DE&temporalGranularity=monthly": '{"zone": "DE", "carbonIntensity": 350}',
+        f"{base}?zone=PL&temporalGranularity=monthly": {"error": "HTTP 500"},
+        f"{base}?zone=ES&temporalGranularity=monthly": "not json",
+        "https://api.test/latest": {"zone": "IT", "carbonIntensity": 250},
+    }
+
+    assert index_by_zone(results) == {
+        "FR": {"zone": "FR", "carbonIntensity": 30},
+        "DE": {"zone": "DE", "carbonIntensity": 350},
+        "IT": {"zone": "IT", "carbonIntensity": 250},
+    }
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_get_zone(mock_db):
+    fr, de = "https://api.test/price?zone=FR&temporalGranularity=yearly", "https://api.test/price?zone=DE&temporalGranularity=yearly"
+    respx.get(de).mock(return_value=Response(200, json={"zone": "DE", "value": 90}))
+    persisted(mock_db, [{"key": fr, "data": {"zone": "FR", "value": 80}, "expires_at": datetime.now()}])
+    service = CacheService(name="test_zones", endpoints=[fr, de])
+    service.db_cache = mock_db
+
+    # Not loaded yet : indexed from the database
+    assert await service.get_zone("FR") == {"zone": "FR", "value": 80}
+
+    await service.fetch_all([de])
+    assert service.zones == {"DE": {"zone": "DE", "value": 90}}
+    assert await service.get_zone("DE") == {"zone": "DE", "value": 90}
+    assert await service.get_zone("ES") is None
+    assert (service.hits, service.misses) == (2, 1)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_errors_do_not_replace_results(mock_db):
+    url, new_url = "https://api.test/data", "https://api.test/new"
+    respx.get(url).mock(return_value=Response(500))
+    respx.get(new_url).mock(return_value=Response(500))
+    service = CacheService(name="test_err_kept", endpoints=[url, new_url], save_errors=True)
+    service.db_cache = mock_db
+    service.memory_cache = {url: {"old": "data"}}
+
+    await service.fetch_all()
+
+    assert service.memory_cache[url] == {"old": "data"}
+    assert "error" in service.memory_cache[new_url]
+
+
+@pytest.mark.asyncio
+async def test_startup_migrates_the_legacy_documents(mock_db):
+    """The results persisted in one document per cache are split into one document per endpoint, once."""
+    legacy = AsyncMock()
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    legacy.find_one.return_value = {"_id": "legacy-id", "name": "test_legacy", "expires_at": expires_at,
+                                    "data": {"http://api/FR": {"zone": "FR"}, "http://api/DE": {"zone": "DE"}}}
+    collections = {CACHE_COLLECTION: mock_db, LEGACY_CACHE_COLLECTION: legacy}
+    # Read back after the migration
+    persisted(mock_db, [{"key": key, "data": data, "expires_at": expires_at}
+                        for key, data in legacy.find_one.return_value["data"].items()])
+    service = CacheService(name="test_legacy", endpoints=["http://api/FR", "http://api/DE"])
+
+    with patch("boaviztapi.service.cache.cache.get_app_context") as get_ctx, \
+            patch("boaviztapi.service.cache.cache.http_fetcher") as fetcher:
+        get_ctx.return_value.mongodb_client.get_database.return_value.get_collection.side_effect = collections.get
+        await service.startup()
+        await service.shutdown()
+
+    legacy.find_one.assert_called_once_with({"name": "test_legacy"})
+    requests = bulk_requests(mock_db)
+    assert [request._filter for request in requests] == [{"cache": "test_legacy", "key": "http://api/FR"},
+                                                         {"cache": "test_legacy", "key": "http://api/DE"}]
+    # Entries already in the new layout are not overwritten
+    assert requests[0]._doc == {"$setOnInsert": {"data": {"zone": "FR"}, "expires_at": expires_at}}
+    legacy.delete_one.assert_called_once_with({"_id": "legacy-id"})
+    assert not fetcher.fetch_all.called
+
+
+@pytest.mark.asyncio
+async def test_readers_wait_for_the_first_refresh_of_an_empty_cache(mock_db, monkeypatch):
+    """With nothing persisted, not even stale, the readers wait for the first refresh, up to a timeout."""
+    upstream = asyncio.Event()
+
+    async def fetch_all(urls, headers=None):
+        await upstream.wait()
+        return [Response(200, json={"zone": "FR"})]
+
+    service = CacheService(name="test_empty", endpoints=["http://api/FR"])
+    service.db_cache = mock_db
 
-    with patch.object(service, 'startup', new_callable=AsyncMock) as mock_start:
-        # Simulate startup setting the db_cache
-        async def side_effect():
-            service.db_cache = mock_db
+    with patch("boaviztapi.service.cache.cache.http_fetcher") as fetcher:
+        fetcher.fetch_all = AsyncMock(side_effect=fetch_all)
+        await service.startup()
 
-        mock_start.side_effect = side_effect
+        monkeypatch.setitem(config, "cache_first_fetch_timeout", 0.05)
+        assert await service.get_result("http://api/FR") is None
 
-        await service.get_results()
-        assert mock_start.called
\ No newline at end of file
+        monkeypatch.setitem(config, "cache_first_fetch_timeout", 5)
+        asyncio.get_running_loop().call_later(0.05, upstream.set)
+        assert await service.get_results() == {"http://api/FR": {"zone": "FR"}}
+        await service.shutdown()
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+import pytest
+
+from boaviztapi.service.compute_executor import ComputeExecutor
+from boaviztapi.service.exceptions import ServiceOverloadedError
+
+pytest_plugins = ('pytest_asyncio',)
+
+
+@pytest.mark.asyncio
+async def test_compute_executor_runs_off_the_event_loop():
+    executor = ComputeExecutor(workers=2, max_queue=4)
+    try:
+        thread = await executor.run(lambda: threading.current_thread())
+        assert thread is not threading.current_thread()
+        assert await executor.run(sum, [1, 2, 3]) == 6
+    finally:
+        executor.shutdown()
+
+    assert executor.metrics()["completed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_compute_executor_propagates_exceptions():
+    executor = ComputeExecutor(workers=1, max_queue=4)
+
+    def fail():
+        raise ValueError("not found")
+    try:
+        with pytest.raises(ValueError, match="not found"):
+            await executor.run(fail)
+    finally:
+        executor.shutdown()
+
+    assert executor.metrics()["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_compute_executor_rejects_beyond_max_queue():
+    executor = ComputeExecutor(workers=1, max_queue=2)
+    release = threading.Event()
+    try:
+        # One computation running, one waiting for the thread
+        admitted = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert executor.metrics()["running"] == 1
+        assert executor.metrics()["queue_depth"] == 1
+
+        with pytest.raises(ServiceOverloadedError) as e:
+            await executor.run(release.wait)
+        assert e.value.status_code == 503
+
+        release.set()
+        await asyncio.gather(*admitted)
+    finally:
+        release.set()
+        executor.shutdown()
+
+    metrics = executor.metrics()
+    assert metrics["rejected"] == 1
+    assert metrics["completed"] == 2
+    assert metrics["queue_depth"] == 0 and metrics["running"] == 0
+    assert metrics["wait_time_max"] > 0
@@ -4,6 +4,8 @@ import pytest
 
 from boaviztapi.dto.consumption_profile.consumption_profile import WorkloadPower
 from boaviztapi.model.consumption_profile import CPUConsumptionProfileModel, RAMConsumptionProfileModel
+from boaviztapi.model.consumption_profile.consumption_profile import fitted_params_cache, tdp_reference_cache
+from boaviztapi.utils.lru_cache import LRUCache
 
 MODEL_TEST_DATA_POINTS = [0., 25., 50., 75., 100.]
 
@@ -197,4 +199,77 @@ def test_ram_with_capacity(capacity: int, expected_model_params: Dict[str, float
     ram_cp.compute_consumption_profile_model(capacity)
     expected_model = RAMConsumptionProfileModel()
     expected_model.params.value = expected_model_params
-    validate_models_approx(ram_cp, expected_model)
\ No newline at end of file
+    validate_models_approx(ram_cp, expected_model)
+
+def test_cpu_fitted_params_are_cached():
+    fitted_params_cache.clear()
+    workload = [WorkloadPower(load_percentage=0, power_watt=20), WorkloadPower(load_percentage=50, power_watt=90),
+                WorkloadPower(load_percentage=100, power_watt=130)]
+
+    first_cp = CPUConsumptionProfileModel()
+    first_cp.workloads.set_input(workload)
+    first = first_cp.compute_consumption_profile_model(cpu_model_range='Xeon Gold')
+    assert fitted_params_cache.info()["misses"] == 1
+
+    second_cp = CPUConsumptionProfileModel()
+    second_cp.workloads.set_input(workload)
+    second = second_cp.compute_consumption_profile_model(cpu_model_range='Xeon Gold')
+    assert second == first
+    assert fitted_params_cache.info()["hits"] == 1
+
+    third_cp = CPUConsumptionProfileModel()
+    third_cp.workloads.set_input(workload[:2])
+    third_cp.compute_consumption_profile_model(cpu_model_range='Xeon Gold')
+    assert fitted_params_cache.info()["misses"] == 2
+
+
+def test_cpu_tdp_reference_models_are_cached():
+    tdp_reference_cache.clear()
+    for tdp in (65, 120, 205):
+        CPUConsumptionProfileModel().compute_consumption_profile_model(cpu_model_range='Xeon Gold', cpu_tdp=tdp)
+
+    info = tdp_reference_cache.info()
+    assert (info["hits"], info["misses"], info["size"]) == (2, 1, 1)
+
+
+def test_cpu_fitted_params_cache_is_bounded():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+    assert cache.info() == {"hits": 1, "misses": 0, "size": 2, "maxsize": 2}
+
+
+@pytest.mark.parametrize('model_range', [None, 'Xeon Platinum', 'Xeon Gold', 'Xeon Silver', 'Xeon E5', 'Xeon E3', 'Xeon E'])
+@pytest.mark.parametrize('tdp', [15, 35, 65, 85, 120, 150, 205, 280, 400])
+def test_cpu_tdp_scaling_matches_fitted_model(model_range: str, tdp: int):
+    scaled_cp = CPUConsumptionProfileModel()
+    scaled_cp.compute_consumption_profile_model(cpu_model_range=model_range, cpu_tdp=tdp)
+
+    fitted_cp = CPUConsumptionProfileModel()
+    fitted_cp.workloads.set_input([
+        WorkloadPower(load_percentage=load, power_watt=tdp * ratio)
+        for load, ratio in zip(CPUConsumptionProfileModel._TDP_RATIOS_WORKLOAD, CPUConsumptionProfileModel._TDP_RATIOS)
+    ])
+    fitted_cp.compute_consumption_profile_model(cpu_model_range=model_range)
+
+    validate_models_approx(scaled_cp, fitted_cp, rel=1e-5)
+
+
+def test_cpu_tdp_falls_back_to_fitted_model_without_positive_full_load_power():
+    # a * log(b * (100 + c)) + d is negative at full load : there is no reference TDP to scale from
+    archetype = {"params": {"default": {'a': 1.0, 'b': 0.001, 'c': 1.0, 'd': -1.0}}}
+    scaled_cp = CPUConsumptionProfileModel(archetype=archetype)
+    scaled_cp.compute_consumption_profile_model(cpu_tdp=100)
+
+    fitted_cp = CPUConsumptionProfileModel(archetype=archetype)
+    fitted_cp.workloads.set_input([
+        WorkloadPower(load_percentage=load, power_watt=100 * ratio)
+        for load, ratio in zip(CPUConsumptionProfileModel._TDP_RATIOS_WORKLOAD, CPUConsumptionProfileModel._TDP_RATIOS)
+    ])
+    fitted_cp.compute_consumption_profile_model()
+
+    assert scaled_cp.params.value == fitted_cp.params.value
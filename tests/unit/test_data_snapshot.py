@@ -0,0 +1,94 @@
+import pickle
+
+import pandas as pd
+
+from boaviztapi.utils.data_snapshot import DataSnapshot, load_yaml
+
+
+def _data_files(tmp_path):
+    csv_path = tmp_path / "cpu_specs.csv"
+    csv_path.write_text("name,tdp\nIntel Xeon Gold 6134,130\nAMD EPYC 7763,280\n")
+    yaml_path = tmp_path / "factors.yml"
+    yaml_path.write_text("gwp:\n  FR: 0.1\n")
+    return str(csv_path), str(yaml_path)
+
+
+def test_data_snapshot_without_snapshot_parses_the_files(tmp_path):
+    csv_path, yaml_path = _data_files(tmp_path)
+    snapshot = DataSnapshot(str(tmp_path))
+
+    assert snapshot.read_csv(csv_path)["tdp"].tolist() == [130, 280]
+    assert snapshot.load_yaml(yaml_path) == {"gwp": {"FR": 0.1}}
+    assert snapshot.metrics()["entries"] == 0
+    assert snapshot.metrics()["misses"] == 2
+
+
+def test_data_snapshot_build_then_load(tmp_path):
+    csv_path, yaml_path = _data_files(tmp_path)
+    builder = DataSnapshot(str(tmp_path))
+    builder.read_csv(csv_path, usecols=["name"])
+    builder.load_yaml(yaml_path)
+    assert builder.build() == 2
+
+    snapshot = DataSnapshot(str(tmp_path))
+    df = snapshot.read_csv(csv_path, usecols=["name"])
+    pd.testing.assert_frame_equal(df, pd.read_csv(csv_path, usecols=["name"]))
+    assert snapshot.load_yaml(yaml_path) == load_yaml(yaml_path)
+    assert snapshot.metrics()["hits"] == 2
+    assert snapshot.metrics()["misses"] == 0
+
+    # Other parsing options are another entry
+    assert snapshot.read_csv(csv_path).columns.tolist() == ["name", "tdp"]
+    assert snapshot.metrics()["misses"] == 1
+
+
+def test_data_snapshot_returns_a_new_object_on_each_load(tmp_path):
+    _, yaml_path = _data_files(tmp_path)
+    builder = DataSnapshot(str(tmp_path))
+    builder.load_yaml(yaml_path)
+    builder.build()
+
+    snapshot = DataSnapshot(str(tmp_path))
+    snapshot.load_yaml(yaml_path)["gwp"]["FR"] = 1.0
+    assert snapshot.load_yaml(yaml_path) == {"gwp": {"FR": 0.1}}
+
+
+def test_data_snapshot_parses_changed_files(tmp_path):
+    csv_path, _ = _data_files(tmp_path)
+    builder = DataSnapshot(str(tmp_path))
+    builder.read_csv(csv_path)
+    builder.build()
+
+    with open(csv_path, "a") as file:
+        file.write("Intel Core i7-1185G7,28\n")
+
+    snapshot = DataSnapshot(str(tmp_path))
+    assert snapshot.read_csv(csv_path)["tdp"].tolist() == [130, 280, 28]
+    assert snapshot.metrics()["hits"] == 0
+
+
+def test_data_snapshot_ignores_other_versions(tmp_path):
+    _, yaml_path = _data_files(tmp_path)
+    builder = DataSnapshot(str(tmp_path))
+    builder.load_yaml(yaml_path)
+    builder.build()
+
+    with open(builder.path, "rb") as file:
+        content = pickle.load(file)
+    content["version"] = (0,)
+    with open(builder.path, "wb") as file:
+        pickle.dump(content, file)
+
+    snapshot = DataSnapshot(str(tmp_path))
+    assert snapshot.load_yaml(yaml_path) == {"gwp": {"FR": 0.1}}
+    assert snapshot.metrics()["entries"] == 0
+
+
+def test_data_snapshot_ignores_unreadable_snapshots(tmp_path):
+    _, yaml_path = _data_files(tmp_path)
+    snapshot = DataSnapshot(str(tmp_path))
+    with open(snapshot.path, "wb") as file:
+        file.write(b"not a snapshot")
+
+    assert snapshot.load_yaml(yaml_path) == {"gwp": {"FR": 0.1}}
+    assert snapshot.metrics()["entries"] == 0
@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from boaviztapi.service.cache.http_fetcher import HttpFetcher, http_fetcher
+from boaviztapi.service.electricitymaps_service import ElectricityMapsClient, ElectricityMapsService, \
+    electricity_maps_fetcher
+from boaviztapi.service.exceptions import APIAuthenticationError, APIError, APIMissingValueError
+
+pytest_plugins = ('pytest_asyncio',)
+
+BASE_URL = "https://api.electricitymaps.test/v3/carbon-intensity/latest"
+
+
+class MockElectricityMaps:
+    """Mock transport answering the zones of `responses` (status code and body), counting the requests per url."""
+
+    def __init__(self, responses: dict):
+        self.responses = responses
+        self.calls = {}
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        self.calls[url] = self.calls.get(url, 0) + 1
+        await self.release.wait()
+        status_code, body = self.responses.get(request.url.params["zone"], (404, {"error": "Zone not found"}))
+        return httpx.Response(status_code, json=body)
+
+    def client(self, **kwargs) -> ElectricityMapsClient:
+        fetcher = HttpFetcher(backoff=0.01, transport=httpx.MockTransport(self.handle))
+        return ElectricityMapsClient(fetcher, **{"retries": 0, **kwargs})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_make_one_request():
+    upstream = MockElectricityMaps({"FR": (200, {"zone": "FR", "carbonIntensity": 30})})
+    client = upstream.client()
+    upstream.release.clear()
+
+    requests = [asyncio.ensure_future(client.get(f"{BASE_URL}?zone=FR", headers={"auth-token": "token"}))
+                for _ in range(20)]
+    await asyncio.sleep(0.01)
+    upstream.release.set()
+    results = await asyncio.gather(*requests)
+
+    assert results == [{"zone": "FR", "carbonIntensity": 30}] * 20
+    assert upstream.calls == {f"{BASE_URL}?zone=FR": 1}
+    assert client.single_flight.metrics()["coalesced"] == 19
+
+    # Not coalesced once the request is over
+    await client.get(f"{BASE_URL}?zone=FR", headers={})
+    assert upstream.calls == {f"{BASE_URL}?zone=FR": 2}
+    await client.fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_zones_not_found_are_remembered():
+    upstream = MockElectricityMaps({})
+    client = upstream.client(not_found_ttl=0.05)
+    url = f"{BASE_URL}?zone=XX"
+
+    for _ in range(3):
+        with pytest.raises(APIMissingValueError):
+            await client.get(url, headers={})
+    assert upstream.calls == {url: 1}
+
+    await asyncio.sleep(0.06)
+    with pytest.raises(APIMissingValueError):
+        await client.get(url, headers={})
+    assert upstream.calls == {url: 2}
+    await client.fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_errors():
+    upstream = MockElectricityMaps({"AT": (401, {}), "DE": (503, {})})
+    client = upstream.client()
+
+    with pytest.raises(APIAuthenticationError):
+        await client.get(f"{BASE_URL}?zone=AT", headers={})
+    with pytest.raises(APIError) as error:
+        await client.get(f"{BASE_URL}?zone=DE", headers={})
+    assert error.value.status_code == 503
+    # Only the zones not found are remembered
+    with pytest.raises(APIError):
+        await client.get(f"{BASE_URL}?zone=DE", headers={})
+    assert upstream.calls[f"{BASE_URL}?zone=DE"] == 2
+    await client.fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_api():
+    def refuse(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    client = ElectricityMapsClient(HttpFetcher(transport=httpx.MockTransport(refuse)), retries=0)
+
+    with pytest.raises(APIError, match="Could not reach"):
+        await client.get(f"{BASE_URL}?zone=FR", headers={})
+    await client.fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_lookups_do_not_wait_behind_the_cache_refreshes(stub_server, monkeypatch):
+    # A refresh slowed down by its concurrency and rate limit
+    monkeypatch.setattr(http_fetcher, "concurrency", 2)
+    monkeypatch.setattr(http_fetcher._rate_limiter, "rate", 20)
+    refresh = asyncio.ensure_future(http_fetcher.fetch_all([f"{stub_server.url}/json/{i}" for i in range(40)]))
+    await asyncio.sleep(0.05)
+
+    start = time.monotonic()
+    result = await ElectricityMapsService._perform_request(f"{stub_server.url}/json/live")
+    elapsed = time.monotonic() - start
+
+    assert result == {"name": "live"}
+    assert elapsed < 0.5
+    assert not refresh.done()
+    await refresh
+    await http_fetcher.aclose()
+    await electricity_maps_fetcher.aclose()
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from boaviztapi.service.factor_provider import get_impact_factor, get_impact_factor_value, \
+    get_impact_factor_vector, impact_factor_tensor, impact_factors, impact_factor_items
+
+
+def test_impact_factor_tensor_matches_factors_yml():
+    for item in impact_factor_items:
+        for impact_type, factor in impact_factors[item].items():
+            if not factor:
+                continue
+            for key, value in factor.items():
+                if isinstance(value, dict):
+                    for sub_key, sub_value in value.items():
+                        if sub_key != "source":
+                            assert get_impact_factor_value(item, impact_type, f"{key}.{sub_key}") == float(sub_value)
+                elif key != "source" and value is not None:
+                    assert get_impact_factor_value(item, impact_type, key) == float(value)
+
+
+def test_impact_factor_tensor_is_read_only():
+    with pytest.raises(ValueError):
+        impact_factor_tensor[0, 0, 0] = 1
+
+
+def test_impact_factor_value_not_implemented():
+    with pytest.raises(NotImplementedError):
+        get_impact_factor_value('cpu', 'gwppb', 'die_impact')
+    with pytest.raises(NotImplementedError):
+        get_impact_factor_value('unknown', 'gwp')
+    with pytest.raises(NotImplementedError):
+        get_impact_factor('cpu', 'gwppb')
+
+
+def test_impact_factor_vector():
+    values, available = get_impact_factor_vector('cpu', ['gwp', 'gwppb', 'unknown', 'pe'], 'die_impact')
+
+    assert available.tolist() == [True, False, False, True]
+    assert values[0] == get_impact_factor('cpu', 'gwp')['die_impact']
+    assert values[3] == get_impact_factor('cpu', 'pe')['die_impact']
+    assert np.all(values[~available] == 0)
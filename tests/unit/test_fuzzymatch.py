@@ -1,4 +1,7 @@
-from boaviztapi.utils.fuzzymatch import fuzzymatch_attr_from_pdf, fuzzymatch_attr_from_cpu_name
+from rapidfuzz import fuzz
+
+from boaviztapi import config
+from boaviztapi.utils.fuzzymatch import fuzzymatch_attr_from_pdf, fuzzymatch_attr_from_cpu_name, CPUNameMatcher
 import pytest
 
 
@@ -32,4 +35,38 @@ def test_fuzzymatch_ssd(ssd_dataframe):
 
 def test_fuzzymatch_ram(ram_dataframe):
     assert "samsung" == fuzzymatch_attr_from_pdf("samesung", "manufacturer", ram_dataframe).lower()
-    assert fuzzymatch_attr_from_pdf("4R", "manufacturer", ram_dataframe) is None
\ No newline at end of file
+    assert fuzzymatch_attr_from_pdf("4R", "manufacturer", ram_dataframe) is None
+
+def _reference_fuzzymatch_attr_from_cpu_name(cpu_name, df):
+    # Scoring of the CPU names as made before the matcher was prepared, row by row with pandas
+    cpu_name = cpu_name.lower()
+    score = df["name"].str.lower().apply(lambda x: fuzz.token_set_ratio(x, cpu_name))
+    if score.max() <= config["cpu_name_fuzzymatch_threshold"]:
+        return None
+    best = df.iloc[score.idxmax()]
+    best = best.mask(best.isnull(), None)
+    safe_int = lambda x: x if x is None else int(x)
+    return (best["name"], best.manufacturer, best.code_name, best.model_range, safe_int(best.tdp),
+            safe_int(best.cores), safe_int(best.threads), safe_int(best.total_die_size), best.total_die_size_source,
+            best.source)
+
+
+def test_cpu_name_matcher_matches_reference_scoring(cpu_specs_dataframe):
+    names = cpu_specs_dataframe["name"].dropna().tolist()[::25]
+    cpu_names = names + [name.replace(" ", "", 1) for name in names] + [name[:-2] for name in names] + \
+        ["Intel(R) Xeon(R) Gold 6134 CPU @ 3.20GHz", "intel xeon", "core i7", "foo bar", ""]
+    matcher = CPUNameMatcher(cpu_specs_dataframe)
+    expected = [_reference_fuzzymatch_attr_from_cpu_name(cpu_name, cpu_specs_dataframe) for cpu_name in cpu_names]
+
+    assert [matcher.match(cpu_name) for cpu_name in cpu_names] == expected
+    assert matcher.match_many(cpu_names) == expected
+    assert None in expected
+
+
+def test_cpu_name_matcher_caches_resolved_names(cpu_specs_dataframe):
+    matcher = CPUNameMatcher(cpu_specs_dataframe, cache_size=16)
+    first = matcher.match("AMD EPYC 7R32 48-Core Processor")
+
+    assert matcher.match("amd epyc 7r32 48-core processor") is first
+    assert matcher._cache.info()["hits"] == 1
+    assert matcher.match_many([]) == []
@@ -0,0 +1,104 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from boaviztapi.service.cache.cache import CacheService
+from boaviztapi.service.cache.http_fetcher import HttpFetcher
+
+pytest_plugins = ('pytest_asyncio',)
+
+
+@pytest.fixture
+def fetcher():
+    return HttpFetcher(concurrency=4, retries=2, backoff=0.01, backoff_max=0.05, timeout=2)
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_returns_the_responses_in_order(stub_server, fetcher):
+    urls = [f"{stub_server.url}/json/{i}" for i in range(10)] + [f"{stub_server.url}/missing"]
+
+    responses = await fetcher.fetch_all(urls)
+    client = fetcher._client
+    await fetcher.fetch(urls[0])
+
+    assert [response.json().get("name") for response in responses[:10]] == [str(i) for i in range(10)]
+    assert responses[10].status_code == 404
+    # Not found is not retried
+    assert stub_server.count("/missing") == 1
+    # The pooled client is kept across refreshes
+    assert fetcher._client is client
+    await fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded(stub_server):
+    fetcher = HttpFetcher(concurrency=3, timeout=5)
+
+    responses = await fetcher.fetch_all([f"{stub_server.url}/slow/100"] * 12)
+
+    assert all(response.status_code == 200 for response in responses)
+    assert stub_server.max_in_flight <= 3
+    await fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unavailable_responses_are_retried(stub_server, fetcher):
+    recovered = await fetcher.fetch(f"{stub_server.url}/flaky/2/a")
+    failed = await fetcher.fetch(f"{stub_server.url}/flaky/5/b")
+
+    assert recovered.status_code == 200
+    assert stub_server.count("/flaky/2/a") == 3
+    # Given up after the retries, the last response is returned
+    assert failed.status_code == 503
+    assert stub_server.count("/flaky/5/b") == 3
+    await fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_honoured(stub_server):
+    # The backoff would exceed the timeout of the test, the Retry-After of 0 is waited instead
+    fetcher = HttpFetcher(retries=1, backoff=60, backoff_max=60)
+
+    response = await fetcher.fetch(f"{stub_server.url}/limited")
+
+    assert response.status_code == 200
+    assert stub_server.count("/limited") == 2
+    await fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_timeouts_are_retried_then_raised(stub_server, fetcher):
+    with pytest.raises(httpx.TimeoutException):
+        await fetcher.fetch(f"{stub_server.url}/slow/300", timeout=0.05)
+
+    assert stub_server.count("/slow/300") == 3
+    await fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_requests_to_a_host_are_rate_limited(stub_server):
+    fetcher = HttpFetcher(concurrency=8, rate_per_host=20)
+
+    await fetcher.fetch_all([f"{stub_server.url}/json/{i}" for i in range(5)])
+
+    times = sorted(time for _, time in stub_server.requests)
+    assert times[-1] - times[0] >= 4 / 20 * 0.9
+    await fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_cache_service_refresh_from_stub_server(stub_server):
+    CacheService._instances.pop("test_stub_refresh", None)
+    urls = [f"{stub_server.url}/json/FR", f"{stub_server.url}/flaky/1/DE", f"{stub_server.url}/missing"]
+    service = CacheService(name="test_stub_refresh", endpoints=urls, save_errors=True)
+    service.db_cache = AsyncMock()
+    service.db_cache.find = MagicMock(return_value=MagicMock(to_list=AsyncMock(return_value=[])))
+
+    await service.fetch_all()
+
+    assert service.memory_cache[urls[0]] == {"name": "FR"}
+    assert service.memory_cache[urls[1]] == {"name": "DE"}
+    assert "404" in service.memory_cache[urls[2]]["error"]
+    assert service.db_cache.bulk_write.called
+    CacheService._instances.pop("test_stub_refresh", None)
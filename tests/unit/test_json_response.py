@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from boaviztapi import config
+from boaviztapi.main import FastJSONResponse, SanitizedJSONResponse
+from boaviztapi.model.device.server import DeviceServer
+from boaviztapi.routers.server_router import compute_server_impact
+from boaviztapi.service.archetype import get_server_archetype
+from boaviztapi.utils.json_sanitizer import dumps_sanitized_json
+
+
+@pytest.mark.parametrize("content", [
+    {"value": 0.1, "min": 6.321e-05, "max": 1e+16, "values": [1e-05, -1.5e-07, 1.2345678901234568e+17, 0.0001]},
+    {"nan": float("nan"), "inf": float("inf"), "-inf": float("-inf"), "np": [np.float64("nan"), np.float64(2.5)]},
+    {"int": np.int64(3), "bool": np.bool_(True), "tuple": (1, 2.0, None), "big": 2 ** 64 - 1},
+    {"quote \"1e-05\"": "a \\ b \n \x01 é   </", "1e-05": ":1e-05,"},
+    {"huge": 2 ** 70, 1: "non string key"},
+    [],
+    None,
+])
+def test_fast_json_response_renders_as_sanitized_json_response(content):
+    assert FastJSONResponse(content).body == SanitizedJSONResponse(content).body
+
+
+def test_fast_json_response_renders_verbose_server_impacts():
+    device = DeviceServer(archetype=get_server_archetype("dellR740"))
+    content = compute_server_impact(device, verbose=True, duration=None, criteria=config["default_criteria"])
+
+    assert FastJSONResponse(content).body == SanitizedJSONResponse(content).body
+
+
+def test_dumps_sanitized_json_uses_orjson():
+    pytest.importorskip("orjson")
+
+    assert dumps_sanitized_json({"value": 6.321e-05, "name": "1e-05"}) == b'{"value":6.321e-05,"name":"1e-05"}'
+    assert dumps_sanitized_json({1: "non string key"}) is None
@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pytest
+
+from boaviztapi.utils.lazy_dataset import DatasetRegistry, LazyDataset
+
+
+def test_lazy_dataset_loads_on_first_use():
+    loads = []
+    dataset = LazyDataset("prices", lambda: loads.append(1) or {"aws": 1.0})
+
+    assert not dataset.loaded
+    assert dataset.status() == {"loaded": False, "load_time": None}
+    assert dataset.get() == {"aws": 1.0}
+    assert dataset.get() == {"aws": 1.0}
+    assert loads == [1]
+    assert dataset.status()["loaded"]
+    assert dataset.status()["load_time"] >= 0
+
+
+def test_lazy_dataset_concurrent_first_uses_load_once():
+    loads = []
+
+    def loader():
+        loads.append(1)
+        time.sleep(0.05)
+        return object()
+
+    dataset = LazyDataset("prices", loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(dataset.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == [1]
+    assert len(results) == 8 and all(result is results[0] for result in results)
+
+
+def test_lazy_dataset_failed_load_is_attempted_again():
+    attempts = []
+
+    def loader():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("prices.parquet is not readable")
+        return "prices"
+
+    dataset = LazyDataset("prices", loader)
+    with pytest.raises(OSError):
+        dataset.get()
+    assert not dataset.loaded
+    assert dataset.get() == "prices"
+
+
+def test_dataset_registry_eager_and_lazy():
+    eager = DatasetRegistry(lazy=False)
+    eager.register("prices", lambda: "prices")
+    assert eager.readiness()["datasets"]["prices"]["loaded"]
+
+    lazy = DatasetRegistry(lazy=True)
+    dataset = lazy.register("prices", lambda: "prices")
+    assert lazy.readiness() == {"lazy": True, "datasets": {"prices": {"loaded": False, "load_time": None}}}
+    dataset.get()
+    assert lazy.readiness()["datasets"]["prices"]["loaded"]
@@ -2,3 +2,20 @@
 # mapper component
 # mapper usage
 # mapper server
+import pytest
+from fastapi import HTTPException
+
+from boaviztapi.dto.device import Cloud
+from boaviztapi.dto.device.device import mapper_cloud_instance
+from boaviztapi.service.archetype import get_cloud_instance_archetype, thaw
+
+
+def test_mapper_cloud_instance_unknown_platform():
+    archetype = thaw(get_cloud_instance_archetype("a1.4xlarge", "aws"))
+    archetype["platform"] = {"default": "unknown_platform"}
+
+    with pytest.raises(HTTPException) as e:
+        mapper_cloud_instance(Cloud(), archetype=archetype)
+
+    assert e.value.status_code == 404
+    assert e.value.detail.startswith("Cloud platform unknown_platform not found")
@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from boaviztapi.service.cache.cache import CacheService
+from boaviztapi.service.metrics import InstrumentedInMemoryBackend, MongoCommandMetrics, RequestMetrics, \
+    RequestMetricsMiddleware
+from boaviztapi.service.prometheus import Exposition
+from boaviztapi.utils.metric_types import Counter, Histogram
+
+pytest_plugins = ('pytest_asyncio',)
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((0.1, 1.0), label_names=("route",))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(("/a",), value)
+    histogram.observe(("/b",), 0.5)
+
+    samples = histogram.collect()
+
+    assert samples[("/a",)].buckets == [(0.1, 2), (1.0, 3), (float("inf"), 4)]
+    assert samples[("/a",)].count == 4
+    assert samples[("/a",)].sum == pytest.approx(5.65)
+    assert samples[("/a",)].max == 5.0
+    assert samples[("/b",)].count == 1
+
+
+def test_exposition_format():
+    histogram = Histogram((0.1,), label_names=("route",))
+    histogram.observe(('/v1/"quoted"',), 0.05)
+    counter = Counter()
+    counter.inc(3)
+    exposition = Exposition()
+    exposition.metric("calls_total", "counter", "Calls.", [((), counter.value)])
+    exposition.metric("cache_age_seconds", "gauge", "Age.", [((("cache", "a"),), 1.5), ((("cache", "b"),), None)])
+    exposition.histogram("latency_seconds", "Latency.", histogram)
+
+    assert exposition.render() == (
+        '# HELP calls_total Calls.\n'
+        '# TYPE calls_total counter\n'
+        'calls_total 3\n'
+        '# HELP cache_age_seconds Age.\n'
+        '# TYPE cache_age_seconds gauge\n'
+        'cache_age_seconds{cache="a"} 1.5\n'
+        '# HELP latency_seconds Latency.\n'
+        '# TYPE latency_seconds histogram\n'
+        'latency_seconds_bucket{route="/v1/\\"quoted\\"",le="0.1"} 1\n'
+        'latency_seconds_bucket{route="/v1/\\"quoted\\"",le="+Inf"} 1\n'
+        'latency_seconds_sum{route="/v1/\\"quoted\\""} 0.05\n'
+        'latency_seconds_count{route="/v1/\\"quoted\\""} 1\n'
+    )
+
+
+@pytest.mark.asyncio
+async def test_request_metrics_middleware():
+    api = FastAPI()
+    in_flight = []
+
+    @api.get("/items/{id}")
+    async def endpoint(id: str):
+        in_flight.append(dict(metrics.in_flight))
+        return id
+
+    metrics = RequestMetrics()
+    app = RequestMetricsMiddleware(api, metrics=metrics)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        await ac.get("/items/1")
+        await ac.get("/items/2")
+        await ac.get("/unknown")
+
+    assert in_flight == [{"GET": 1}, {"GET": 1}]
+    assert metrics.in_flight == {"GET": 0}
+    assert list(metrics.latency.collect()) == [("GET", "/items/{id}", "200")]
+    assert metrics.latency.collect()[("GET", "/items/{id}", "200")].count == 2
+
+
+def test_mongo_command_metrics():
+    metrics = MongoCommandMetrics()
+    metrics.succeeded(SimpleNamespace(command_name="find", duration_micros=1500))
+    metrics.failed(SimpleNamespace(command_name="find", duration_micros=20000))
+
+    samples = metrics.latency.collect()
+
+    assert samples[("find", "succeeded")].sum == 0.0015
+    assert samples[("find", "failed")].sum == 0.02
+
+
+@pytest.mark.asyncio
+async def test_instrumented_backend_counts_hits_and_misses():
+    backend = InstrumentedInMemoryBackend()
+    await backend.clear(namespace="test-metrics")
+
+    assert await backend.get("test-metrics:a") is None
+    await backend.set("test-metrics:a", b"value", expire=60)
+    assert await backend.get_with_ttl("test-metrics:a") == (60, b"value")
+
+    metrics = backend.metrics()
+    assert (metrics["hits"], metrics["misses"]) == (1, 1)
+    assert metrics["size"] >= 1
+    assert 0 <= metrics["age"] < 60
+    await backend.clear(namespace="test-metrics")
+
+
+def test_cache_service_metrics():
+    cache = CacheService(name="test_metrics_cache", endpoints=["http://test/a"])
+
+    assert cache in CacheService.instances()
+    assert cache.metrics() == {"hits": 0, "misses": 0, "size": 0, "age": None, "stale": 1}
@@ -0,0 +1,57 @@
+import gc
+import os
+import struct
+
+import pytest
+
+from boaviztapi.prefork import freeze_reference_data, load_reference_data
+from boaviztapi.service.reference_data import aws_prices
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork") or not os.path.exists("/proc/self/smaps_rollup"),
+                                reason="needs os.fork and /proc/<pid>/smaps_rollup (Linux)")
+
+
+def _private_memory() -> int:
+    """Memory of the process which is not shared with another process, in bytes."""
+    private = 0
+    with open("/proc/self/smaps_rollup") as file:
+        for line in file:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                private += int(line.split()[1]) * 1024
+    return private
+
+
+def _private_memory_growth_in_worker(work) -> int:
+    """Fork a worker running `work`, return how much its private memory grew (the result of `work` included)."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            before = _private_memory()
+            result = work()  # Kept until measured
+            os.write(write_fd, struct.pack("q", _private_memory() - before))
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as pipe:
+        growth = struct.unpack("q", pipe.read(8))[0]
+    os.waitpid(pid, 0)
+    return growth
+
+
+def test_reference_data_is_shared_with_forked_workers():
+    load_reference_data()
+    freeze_reference_data()
+    try:
+        prices = aws_prices.get().prices
+        size = sum(prices[column].to_numpy().nbytes for column in prices.columns)
+
+        def read_prices():
+            return [prices[column].to_numpy().sum() for column in prices.columns]
+
+        # Reading the prices in a worker does not copy them, while a copy takes their size in private memory
+        assert _private_memory_growth_in_worker(read_prices) < size / 4
+        assert _private_memory_growth_in_worker(lambda: prices.copy()) > size / 2
+    finally:
+        gc.unfreeze()
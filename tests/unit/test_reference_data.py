@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from boaviztapi.model.component import cpu
+from boaviztapi.service import utils_provider
+from boaviztapi.service.reference_data import compact_dtypes, cpu_specs, aws_prices
+from boaviztapi.utils.lazy_dataset import deep_size
+
+
+def test_compact_dtypes():
+    df = pd.DataFrame({
+        "manufacturer": ["Samsung", "Samsung", "Hynix", None],
+        "process": [30, 25, 20, 18],
+        "density": [0.625, 1.25, 2.5, 4.1],
+    })
+    compact = compact_dtypes(df, categories=("manufacturer", "missing"))
+
+    assert compact["manufacturer"].dtype == "category"
+    assert compact["process"].dtype == np.int8
+    assert compact["density"].dtype == np.float64
+    assert compact["manufacturer"].astype(object).where(compact["manufacturer"].notna(), None).tolist() == \
+        ["Samsung", "Samsung", "Hynix", None]
+    assert compact["process"].tolist() == [30, 25, 20, 18]
+    assert df["process"].dtype == np.int64
+
+
+def test_compact_dtypes_multiindex_unused_levels():
+    index = pd.MultiIndex.from_product([["eu-west-3", "us-east-1"], [f"a1.{size}" for size in range(200)]],
+                                       names=["region", "id"])
+    df = pd.DataFrame({"OnDemand": np.arange(400, dtype=float)}, index=index).iloc[::100]
+
+    compact = compact_dtypes(df)
+    assert compact.index.levels[1].tolist() == ["a1.0", "a1.100"]
+    assert compact.index.memory_usage(deep=True) < df.index.memory_usage(deep=True)
+    assert compact.xs(("us-east-1", "a1.100"), level=("region", "id"))["OnDemand"].tolist() == [300.0]
+
+
+def test_reference_datasets_are_shared():
+    assert cpu._cpu_specs is cpu_specs.get()
+    assert utils_provider.get_all_ssd_manufacturer()
+    assert aws_prices.get().prices.index.codes[0].dtype != np.int64
+
+
+def test_deep_size():
+    df = pd.DataFrame({"name": ["AMD EPYC 7763", "Intel Xeon Gold 6134"]})
+    assert deep_size(df) == df.memory_usage(deep=True).sum()
+    assert deep_size({"cpu": df}) > deep_size(df)
+    assert deep_size((df, [df])) > 2 * deep_size(df)
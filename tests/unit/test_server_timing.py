@@ -0,0 +1,165 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from boaviztapi.service.compute_executor import ComputeExecutor
+from boaviztapi.service.server_timing import RequestTimings, ServerTimingMiddleware, StageHistogram, timed, \
+    timed_stage, _request_timings
+
+pytest_plugins = ('pytest_asyncio',)
+
+
+def _run_timed(function, *args):
+    timings = RequestTimings()
+    token = _request_timings.set(timings)
+    try:
+        function(*args)
+    finally:
+        _request_timings.reset(token)
+    return timings
+
+
+def test_stages_are_not_timed_outside_of_a_request():
+    @timed_stage("stage")
+    def compute(value):
+        return value * 2
+
+    with timed("other") as stage:
+        assert compute(2) == 4
+    assert stage is None
+
+
+def test_stages_are_timed_in_a_request():
+    @timed_stage("compute")
+    def compute():
+        time.sleep(0.01)
+
+    def request():
+        compute()
+        compute()
+        with timed("render"):
+            pass
+
+    stages = _run_timed(request).stages()
+
+    assert stages.keys() == {"compute", "render"}
+    assert stages["compute"][1] == 2
+    assert stages["compute"][0] >= 0.02
+
+
+def test_a_stage_entered_again_is_timed_once():
+    @timed_stage("verbose")
+    def verbose_device():
+        time.sleep(0.01)
+
+    @timed_stage("verbose")
+    def verbose_cloud():
+        verbose_device()
+
+    stages = _run_timed(verbose_cloud).stages()
+
+    assert stages["verbose"][1] == 1
+
+
+def test_a_failed_stage_is_timed():
+    @timed_stage("compute")
+    def compute():
+        raise ValueError()
+
+    def request():
+        with pytest.raises(ValueError):
+            compute()
+
+    assert _run_timed(request).stages()["compute"][1] == 1
+
+
+@pytest.mark.asyncio
+async def test_stages_are_timed_in_coroutines_and_computing_threads():
+    executor = ComputeExecutor(workers=1, max_queue=1)
+
+    @timed_stage("costs")
+    async def costs():
+        await asyncio.sleep(0.01)
+
+    @timed_stage("impacts")
+    def impacts():
+        return 1
+
+    timings = RequestTimings()
+    token = _request_timings.set(timings)
+    try:
+        await costs()
+        await executor.run(impacts)
+    finally:
+        _request_timings.reset(token)
+        executor.shutdown()
+
+    assert timings.stages().keys() == {"costs", "impacts"}
+
+
+def test_request_timings_header():
+    timings = RequestTimings()
+    timings.add("impacts", 0.0125)
+    timings.add("render", 0.001)
+    timings.add("impacts", 0.0025)
+
+    assert timings.header() == "impacts;dur=15.000, render;dur=1.000"
+
+
+def test_stage_histogram():
+    histogram = StageHistogram(buckets=(0.01, 0.1))
+    for duration in (0.005, 0.05, 0.5):
+        timings = RequestTimings()
+        timings.add("impacts", duration)
+        histogram.observe("POST /v1/cloud/instance", timings)
+
+    metrics = histogram.metrics()["POST /v1/cloud/instance"]["impacts"]
+
+    assert metrics["count"] == 3
+    assert metrics["sum"] == pytest.approx(0.555)
+    assert metrics["max"] == 0.5
+    assert metrics["buckets"] == {"0.01": 1, "0.1": 2, "+Inf": 3}
+
+
+@pytest.mark.asyncio
+async def test_middleware_reports_the_stages_of_the_matched_routes():
+    @timed_stage("impacts")
+    def impacts():
+        return "impacts"
+
+    api = FastAPI()
+
+    @api.get("/impacts/{id}")
+    async def endpoint(id: str):
+        return impacts()
+
+    histogram = StageHistogram()
+    app = ServerTimingMiddleware(api, histogram=histogram, enabled=True)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        res = await ac.get("/impacts/1")
+        not_found = await ac.get("/unknown")
+
+    assert [stage.split(";")[0] for stage in res.headers["Server-Timing"].split(", ")] == ["impacts", "total"]
+    assert "total" in not_found.headers["Server-Timing"]
+    assert histogram.metrics().keys() == {"GET /impacts/{id}"}
+    assert histogram.metrics()["GET /impacts/{id}"]["impacts"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_disabled_middleware_adds_no_header():
+    api = FastAPI()
+
+    @api.get("/")
+    async def endpoint():
+        return "ok"
+
+    histogram = StageHistogram()
+    app = ServerTimingMiddleware(api, histogram=histogram, enabled=False)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        res = await ac.get("/")
+
+    assert "Server-Timing" not in res.headers
+    assert histogram.metrics() == {}
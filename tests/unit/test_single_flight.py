@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from boaviztapi.dto.device import Cloud
+from boaviztapi.service.cache.cache import CacheService
+from boaviztapi.service.request_key import request_key, get_data_version
+from boaviztapi.service.single_flight import SingleFlight
+from boaviztapi.utils.lru_cache import LRUCache
+
+pytest_plugins = ('pytest_asyncio',)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"impacts": len(calls)}
+
+    results = await asyncio.gather(*[single_flight.run("key", compute) for _ in range(5)])
+
+    assert calls == [1]
+    assert all(result is results[0] for result in results)
+    assert single_flight.metrics() == {"in_flight": 0, "started": 1, "coalesced": 4}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_does_not_coalesce_different_or_sequential_calls():
+    single_flight = SingleFlight()
+
+    async def compute(value):
+        await asyncio.sleep(0.01)
+        return value
+
+    assert await asyncio.gather(single_flight.run("a", lambda: compute(1)),
+                                single_flight.run("b", lambda: compute(2))) == [1, 2]
+    assert await single_flight.run("a", lambda: compute(3)) == 3
+    assert single_flight.metrics()["coalesced"] == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_errors_and_survives_a_cancelled_caller():
+    single_flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.05)
+        raise ValueError("not found")
+
+    first = asyncio.ensure_future(single_flight.run("key", fail))
+    second = asyncio.ensure_future(single_flight.run("key", fail))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    with pytest.raises(ValueError, match="not found"):
+        await second
+    assert single_flight.metrics()["in_flight"] == 0
+
+
+def test_request_key_is_canonical():
+    cloud = Cloud(provider="aws", instance_type="a1.medium")
+
+    assert request_key("cloud", cloud, {"a": 1, "b": 2}) == request_key("cloud", cloud, {"b": 2, "a": 1})
+    assert request_key("cloud", cloud, {"a": 1}) != request_key("cloud", cloud, {"a": 2})
+    assert request_key("cloud", cloud) != request_key("server", cloud)
+    assert len(get_data_version()) == 16
+
+
+def test_request_key_changes_when_a_cache_is_refreshed(monkeypatch):
+    monkeypatch.setattr(CacheService, "_instances", {})
+    prices = CacheService(name="electricity_prices", endpoints=[])
+    key = request_key("cloud", {"a": 1})
+
+    assert request_key("cloud", {"a": 1}) == key
+    prices.version += 1
+    assert request_key("cloud", {"a": 1}) != key
+
+
+def test_lru_cache_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("boaviztapi.utils.lru_cache.time.monotonic", lambda: now[0])
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.put('a', 1)
+
+    now[0] += 59
+    assert cache.get('a') == 1
+    now[0] += 1
+    assert cache.get('a') is None
+    assert 'a' not in cache and len(cache) == 0
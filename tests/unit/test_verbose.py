@@ -1,4 +1,5 @@
 from boaviztapi.service.impacts_computation import compute_impacts
+from boaviztapi.service.projection import parse_fields, project
 from boaviztapi.service.verbose import verbose_component, verbose_device
 
 
@@ -541,3 +542,22 @@ def test_verbose_device_server_2(dell_r740_model):
                                                             'use': 'not implemented'}},
                                          'unit_weight': {'status': 'INPUT', 'unit': 'kg', 'value': 2.99},
                                          'units': {'status': 'INPUT', 'value': 2}}
+
+
+def test_parse_fields():
+    assert parse_fields(None) is None
+    assert parse_fields(["verbose.CPU-1.die_size,impacts.gwp", "$.verbose['RAM-1'].units", "impacts"]) == \
+           {"verbose": {"CPU-1": {"die_size": None}, "RAM-1": {"units": None}}, "impacts": None}
+
+
+def test_verbose_device_projection(dell_r740_model):
+    duration = dell_r740_model.usage.hours_life_time.value
+    compute_impacts(dell_r740_model, duration=duration)
+    fields = parse_fields(["avg_power", "CPU-1.die_size.value", "*.units", "RAM-1.impacts.gwp.use"])
+
+    verbose = project(verbose_device(dell_r740_model, duration=duration, fields=fields), fields)
+
+    assert verbose == project(verbose_device(dell_r740_model, duration=duration), fields)
+    assert "duration" not in verbose
+    assert verbose["CPU-1"] == {"die_size": {"value": 588.0}, "units": {"status": "INPUT", "value": 2.0}}
+    assert list(verbose["RAM-1"]["impacts"]) == ["gwp"] and list(verbose["RAM-1"]["impacts"]["gwp"]) == ["use"]